@@ -0,0 +1,5 @@
+"""Performance benchmarks for the Flockwave parsers and encoders.
+
+Run ``python -m benchmarks --help`` from the root of the repository for the
+available options.
+"""
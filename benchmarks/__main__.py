@@ -0,0 +1,148 @@
+"""Command line interface of the benchmark suite.
+
+Examples::
+
+    # Run all benchmarks and save the results
+    python -m benchmarks --output results.json
+
+    # Run the splitter benchmarks only and compare them to earlier results
+    python -m benchmarks --filter split_ --compare results.json
+"""
+
+import json
+import platform
+import sys
+
+from argparse import ArgumentParser
+from datetime import datetime, timezone
+from fnmatch import fnmatch
+from typing import Any
+
+from flockwave.parsers.version import __version__
+
+from . import bench_encoders, bench_parsers, bench_splitters  # noqa: F401
+from .runner import Result, get_key, iter_benchmarks, run_benchmark
+
+
+def _create_argument_parser() -> ArgumentParser:
+    parser = ArgumentParser(
+        prog="python -m benchmarks",
+        description="Runs the performance benchmarks of flockwave-parsers.",
+    )
+    parser.add_argument(
+        "-f",
+        "--filter",
+        action="append",
+        metavar="PATTERN",
+        help=(
+            "run only benchmarks whose name or key contains the given "
+            "substring or matches the given wildcard pattern; may be repeated"
+        ),
+    )
+    parser.add_argument(
+        "-o", "--output", metavar="FILE", help="save the results as JSON to FILE"
+    )
+    parser.add_argument(
+        "-c",
+        "--compare",
+        metavar="FILE",
+        help="compare the results to earlier results saved in FILE",
+    )
+    parser.add_argument(
+        "--threshold",
+        type=float,
+        default=0.1,
+        help=(
+            "relative slowdown compared to the earlier results that is "
+            "reported as a regression (default: %(default)s)"
+        ),
+    )
+    parser.add_argument(
+        "--min-time",
+        type=float,
+        default=0.2,
+        help="minimum time to spend on each benchmark, in seconds",
+    )
+    parser.add_argument(
+        "--max-rounds",
+        type=int,
+        default=20,
+        help="maximum number of rounds to run for each benchmark",
+    )
+    return parser
+
+
+def _matches(key: str, patterns: list[str] | None) -> bool:
+    if not patterns:
+        return True
+    return any(pattern in key or fnmatch(key, pattern) for pattern in patterns)
+
+
+def _load_results(filename: str) -> dict[str, dict[str, Any]]:
+    with open(filename) as fp:
+        data = json.load(fp)
+    return {item["key"]: item for item in data["results"]}
+
+
+def main() -> int:
+    options = _create_argument_parser().parse_args()
+    baseline = _load_results(options.compare) if options.compare else {}
+
+    results: list[Result] = []
+    regressions: list[str] = []
+
+    for bench in iter_benchmarks():
+        for params in bench.params:
+            if not _matches(get_key(bench.name, params), options.filter):
+                continue
+
+            result = run_benchmark(
+                bench,
+                params,
+                min_time=options.min_time,
+                max_rounds=options.max_rounds,
+            )
+            if result is None:
+                continue
+
+            results.append(result)
+
+            line = (
+                f"{result.key:<80} {result.messages_per_second:>12,.0f} msg/s "
+                f"{result.megabytes_per_second:>9.2f} MB/s"
+            )
+
+            previous = baseline.get(result.key)
+            if previous and previous["seconds"] > 0:
+                change = result.seconds / previous["seconds"] - 1
+                line += f" {change:>+8.1%}"
+                if change > options.threshold:
+                    regressions.append(result.key)
+                    line += " REGRESSION"
+
+            print(line, flush=True)
+
+    if options.output:
+        with open(options.output, "w") as fp:
+            json.dump(
+                {
+                    "version": __version__,
+                    "python": sys.version,
+                    "implementation": platform.python_implementation(),
+                    "platform": platform.platform(),
+                    "timestamp": datetime.now(timezone.utc).isoformat(),
+                    "results": [result.json() for result in results],
+                },
+                fp,
+                indent=2,
+            )
+
+    if regressions:
+        print(f"\n{len(regressions)} regression(s) found", file=sys.stderr)
+        return 1
+
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
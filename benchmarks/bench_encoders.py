@@ -0,0 +1,308 @@
+"""Benchmarks of wrappers and complete encoders."""
+
+from dataclasses import dataclass
+from datetime import datetime, timezone
+from enum import Enum
+from json import dumps
+
+from flockwave.encoders import (
+    create_encoder,
+    create_length_prefixed_encoder,
+    create_line_encoder,
+)
+from flockwave.encoders.compression import compress_with_zlib, train_zlib_dictionary
+from flockwave.encoders.json import (
+    create_json_encoder,
+    create_json_template_encoder,
+    create_schema_encoder,
+)
+from flockwave.encoders.memoize import memoize_encoder
+from flockwave.encoders.wrappers import (
+    frame_with_cobs,
+    frame_with_slip,
+    prefix_with_length,
+)
+
+from .data import binary_payloads, count_for, json_objects
+from .runner import Workload, benchmark, has_module
+
+MESSAGE_SIZES = (32, 200, 4096)
+
+
+def _run_encoder(encoder, messages):
+    def run():
+        for message in messages:
+            encoder(message)
+
+    return run
+
+
+@benchmark(
+    "prefix_with_length",
+    group="encoders",
+    header_length=(1, 2, 3, 4, "varint"),
+    message_size=MESSAGE_SIZES,
+)
+def bench_prefix_with_length(header_length, message_size):
+    if header_length == "varint":
+        header_size = (message_size.bit_length() + 6) // 7
+    elif message_size >= 1 << (8 * header_length):
+        return None
+    else:
+        header_size = header_length
+
+    count = count_for(message_size)
+    payloads = binary_payloads(message_size, count)
+    return Workload(
+        run=_run_encoder(prefix_with_length(header_length=header_length), payloads),
+        messages=count,
+        bytes=count * (message_size + header_size),
+    )
+
+
+@benchmark("frame_with_cobs", group="encoders", message_size=MESSAGE_SIZES)
+def bench_frame_with_cobs(message_size):
+    count = count_for(message_size)
+    payloads = binary_payloads(message_size, count)
+    wrapper = frame_with_cobs()
+    return Workload(
+        run=_run_encoder(wrapper, payloads),
+        messages=count,
+        bytes=sum(len(wrapper(payload)) for payload in payloads),
+    )
+
+
+@benchmark("frame_with_slip", group="encoders", message_size=MESSAGE_SIZES)
+def bench_frame_with_slip(message_size):
+    count = count_for(message_size)
+    payloads = binary_payloads(message_size, count)
+    wrapper = frame_with_slip()
+    return Workload(
+        run=_run_encoder(wrapper, payloads),
+        messages=count,
+        bytes=sum(len(wrapper(payload)) for payload in payloads),
+    )
+
+
+@benchmark(
+    "create_json_encoder",
+    group="encoders",
+    backend=("orjson", "builtin"),
+    message_size=(100, 1000),
+)
+def bench_json_encoder(backend, message_size):
+    if backend == "orjson" and not has_module("orjson"):
+        return None
+
+    encoder = create_json_encoder(None if backend == "orjson" else "builtin")
+    count = count_for(message_size)
+    messages = json_objects(message_size, count)
+    return Workload(
+        run=_run_encoder(encoder, messages),
+        messages=count,
+        bytes=sum(len(encoder(message)) for message in messages),
+    )
+
+
+@benchmark(
+    "memoize_encoder",
+    group="encoders",
+    backend=("orjson", "builtin"),
+    memoize=(False, True),
+    message_size=(100, 1000),
+)
+def bench_memoize_encoder(backend, memoize, message_size):
+    if backend == "orjson" and not has_module("orjson"):
+        return None
+
+    # Each message is broadcast to 200 recipients one by one
+    encoder = create_json_encoder(None if backend == "orjson" else "builtin")
+    recipients = 200
+    count = count_for(message_size)
+    messages = json_objects(message_size, max(1, count // recipients))
+
+    def run():
+        encode = memoize_encoder(encoder) if memoize else encoder
+        for message in messages:
+            for _ in range(recipients):
+                encode(message)
+
+    return Workload(
+        run=run,
+        messages=len(messages) * recipients,
+        bytes=sum(len(encoder(message)) for message in messages) * recipients,
+    )
+
+
+@benchmark(
+    "create_json_template_encoder",
+    group="encoders",
+    backend=("orjson", "builtin"),
+    template=(False, True),
+    message_size=(100, 1000),
+)
+def bench_json_template_encoder(backend, template, message_size):
+    if backend == "orjson" and not has_module("orjson"):
+        return None
+
+    # Only the message ID changes between messages
+    backend = None if backend == "orjson" else "builtin"
+    count = count_for(message_size)
+    skeleton = json_objects(message_size, 1)[0]
+    ids = [f"{i:08x}" for i in range(count)]
+
+    if template:
+        encode = create_json_template_encoder(skeleton, ["id"], backend)
+
+        def run():
+            for id in ids:
+                encode(id)
+
+    else:
+        encoder = create_json_encoder(backend)
+
+        def run():
+            for id in ids:
+                skeleton["id"] = id
+                encoder(skeleton)
+
+    return Workload(
+        run=run,
+        messages=count,
+        bytes=count * len(create_json_encoder(backend)(skeleton)),
+    )
+
+
+class _Mode(Enum):
+    AUTO = 1
+    MANUAL = 2
+
+
+@dataclass
+class _Position:
+    lat: float
+    lon: float
+    alt: float
+
+    @property
+    def json(self):
+        return {"lat": self.lat, "lon": self.lon, "alt": self.alt}
+
+
+@dataclass
+class _Status:
+    id: str
+    mode: _Mode
+    timestamp: datetime
+    position: _Position
+    heading: float
+    battery: float
+    errors: list[int]
+
+    @property
+    def json(self):
+        # Typical hand-written conversion that leaves the enum, the datetime
+        # and the nested dataclass to object_to_jsonable()
+        return {
+            "id": self.id,
+            "mode": self.mode,
+            "timestamp": self.timestamp,
+            "position": self.position,
+            "heading": self.heading,
+            "battery": self.battery,
+            "errors": self.errors,
+        }
+
+
+@benchmark(
+    "create_schema_encoder",
+    group="encoders",
+    backend=("orjson", "builtin"),
+    mode=("generic", "schema", "schemas"),
+)
+def bench_schema_encoder(backend, mode):
+    if backend == "orjson" and not has_module("orjson"):
+        return None
+
+    backend = None if backend == "orjson" else "builtin"
+    timestamp = datetime(2024, 5, 6, 7, 8, 9, tzinfo=timezone.utc)
+    count = count_for(200)
+    messages = [
+        _Status(
+            id=f"{i:02d}",
+            mode=_Mode.AUTO if i % 2 else _Mode.MANUAL,
+            timestamp=timestamp,
+            position=_Position(47.5 + i / 1000, 19.0, 120.5),
+            heading=90.0,
+            battery=12.5,
+            errors=[],
+        )
+        for i in range(count)
+    ]
+
+    if mode == "generic":
+        encoder = create_json_encoder(backend)
+    elif mode == "schema":
+        encoder = create_encoder(create_schema_encoder(_Status, backend))
+    else:
+        encoder = create_json_encoder(backend, schemas=[_Status, _Position])
+
+    return Workload(
+        run=_run_encoder(encoder, messages),
+        messages=count,
+        bytes=sum(len(encoder(message)) for message in messages),
+    )
+
+
+@benchmark(
+    "encode_many",
+    group="encoders",
+    framing=("lines", "length_prefix"),
+    message_size=MESSAGE_SIZES,
+    batch_size=(1, 100, 1000),
+)
+def bench_encode_many(framing, message_size, batch_size):
+    if framing == "lines":
+        encoder = create_line_encoder()
+        header_length = 1
+    else:
+        encoder = create_length_prefixed_encoder(header_length=4)
+        header_length = 4
+
+    count = count_for(message_size)
+    payloads = binary_payloads(message_size, count)
+    batches = [payloads[i : i + batch_size] for i in range(0, count, batch_size)]
+    encode_many = encoder.encode_many
+
+    def run():
+        for batch in batches:
+            encode_many(batch)
+
+    return Workload(
+        run=run, messages=count, bytes=count * (message_size + header_length)
+    )
+
+
+@benchmark(
+    "compress_with_zlib",
+    group="encoders",
+    level=(1, 6),
+    zdict=(False, True),
+    message_size=(100, 1000),
+)
+def bench_compress_with_zlib(level, zdict, message_size):
+    count = count_for(message_size)
+    payloads = [
+        dumps(obj, separators=(",", ":")).encode("utf-8")
+        for obj in json_objects(message_size, count)
+    ]
+    dictionary = train_zlib_dictionary(payloads[:100]) if zdict else None
+
+    def run():
+        compressor = compress_with_zlib(level=level, zdict=dictionary)
+        for payload in payloads:
+            compressor(payload)
+
+    return Workload(
+        run=run, messages=count, bytes=sum(len(payload) for payload in payloads)
+    )
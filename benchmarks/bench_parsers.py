@@ -0,0 +1,277 @@
+"""Benchmarks of complete parsers."""
+
+from json import dumps
+
+from flockwave.encoders import create_length_prefixed_encoder
+from flockwave.encoders.wrappers import prefix_with_length
+from flockwave.parsers import Dispatcher, create_length_prefixed_parser
+from flockwave.parsers.filters import reject_duplicates
+from flockwave.parsers.json import create_json_parser
+from flockwave.parsers.memoize import memoize_decoder
+
+from .data import binary_payloads, count_for, json_objects
+from .runner import Workload, benchmark, chunk_stream, has_module
+
+CHUNK_SIZES = (1500, 65536)
+MESSAGE_SIZES = (100, 1000)
+
+
+def _run_parser(factory, chunks):
+    def run():
+        parser = factory()
+        for chunk in chunks:
+            parser(chunk)
+
+    return run
+
+
+@benchmark(
+    "create_json_parser",
+    group="parsers",
+    backend=("orjson", "builtin"),
+    batch=(False, True),
+    message_size=MESSAGE_SIZES,
+    chunk_size=CHUNK_SIZES,
+    aligned=(True, False),
+)
+def bench_json_parser(backend, batch, message_size, chunk_size, aligned):
+    if backend == "orjson" and not has_module("orjson"):
+        return None
+
+    decoder = None if backend == "orjson" else "builtin"
+    count = count_for(message_size)
+    frames = [
+        dumps(obj, separators=(",", ":")).encode("utf-8") + b"\n"
+        for obj in json_objects(message_size, count)
+    ]
+    chunks = chunk_stream(frames, chunk_size=chunk_size, aligned=aligned)
+    return Workload(
+        run=_run_parser(lambda: create_json_parser(decoder, batch=batch), chunks),
+        messages=count,
+        bytes=sum(len(chunk) for chunk in chunks),
+    )
+
+
+@benchmark(
+    "create_json_parser_with_types",
+    group="parsers",
+    backend=("orjson", "builtin"),
+    filtered=(False, True),
+    message_size=MESSAGE_SIZES,
+)
+def bench_json_parser_with_types(backend, filtered, message_size):
+    if backend == "orjson" and not has_module("orjson"):
+        return None
+
+    # Nine out of ten messages are heartbeats that the consumer is not
+    # interested in
+    decoder = None if backend == "orjson" else "builtin"
+    count = count_for(message_size)
+    objects = json_objects(message_size, count)
+    for i, obj in enumerate(objects):
+        if i % 10:
+            obj["body"]["type"] = "SYS-PING"
+    frames = [
+        dumps(obj, separators=(",", ":")).encode("utf-8") + b"\n" for obj in objects
+    ]
+    chunks = chunk_stream(frames, chunk_size=65536, aligned=True)
+
+    if filtered:
+
+        def factory():
+            return create_json_parser(decoder, types=["UAV-INF"])
+
+    else:
+
+        def factory():
+            return create_json_parser(
+                decoder, post_filter=lambda obj: obj["body"]["type"] == "UAV-INF"
+            )
+
+    return Workload(
+        run=_run_parser(factory, chunks),
+        messages=count,
+        bytes=sum(len(chunk) for chunk in chunks),
+    )
+
+
+@benchmark(
+    "dispatcher",
+    group="parsers",
+    handlers=(2, 20),
+    mode=("if-elif", "dispatcher", "dispatcher-batch"),
+)
+def bench_dispatcher(handlers, mode):
+    types = [f"TYPE-{i:02d}" for i in range(handlers)]
+    count = count_for(100)
+    messages = [{"body": {"type": types[i % handlers]}} for i in range(count)]
+    chunk_size = 100
+    chunks = [messages[i : i + chunk_size] for i in range(0, len(messages), chunk_size)]
+    counts = dict.fromkeys(types, 0)
+
+    def handle(message):
+        counts[message["body"]["type"]] += 1
+
+    def handle_batch(messages):
+        counts[messages[0]["body"]["type"]] += len(messages)
+
+    if mode == "if-elif":
+        # Equivalent of an if-elif chain over the message types
+        source = "def dispatch(messages):\n    for message in messages:\n"
+        source += "        type = message['body']['type']\n"
+        for i, type in enumerate(types):
+            keyword = "if" if i == 0 else "elif"
+            source += (
+                f"        {keyword} type == {type!r}:\n            handle(message)\n"
+            )
+        namespace = {"handle": handle}
+        exec(source, namespace)
+        dispatch = namespace["dispatch"]
+    else:
+        dispatch = Dispatcher()
+        for type in types:
+            if mode == "dispatcher":
+                dispatch.on(type, handle)
+            else:
+                dispatch.on(type, handle_batch, batch=True)
+
+    def run():
+        for chunk in chunks:
+            dispatch(chunk)
+
+    return Workload(run=run, messages=count, bytes=0)
+
+
+@benchmark(
+    "reject_duplicates",
+    group="parsers",
+    backend=("orjson", "builtin"),
+    deduplicate=(False, True),
+    message_size=MESSAGE_SIZES,
+)
+def bench_reject_duplicates(backend, deduplicate, message_size):
+    if backend == "orjson" and not has_module("orjson"):
+        return None
+
+    # Every message arrives three times, as if it was received on three links
+    count = count_for(message_size)
+    frames = []
+    for obj in json_objects(message_size, count // 3):
+        frame = dumps(obj, separators=(",", ":")).encode("utf-8")
+        frames.extend([frame] * 3)
+    wrapper = prefix_with_length(header_length=2)
+    chunks = chunk_stream(
+        [wrapper(frame) for frame in frames], chunk_size=65536, aligned=True
+    )
+
+    if backend == "orjson":
+        from orjson import loads
+    else:
+        from json import loads
+
+    def factory():
+        return create_length_prefixed_parser(
+            header_length=2,
+            decoder=loads,
+            pre_filter=reject_duplicates() if deduplicate else None,
+        )
+
+    return Workload(
+        run=_run_parser(factory, chunks),
+        messages=len(frames),
+        bytes=sum(len(chunk) for chunk in chunks),
+    )
+
+
+@benchmark(
+    "memoize_decoder",
+    group="parsers",
+    backend=("orjson", "builtin"),
+    copy=("off", "none", "shallow"),
+    message_size=MESSAGE_SIZES,
+)
+def bench_memoize_decoder(backend, copy, message_size):
+    if backend == "orjson" and not has_module("orjson"):
+        return None
+
+    if backend == "orjson":
+        from orjson import loads
+    else:
+        from json import loads
+
+    # Four out of five messages are the same unchanged status message
+    count = count_for(message_size)
+    objects = json_objects(message_size, count)
+    frames = [
+        dumps(objects[0 if i % 5 else i], separators=(",", ":")).encode("utf-8")
+        for i in range(count)
+    ]
+    wrapper = prefix_with_length(header_length=2)
+    chunks = chunk_stream(
+        [wrapper(frame) for frame in frames], chunk_size=65536, aligned=True
+    )
+
+    def factory():
+        decoder = loads if copy == "off" else memoize_decoder(loads, copy=copy)
+        return create_length_prefixed_parser(header_length=2, decoder=decoder)
+
+    return Workload(
+        run=_run_parser(factory, chunks),
+        messages=count,
+        bytes=sum(len(chunk) for chunk in chunks),
+    )
+
+
+@benchmark(
+    "create_rpc_parser",
+    group="parsers",
+    chunk_size=CHUNK_SIZES,
+    aligned=(True, False),
+)
+def bench_rpc_parser(chunk_size, aligned):
+    try:
+        from tinyrpc.protocols.jsonrpc import JSONRPCProtocol
+
+        from flockwave.parsers.rpc import create_rpc_parser
+    except ImportError:
+        return None
+
+    protocol = JSONRPCProtocol()
+    wrapper = prefix_with_length(header_length=2)
+    count = count_for(100)
+    frames = [
+        wrapper(protocol.create_request(method="subtract", args=[i, 23]).serialize())
+        for i in range(count)
+    ]
+    chunks = chunk_stream(frames, chunk_size=chunk_size, aligned=aligned)
+    return Workload(
+        run=_run_parser(lambda: create_rpc_parser(protocol=protocol), chunks),
+        messages=count,
+        bytes=sum(len(chunk) for chunk in chunks),
+    )
+
+
+@benchmark(
+    "create_length_prefixed_parser_with_crc",
+    group="parsers",
+    crc=("crc16-ccitt", "crc16-mcrf4xx", "crc32"),
+    endianness=("big", "little"),
+    message_size=(32, 200, 4096),
+)
+def bench_length_prefixed_parser_with_crc(crc, endianness, message_size):
+    count = count_for(message_size)
+    encoder = create_length_prefixed_encoder(
+        header_length=2, endianness=endianness, crc=crc
+    )
+    data = encoder.encode_many(binary_payloads(message_size, count))
+    chunks = [data[start : start + 65536] for start in range(0, len(data), 65536)]
+    return Workload(
+        run=_run_parser(
+            lambda: create_length_prefixed_parser(
+                header_length=2, endianness=endianness, crc=crc
+            ),
+            chunks,
+        ),
+        messages=count,
+        bytes=len(data),
+    )
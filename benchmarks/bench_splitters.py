@@ -0,0 +1,145 @@
+"""Benchmarks of the splitters."""
+
+from flockwave.encoders.wrappers import (
+    frame_with_cobs,
+    frame_with_slip,
+    frame_with_sync_word,
+    prefix_with_length,
+)
+from flockwave.parsers.splitters import (
+    split_lines,
+    split_using_cobs,
+    split_using_length_prefix,
+    split_using_slip,
+    split_using_sync_word,
+)
+
+from .data import binary_payloads, count_for
+from .runner import Workload, benchmark, chunk_stream
+
+CHUNK_SIZES = (1500, 65536)
+MESSAGE_SIZES = (32, 200, 4096)
+
+
+def _run_splitter(factory, chunks):
+    def run():
+        splitter = factory()
+        next(splitter)
+        send = splitter.send
+        for chunk in chunks:
+            send(chunk)
+
+    return run
+
+
+@benchmark(
+    "split_lines",
+    group="splitters",
+    message_size=MESSAGE_SIZES,
+    chunk_size=CHUNK_SIZES,
+    aligned=(True, False),
+)
+def bench_split_lines(message_size, chunk_size, aligned):
+    count = count_for(message_size)
+    frames = [
+        payload.hex().encode("ascii")[: message_size - 1] + b"\n"
+        for payload in binary_payloads(message_size // 2, count)
+    ]
+    chunks = chunk_stream(frames, chunk_size=chunk_size, aligned=aligned)
+    return Workload(
+        run=_run_splitter(split_lines, chunks),
+        messages=count,
+        bytes=sum(len(chunk) for chunk in chunks),
+    )
+
+
+@benchmark(
+    "split_using_length_prefix",
+    group="splitters",
+    header_length=(1, 2, 3, 4, "varint"),
+    message_size=MESSAGE_SIZES,
+    chunk_size=CHUNK_SIZES,
+    aligned=(True, False),
+)
+def bench_split_using_length_prefix(header_length, message_size, chunk_size, aligned):
+    if header_length != "varint" and message_size >= 1 << (8 * header_length):
+        return None
+
+    count = count_for(message_size)
+    wrapper = prefix_with_length(header_length=header_length)
+    frames = [wrapper(payload) for payload in binary_payloads(message_size, count)]
+    chunks = chunk_stream(frames, chunk_size=chunk_size, aligned=aligned)
+    return Workload(
+        run=_run_splitter(
+            lambda: split_using_length_prefix(header_length=header_length), chunks
+        ),
+        messages=count,
+        bytes=sum(len(chunk) for chunk in chunks),
+    )
+
+
+@benchmark(
+    "split_using_sync_word",
+    group="splitters",
+    message_size=MESSAGE_SIZES,
+    chunk_size=CHUNK_SIZES,
+    aligned=(True, False),
+)
+def bench_split_using_sync_word(message_size, chunk_size, aligned):
+    count = count_for(message_size)
+    wrapper = frame_with_sync_word(header_length=2)
+    frames = [wrapper(payload) for payload in binary_payloads(message_size, count)]
+    chunks = chunk_stream(frames, chunk_size=chunk_size, aligned=aligned)
+    return Workload(
+        run=_run_splitter(lambda: split_using_sync_word(header_length=2), chunks),
+        messages=count,
+        bytes=sum(len(chunk) for chunk in chunks),
+    )
+
+
+@benchmark(
+    "split_using_cobs",
+    group="splitters",
+    message_size=MESSAGE_SIZES,
+    chunk_size=CHUNK_SIZES,
+    aligned=(True, False),
+)
+def bench_split_using_cobs(message_size, chunk_size, aligned):
+    count = count_for(message_size)
+    wrapper = frame_with_cobs()
+    frames = [wrapper(payload) for payload in binary_payloads(message_size, count)]
+    chunks = chunk_stream(frames, chunk_size=chunk_size, aligned=aligned)
+    return Workload(
+        run=_run_splitter(split_using_cobs, chunks),
+        messages=count,
+        bytes=sum(len(chunk) for chunk in chunks),
+    )
+
+
+@benchmark(
+    "split_using_slip",
+    group="splitters",
+    payload=("text", "binary"),
+    message_size=MESSAGE_SIZES,
+    chunk_size=CHUNK_SIZES,
+    aligned=(True, False),
+)
+def bench_split_using_slip(payload, message_size, chunk_size, aligned):
+    count = count_for(message_size)
+    if payload == "text":
+        # Text payloads contain no bytes that need escaping
+        payloads = [
+            payload.hex().encode("ascii")[:message_size]
+            for payload in binary_payloads(message_size // 2, count)
+        ]
+    else:
+        payloads = binary_payloads(message_size, count)
+
+    wrapper = frame_with_slip()
+    frames = [wrapper(payload) for payload in payloads]
+    chunks = chunk_stream(frames, chunk_size=chunk_size, aligned=aligned)
+    return Workload(
+        run=_run_splitter(split_using_slip, chunks),
+        messages=count,
+        bytes=sum(len(chunk) for chunk in chunks),
+    )
@@ -0,0 +1,40 @@
+"""Synthetic test data for the benchmark suite."""
+
+from random import Random
+from typing import Any
+
+__all__ = ("TOTAL_BYTES", "binary_payloads", "count_for", "json_objects")
+
+TOTAL_BYTES = 1 << 20
+"""Approximate number of payload bytes processed by a single workload."""
+
+
+def count_for(message_size: int) -> int:
+    """Returns how many messages of the given size make up a workload."""
+    return max(1, TOTAL_BYTES // message_size)
+
+
+def binary_payloads(size: int, count: int, *, seed: int = 42) -> list[bytes]:
+    """Returns random binary payloads of the given size."""
+    rng = Random(seed)
+    return [rng.randbytes(size) for _ in range(count)]
+
+
+def json_objects(size: int, count: int) -> list[dict[str, Any]]:
+    """Returns Flockwave-like JSON objects whose compact JSON representation
+    is approximately `size` bytes long.
+    """
+    result = []
+    for i in range(count):
+        obj = {
+            "$fw.version": "1.0",
+            "id": f"{i:08x}",
+            "body": {"type": "UAV-INF", "status": {}},
+        }
+        # The skeleton above is ~70 bytes long when encoded; pad the status
+        # with entries of ~20 bytes each until we reach the target size
+        status = obj["body"]["status"]
+        for j in range(max(0, (size - 70) // 20)):
+            status[f"uav{j:04d}"] = [j, 1.5, True]
+        result.append(obj)
+    return result
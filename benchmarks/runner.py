@@ -0,0 +1,196 @@
+"""Registry and timing harness of the benchmark suite."""
+
+from dataclasses import dataclass, field
+from importlib.util import find_spec
+from itertools import product
+from time import perf_counter
+from typing import Any, Callable, Iterable, Iterator
+
+__all__ = (
+    "Benchmark",
+    "Result",
+    "Workload",
+    "benchmark",
+    "chunk_stream",
+    "get_key",
+    "has_module",
+    "iter_benchmarks",
+    "run_benchmark",
+)
+
+
+@dataclass
+class Workload:
+    """A single, repeatable unit of work measured by a benchmark."""
+
+    run: Callable[[], Any]
+    """Function that processes the whole workload once. It must set up any
+    state it needs (e.g., a new parser) on its own.
+    """
+
+    messages: int
+    """Number of messages processed by a single call to `run()`."""
+
+    bytes: int
+    """Number of bytes processed by a single call to `run()`."""
+
+
+@dataclass
+class Benchmark:
+    """A benchmark, parameterized over a grid of parameter values."""
+
+    name: str
+    group: str
+    setup: Callable[..., Workload | None]
+    params: list[dict[str, Any]] = field(default_factory=lambda: [{}])
+
+
+@dataclass
+class Result:
+    """Result of running a single benchmark with a single set of parameters."""
+
+    name: str
+    group: str
+    params: dict[str, Any]
+    messages: int
+    bytes: int
+    seconds: float
+    rounds: int
+
+    @property
+    def key(self) -> str:
+        """Unique key of the result, used to match results between runs."""
+        return get_key(self.name, self.params)
+
+    @property
+    def messages_per_second(self) -> float:
+        return self.messages / self.seconds if self.seconds > 0 else 0.0
+
+    @property
+    def megabytes_per_second(self) -> float:
+        return self.bytes / self.seconds / 1e6 if self.seconds > 0 else 0.0
+
+    def json(self) -> dict[str, Any]:
+        return {
+            "key": self.key,
+            "name": self.name,
+            "group": self.group,
+            "params": self.params,
+            "messages": self.messages,
+            "bytes": self.bytes,
+            "seconds": self.seconds,
+            "rounds": self.rounds,
+            "messages_per_second": self.messages_per_second,
+            "megabytes_per_second": self.megabytes_per_second,
+        }
+
+
+_registry: list[Benchmark] = []
+
+
+def benchmark(
+    name: str, *, group: str, **grid: Iterable[Any]
+) -> Callable[[Callable[..., Workload | None]], Callable[..., Workload | None]]:
+    """Decorator that registers a benchmark setup function.
+
+    The setup function is called with each combination of the parameter
+    values in the grid and must return the workload to measure, or `None`
+    if the combination is not applicable (e.g., an optional dependency is
+    missing or the message size does not fit the header).
+    """
+    keys = sorted(grid)
+    params = [dict(zip(keys, values)) for values in product(*(grid[k] for k in keys))]
+
+    def decorator(
+        func: Callable[..., Workload | None],
+    ) -> Callable[..., Workload | None]:
+        _registry.append(Benchmark(name=name, group=group, setup=func, params=params))
+        return func
+
+    return decorator
+
+
+def get_key(name: str, params: dict[str, Any]) -> str:
+    """Returns the unique key of a benchmark with the given parameters."""
+    formatted = ",".join(f"{k}={v}" for k, v in sorted(params.items()))
+    return f"{name}[{formatted}]" if formatted else name
+
+
+def has_module(name: str) -> bool:
+    """Returns whether the module with the given name can be imported."""
+    return find_spec(name) is not None
+
+
+def iter_benchmarks() -> Iterator[Benchmark]:
+    """Iterates over all the registered benchmarks."""
+    return iter(_registry)
+
+
+def run_benchmark(
+    bench: Benchmark, params: dict[str, Any], *, min_time: float, max_rounds: int
+) -> Result | None:
+    """Runs a benchmark with a single set of parameters.
+
+    The workload is repeated until it has run for at least `min_time` seconds
+    in total or `max_rounds` times, whichever comes first, and the fastest
+    round is reported.
+    """
+    workload = bench.setup(**params)
+    if workload is None:
+        return None
+
+    run = workload.run
+    best = float("inf")
+    total = 0.0
+    rounds = 0
+
+    while rounds < max_rounds and (rounds < 3 or total < min_time):
+        started_at = perf_counter()
+        run()
+        elapsed = perf_counter() - started_at
+        best = min(best, elapsed)
+        total += elapsed
+        rounds += 1
+
+    return Result(
+        name=bench.name,
+        group=bench.group,
+        params=params,
+        messages=workload.messages,
+        bytes=workload.bytes,
+        seconds=best,
+        rounds=rounds,
+    )
+
+
+def chunk_stream(frames: list[bytes], *, chunk_size: int, aligned: bool) -> list[bytes]:
+    """Splits the concatenation of the given frames into chunks, simulating
+    the reads of a transport.
+
+    Parameters:
+        frames: the frames to concatenate, as they appear on the wire
+        chunk_size: the maximum size of a chunk
+        aligned: whether chunks should end at frame boundaries. Aligned chunks
+            contain as many whole frames as fit into `chunk_size` (but at
+            least one frame). Misaligned chunks are exactly `chunk_size` bytes
+            long, so frames straddle chunk boundaries.
+    """
+    if not aligned:
+        stream = b"".join(frames)
+        return [stream[i : i + chunk_size] for i in range(0, len(stream), chunk_size)]
+
+    chunks: list[bytes] = []
+    current: list[bytes] = []
+    current_size = 0
+    for frame in frames:
+        if current and current_size + len(frame) > chunk_size:
+            chunks.append(b"".join(current))
+            current.clear()
+            current_size = 0
+        current.append(frame)
+        current_size += len(frame)
+
+    if current:
+        chunks.append(b"".join(current))
+
+    return chunks
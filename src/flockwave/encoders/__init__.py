@@ -2,17 +2,25 @@
 
 from .errors import EncodingError
 from .factories import (
+    create_cobs_encoder,
     create_encoder,
     create_length_prefixed_encoder,
     create_line_encoder,
+    create_slip_encoder,
+    create_sync_word_encoder,
 )
+from .metrics import EncoderMetrics
 from .types import Encoder, Wrapper
 
 __all__ = (
+    "create_cobs_encoder",
     "create_encoder",
     "create_length_prefixed_encoder",
     "create_line_encoder",
+    "create_slip_encoder",
+    "create_sync_word_encoder",
     "EncodingError",
     "Encoder",
+    "EncoderMetrics",
     "Wrapper",
 )
@@ -0,0 +1,79 @@
+"""Compression of individual messages with a long-lived `zlib` compression
+context.
+"""
+
+from binascii import b2a_base64
+from zlib import DEFLATED, Z_DEFAULT_COMPRESSION, Z_SYNC_FLUSH, compressobj
+
+from ..parsers.compression import (
+    SYNC_FLUSH_TRAILER,
+    CompressionMetrics,
+    train_zlib_dictionary,
+)
+
+from .types import Wrapper
+
+__all__ = ("CompressionMetrics", "compress_with_zlib", "train_zlib_dictionary")
+
+
+def compress_with_zlib(
+    *,
+    level: int = Z_DEFAULT_COMPRESSION,
+    zdict: bytes | None = None,
+    text_safe: bool = False,
+) -> Wrapper:
+    """Returns a wrapper that compresses each message with a single
+    long-lived `zlib` compression context that is shared by all the messages
+    of a stream.
+
+    Each message is flushed with `Z_SYNC_FLUSH` so it can be decompressed as
+    soon as it arrives, while later messages can still refer back to the
+    contents of earlier ones. This compresses repetitive messages (e.g., JSON
+    messages with the same keys) much better than compressing them one by
+    one. The constant trailer of the flushed output is omitted from each
+    message.
+
+    The wrapper produces a single compressed message per message and it must
+    be combined with a framing wrapper with `chain_wrappers()`, e.g.::
+
+        wrapper = chain_wrappers(compress_with_zlib(), prefix_with_length(...))
+
+    Use `decompress_frames()` on the receiving end. The wrapper is stateful;
+    use a new wrapper for each stream and feed the messages into it in the
+    order they are sent.
+
+    The wrapper has a ``metrics`` attribute that reports the compression
+    ratio of the stream.
+
+    Keyword arguments:
+        level: compression level, from 0 (no compression) to 9 (best
+            compression)
+        zdict: optional preset dictionary, e.g., one created from sample
+            traffic with `train_zlib_dictionary()`; the receiving end must
+            use the same dictionary
+        text_safe: whether to encode the compressed messages in base64 so they
+            contain no newline characters. This is needed with line-based
+            framing.
+    """
+    compressor = (
+        compressobj(level, DEFLATED, -15, zdict=zdict)
+        if zdict is not None
+        else compressobj(level, DEFLATED, -15)
+    )
+    compress = compressor.compress
+    flush = compressor.flush
+    metrics = CompressionMetrics()
+    trailer_length = len(SYNC_FLUSH_TRAILER)
+
+    def wrapper(data: bytes) -> bytes:
+        compressed = compress(data) + flush(Z_SYNC_FLUSH)
+        compressed = compressed[:-trailer_length]
+
+        metrics.bytes_compressed += len(compressed)
+        metrics.bytes_uncompressed += len(data)
+        metrics.messages += 1
+
+        return b2a_base64(compressed, newline=False) if text_safe else compressed
+
+    wrapper.metrics = metrics  # type: ignore[attr-defined]
+    return wrapper
@@ -2,32 +2,200 @@
 Flockwave application suite.
 """
 
-from typing import overload
+from functools import partial
+from time import perf_counter_ns
+from typing import Any, Callable, Iterable, Literal, Sequence, overload
 
-from .wrappers import append_separator, prefix_with_length
-from .types import Encoder, Wrapper, T
+from ..parsers.splitters import DEFAULT_SYNC_WORD
 
-__all__ = ("create_encoder", "create_length_prefixed_encoder", "create_line_encoder")
+from .metrics import EncoderMetrics
+from .wrappers import (
+    append_crc,
+    append_separator,
+    chain_wrappers,
+    frame_with_cobs,
+    frame_with_slip,
+    frame_with_sync_word,
+    prefix_with_length,
+)
+from .types import (
+    BatchEncoder,
+    BatchWrapper,
+    Encoder,
+    PartsEncoder,
+    PartsWrapper,
+    Wrapper,
+    T,
+)
+
+__all__ = (
+    "create_cobs_encoder",
+    "create_encoder",
+    "create_length_prefixed_encoder",
+    "create_line_encoder",
+    "create_slip_encoder",
+    "create_sync_word_encoder",
+)
 
 
 def _identity(x: bytes) -> bytes:
     return x
 
 
+def _no_parts(data: bytes) -> tuple[bytes, bytes, bytes]:
+    return b"", data, b""
+
+
+def _create_batch_wrapper(wrapper: Wrapper | None) -> BatchWrapper:
+    """Returns a function that wraps multiple serialized messages at once with
+    the given wrapper and concatenates the results.
+    """
+    if wrapper is None:
+        return b"".join
+
+    wrap_many = getattr(wrapper, "wrap_many", None)
+    if wrap_many is not None:
+        return wrap_many
+
+    def fallback(payloads: Sequence[bytes]) -> bytes:
+        return b"".join([wrapper(data) for data in payloads])
+
+    return fallback
+
+
+def _create_parts_wrapper(wrapper: Wrapper | None) -> PartsWrapper:
+    """Returns a function that wraps a serialized message with the given
+    wrapper and returns the header, the payload and the trailer separately.
+    """
+    if wrapper is None:
+        return _no_parts
+
+    wrap_parts = getattr(wrapper, "wrap_parts", None)
+    if wrap_parts is not None:
+        return wrap_parts
+
+    def fallback(data: bytes) -> tuple[bytes, bytes, bytes]:
+        return b"", wrapper(data), b""
+
+    return fallback
+
+
+def _create_batch_encoder(
+    encoder: Encoder[T] | None, wrapper: Wrapper | None
+) -> BatchEncoder[T]:
+    """Returns a function that encodes multiple messages at once with the
+    given encoder and wrapper and concatenates the results.
+    """
+    wrap_many = _create_batch_wrapper(wrapper)
+
+    if encoder is None:
+
+        def encode_many(messages: Iterable[T]) -> bytes:
+            # Wrappers need a sequence so they can iterate over it twice
+            return wrap_many(list(messages))  # type: ignore[arg-type]
+
+    else:
+
+        def encode_many(messages: Iterable[T]) -> bytes:
+            return wrap_many([encoder(message) for message in messages])
+
+    return encode_many
+
+
+def _create_parts_encoder(
+    encoder: Encoder[T] | None, wrapper: Wrapper | None
+) -> PartsEncoder[T]:
+    """Returns a function that encodes a message with the given encoder and
+    wrapper and returns the header, the payload and the trailer separately.
+    """
+    wrap_parts = _create_parts_wrapper(wrapper)
+    if encoder is None:
+        return wrap_parts  # type: ignore[return-value]
+
+    def encode_parts(message: T) -> tuple[bytes, bytes, bytes]:
+        return wrap_parts(encoder(message))
+
+    return encode_parts
+
+
+def _create_batch_parts_encoder(
+    encode_parts: PartsEncoder[T],
+) -> Callable[[Iterable[T]], list[bytes]]:
+    """Returns a function that encodes multiple messages at once and returns
+    the non-empty headers, payloads and trailers of all the messages in a
+    single list.
+    """
+
+    def encode_many_parts(messages: Iterable[T]) -> list[bytes]:
+        return [part for message in messages for part in encode_parts(message) if part]
+
+    return encode_many_parts
+
+
+def _measure(
+    func: Callable[[Any], Any],
+    metrics: EncoderMetrics,
+    *,
+    batch: bool = False,
+    parts: bool = False,
+) -> Callable[[Any], Any]:
+    """Wraps an encoder function or one of its variants such that it updates
+    the given metrics object with its performance counters.
+
+    Parameters:
+        func: the function to wrap
+        metrics: the metrics object to update
+        batch: whether the function takes an iterable of messages instead of
+            a single message
+        parts: whether the function returns a sequence of buffers instead of
+            a single buffer
+    """
+
+    def measured(arg: Any) -> Any:
+        if batch:
+            arg = list(arg)
+
+        started_at = perf_counter_ns()
+        try:
+            result = func(arg)
+        except Exception:
+            metrics.encode_failures += 1
+            raise
+        finally:
+            metrics.encode_time_ns += perf_counter_ns() - started_at
+
+        metrics.messages_encoded += len(arg) if batch else 1
+        metrics.bytes_encoded += (
+            sum(len(part) for part in result) if parts else len(result)
+        )
+        return result
+
+    return measured
+
+
 @overload
 def create_encoder(
-    encoder: None = None, wrapper: Wrapper | None = None
+    encoder: None = None,
+    wrapper: Wrapper | None = None,
+    *,
+    metrics: EncoderMetrics | bool | None = None,
 ) -> Encoder[bytes]: ...
 
 
 @overload
 def create_encoder(
-    encoder: Encoder[T], wrapper: Wrapper | None = None
+    encoder: Encoder[T],
+    wrapper: Wrapper | None = None,
+    *,
+    metrics: EncoderMetrics | bool | None = None,
 ) -> Encoder[T]: ...
 
 
 def create_encoder(
-    encoder: Encoder[T] | None = None, wrapper: Wrapper | None = None
+    encoder: Encoder[T] | None = None,
+    wrapper: Wrapper | None = None,
+    *,
+    metrics: EncoderMetrics | bool | None = None,
 ) -> Encoder[T]:
     """Creates an encoder function from an encoder and a wrapper function.
 
@@ -36,6 +204,26 @@ def create_encoder(
     encoded messages in a way that makes it possible to separate the individual
     messages later on the receiving end unambiguously.
 
+    The returned encoder also has the following attributes:
+
+    - ``encode_many`` encodes multiple messages at once and returns the
+      concatenation of the encoded messages in a single buffer, ready to be
+      written to the transport in one go. Wrappers that provide a
+      ``wrap_many`` attribute (like the built-in wrappers) assemble the
+      buffer in a single step.
+
+    - ``encode_parts`` encodes a single message and returns its header,
+      payload and trailer as separate buffers, without concatenating them.
+      This allows large payloads to be sent with ``transport.writelines()``
+      or ``socket.sendmsg()`` without copying them. Wrappers that provide a
+      ``wrap_parts`` attribute (like the built-in wrappers) return the
+      payload as is; other wrappers return the whole wrapped message as the
+      payload and empty headers and trailers.
+
+    - ``encode_many_parts`` encodes multiple messages at once and returns the
+      non-empty headers, payloads and trailers of all the messages in a
+      single list, ready to be passed to ``transport.writelines()``.
+
     Keyword arguments:
         encoder: function that will receive each individual message to encode
             and must receive its byte-level representation. Defaults to the
@@ -43,27 +231,67 @@ def create_encoder(
         wrapper: function that wraps the encoded messages in a way that makes it
             possible to separate the individual messages later on the receiving
             end unambiguously
+        metrics: optional metrics object that the encoder will update with
+            its performance counters, or ``True`` to create a new one. The
+            metrics object is available in the ``metrics`` attribute of the
+            returned encoder.
     """
+    result: Encoder[Any]
+
+    # partial() objects with no arguments are used below to create a new
+    # object that we can set attributes on without modifying the original
+    # function, at practically no extra cost per call
     if encoder:
         if wrapper:
-            return lambda message: wrapper(encoder(message))
+            result = lambda message: wrapper(encoder(message))  # noqa: E731
         else:
-            return encoder
+            result = partial(encoder)
     elif wrapper:
-        return wrapper  # type: ignore[return-value]
+        result = partial(wrapper)
     else:
-        return _identity  # type: ignore[return-value]
+        result = partial(_identity)
+
+    encode_many = _create_batch_encoder(encoder, wrapper)
+    encode_parts = _create_parts_encoder(encoder, wrapper)
+    encode_many_parts = _create_batch_parts_encoder(encode_parts)
+
+    if metrics:
+        if metrics is True:
+            metrics = EncoderMetrics()
+
+        result = _measure(result, metrics)
+        encode_many = _measure(encode_many, metrics, batch=True)
+        encode_parts = _measure(encode_parts, metrics, parts=True)
+        encode_many_parts = _measure(encode_many_parts, metrics, batch=True, parts=True)
+        result.metrics = metrics  # type: ignore[attr-defined]
+
+    result.encode_many = encode_many  # type: ignore[attr-defined]
+    result.encode_parts = encode_parts  # type: ignore[attr-defined]
+    result.encode_many_parts = encode_many_parts  # type: ignore[attr-defined]
+    return result
+
+
+def create_cobs_encoder(**kwds) -> Encoder[T]:
+    """Creates an encoder that encodes outgoing messages with Consistent
+    Overhead Byte Stuffing (COBS) and terminates each message with a zero
+    byte.
+
+    All keyword arguments not mentioned here are forwarded to
+    ``create_encoder()``.
+    """
+    return create_encoder(wrapper=frame_with_cobs(), **kwds)
 
 
 def create_length_prefixed_encoder(
     *,
     max_length: int | None = None,
-    header_length: int | None = None,
+    header_length: int | Literal["varint"] | None = None,
     endianness: str = "big",
+    crc: str | None = None,
     **kwds,
 ) -> Encoder[T]:
     """Creates an encoder that prefixes each encoded message with its length
-    on the wire.
+    on the wire, and optionally appends a checksum to each message.
 
     All keyword arguments not mentioned here are forwarded to
     ``create_encoder()``.
@@ -73,20 +301,28 @@ def create_length_prefixed_encoder(
             be used to decide how many bytes the protocol uses to encode the
             message lengths unless `header_length` is specified
         header_length: number of bytes that the protocol uses to encode
-            message lengths; inferred from `max_length` if not present
-        endianness: whether lengths are encoded in little endian or big endian
-            (relevant only if lengths are encoded in more than one byte)
+            message lengths; inferred from `max_length` if not present.
+            ``"varint"`` means that the lengths are encoded as unsigned
+            LEB128 varints with a variable number of bytes.
+        endianness: whether lengths and checksums are encoded in little endian
+            or big endian (relevant only if they are encoded in more than one
+            byte)
+        crc: the name of the CRC algorithm to use to calculate the checksum
+            that is appended to each message; see `get_crc_algorithm()` for
+            the supported algorithms. `None` means not to add checksums. The
+            lengths of the messages include the checksums.
 
     Raises:
         EncodingError: when trying to send a message that is too long for the
             number of bytes allocated to convey the length of the message
     """
-    return create_encoder(
-        wrapper=prefix_with_length(
-            max_length=max_length, header_length=header_length, endianness=endianness
-        ),
-        **kwds,
+    wrapper = prefix_with_length(
+        max_length=max_length, header_length=header_length, endianness=endianness
     )
+    if crc is not None:
+        wrapper = chain_wrappers(append_crc(crc, endianness=endianness), wrapper)
+
+    return create_encoder(wrapper=wrapper, **kwds)
 
 
 def create_line_encoder(**kwds) -> Encoder[T]:
@@ -101,3 +337,52 @@ def create_line_encoder(**kwds) -> Encoder[T]:
     ``create_encoder()``.
     """
     return create_encoder(wrapper=append_separator(b"\n"), **kwds)
+
+
+def create_slip_encoder(**kwds) -> Encoder[T]:
+    """Creates an encoder that frames outgoing messages with SLIP (RFC 1055).
+
+    All keyword arguments not mentioned here are forwarded to
+    ``create_encoder()``.
+    """
+    return create_encoder(wrapper=frame_with_slip(), **kwds)
+
+
+def create_sync_word_encoder(
+    *,
+    max_length: int | None = None,
+    header_length: int | None = None,
+    endianness: str = "big",
+    sync_word: bytes = DEFAULT_SYNC_WORD,
+    **kwds,
+) -> Encoder[T]:
+    """Creates an encoder that frames each encoded message with a sync word,
+    a length header and a CRC-32 checksum so the receiving end can
+    resynchronise to the next valid frame when the stream is corrupted.
+
+    All keyword arguments not mentioned here are forwarded to
+    ``create_encoder()``.
+
+    Keyword arguments:
+        max_length: maximum length of messages that we will write; it will also
+            be used to decide how many bytes the protocol uses to encode the
+            message lengths unless `header_length` is specified
+        header_length: number of bytes that the protocol uses to encode
+            message lengths; inferred from `max_length` if not present
+        endianness: whether lengths and checksums are encoded in little endian
+            or big endian
+        sync_word: the bytes that mark the start of each frame
+
+    Raises:
+        EncodingError: when trying to send a message that is too long for the
+            number of bytes allocated to convey the length of the message
+    """
+    return create_encoder(
+        wrapper=frame_with_sync_word(
+            max_length=max_length,
+            header_length=header_length,
+            endianness=endianness,
+            sync_word=sync_word,
+        ),
+        **kwds,
+    )
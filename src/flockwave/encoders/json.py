@@ -1,17 +1,24 @@
 """JSON object encoder."""
 
+from copy import deepcopy
 from datetime import datetime
 from enum import Enum
 from functools import partial
 from json import JSONEncoder
-from typing import Any, Literal
+from typing import Any, Callable, Iterable, Literal, Mapping, Sequence
 from warnings import warn
 
 from .factories import create_encoder
+from .schema import compile_schema
 from .types import Encoder, Wrapper
 from .wrappers import append_separator
 
-__all__ = ("create_json_encoder", "object_to_jsonable")
+__all__ = (
+    "create_json_encoder",
+    "create_json_template_encoder",
+    "create_schema_encoder",
+    "object_to_jsonable",
+)
 
 
 def object_to_jsonable(obj: Any) -> Any:
@@ -55,18 +62,95 @@ def _adapt_builtin_encoder(encoder: JSONEncoder) -> Encoder[Any]:
 
 def _adapt_orjson_encoder(
     option: int | None = None,
+    default: Callable[[Any], Any] = object_to_jsonable,
 ) -> Encoder[Any]:
     from orjson import dumps, OPT_PASSTHROUGH_DATACLASS, OPT_SORT_KEYS
 
     if option is None:
         option = OPT_PASSTHROUGH_DATACLASS | OPT_SORT_KEYS
-    return partial(dumps, default=object_to_jsonable, option=option)
+    return partial(dumps, default=default, option=option)
+
+
+def _get_native_types(
+    encoder: Encoder[Any] | JSONEncoder | Literal["builtin"] | None,
+) -> tuple[type, ...]:
+    """Returns the types that the encoder created by `_resolve_encoder()` for
+    the given encoder argument serializes natively, without calling its
+    `default` function.
+    """
+    if encoder is None:
+        try:
+            import orjson  # noqa: F401
+        except ImportError:
+            encoder = "builtin"
+        else:
+            # orjson encodes datetimes in ISO 8601 format and enums by their
+            # values natively; leave them to orjson so the compiled schemas
+            # produce the same output as the generic conversion
+            return (datetime, Enum)
+
+    if encoder == "builtin" or isinstance(encoder, JSONEncoder):
+        # The built-in encoder writes subclasses of int, float and str
+        # natively, including enums derived from them (e.g. IntEnum)
+        return (int, float, str)
+
+    return ()
+
+
+def _resolve_encoder(
+    encoder: Encoder[Any] | JSONEncoder | Literal["builtin"] | None,
+    default: Callable[[Any], Any] = object_to_jsonable,
+) -> Encoder[Any]:
+    """Returns the encoder function to use for the given encoder argument of
+    `create_json_encoder()`.
+
+    The given `default` function is used to convert objects that are not
+    JSON-serializable natively when the encoder is created here; it is
+    ignored for encoders supplied by the caller.
+    """
+    if encoder is None:
+        try:
+            encoder = _adapt_orjson_encoder(default=default)
+        except ImportError:
+            encoder = "builtin"
+
+    if encoder == "builtin":
+        encoder = JSONEncoder(
+            separators=(",", ":"),
+            sort_keys=False,
+            indent=None,
+            default=default,
+        )
+
+    if isinstance(encoder, JSONEncoder):
+        encoder = _adapt_builtin_encoder(encoder)
+
+    return encoder  # type: ignore[return-value]
+
+
+def _create_schema_default(
+    converters: dict[type, Callable[[Any], Any]],
+) -> Callable[[Any], Any]:
+    """Returns a function that can be used as the `default` function of a JSON
+    encoder, and that converts objects of the given types with their
+    precompiled converters and all other objects with `object_to_jsonable()`.
+    """
+    get = converters.get
+
+    def default(obj: Any) -> Any:
+        convert = get(type(obj))
+        if convert is not None:
+            return convert(obj)
+        return object_to_jsonable(obj)
+
+    return default
 
 
 def create_json_encoder(
     encoder: Encoder[Any] | JSONEncoder | Literal["builtin"] | None = None,
     *,
     wrapper: Wrapper | None = None,
+    schemas: Iterable[type] | None = None,
     **kwds,
 ) -> Encoder[Any]:
     """Creates an encoder that encodes outgoing JSON messages using the built-in
@@ -93,6 +177,12 @@ def create_json_encoder(
             encoded messages.
         wrapper: the wrapper to use to augment the encoded messages to help the
             parser separate the individual messages
+        schemas: dataclasses whose instances are converted to JSON with
+            precompiled converters (see `compile_schema()`) instead of the
+            generic `object_to_jsonable()` function, both when they are sent
+            as messages and when they appear inside other messages. Instances
+            nested in other objects are converted this way only when the
+            encoder is created by this function.
     """
     if "encoding" in kwds:
         warn(
@@ -105,22 +195,16 @@ def create_json_encoder(
     if encoding != "utf-8":
         raise ValueError("Only 'utf-8' encoding is supported for JSON encoding")
 
-    if encoder is None:
-        try:
-            encoder = _adapt_orjson_encoder()
-        except ImportError:
-            encoder = "builtin"
-
-    if encoder == "builtin":
-        encoder = JSONEncoder(
-            separators=(",", ":"),
-            sort_keys=False,
-            indent=None,
-            default=object_to_jsonable,
-        )
-
-    if isinstance(encoder, JSONEncoder):
-        encoder = _adapt_builtin_encoder(encoder)
+    if schemas is not None:
+        native_types = _get_native_types(encoder)
+        converters = {
+            schema: compile_schema(schema, native_types=native_types)
+            for schema in schemas
+        }
+        encoder = _resolve_encoder(encoder, _create_schema_default(converters))
+        encoder = _convert_with_schemas(encoder, converters)
+    else:
+        encoder = _resolve_encoder(encoder)
 
     if wrapper is None:
         wrapper = append_separator(b"\n")
@@ -130,3 +214,163 @@ def create_json_encoder(
         encoder=encoder,
         **kwds,
     )
+
+
+def _convert_with_schemas(
+    encoder: Encoder[Any], converters: dict[type, Callable[[Any], Any]]
+) -> Encoder[Any]:
+    """Returns an encoder that converts messages of the given types with their
+    precompiled converters before passing them to the given JSON encoder.
+    """
+    get = converters.get
+
+    def encode(message: Any) -> bytes:
+        convert = get(type(message))
+        return encoder(convert(message) if convert is not None else message)
+
+    return encode
+
+
+def create_schema_encoder(
+    schema: type | Mapping[str, Any],
+    encoder: Encoder[Any] | JSONEncoder | Literal["builtin"] | None = None,
+    *,
+    sort_keys: bool = False,
+) -> Encoder[Any]:
+    """Creates an encoder function that encodes objects of a known shape to
+    JSON, using a converter that is generated once for the shape with
+    `compile_schema()`.
+
+    This is faster than encoding the objects with the generic
+    `object_to_jsonable()` conversion, which inspects the type of each
+    object and each field on every call. The returned function does not
+    wrap the encoded messages; pass it to `create_encoder()` with the wrapper
+    of your choice, e.g.::
+
+        encoder = create_encoder(
+            create_schema_encoder(Status), prefix_with_length(header_length=2)
+        )
+
+    Args:
+        schema: the dataclass or the mapping from keys to types that describes
+            the objects to encode
+        encoder: the JSON encoder to use; see `create_json_encoder()`
+        sort_keys: whether to sort the keys of the converted objects instead
+            of using the order of the fields in the schema
+
+    Returns:
+        a function that encodes a single object into JSON
+    """
+    convert = compile_schema(
+        schema, native_types=_get_native_types(encoder), sort_keys=sort_keys
+    )
+    encode_json = _resolve_encoder(encoder)
+
+    def encode(obj: Any) -> bytes:
+        return encode_json(convert(obj))
+
+    return encode
+
+
+def create_json_template_encoder(
+    template: Any,
+    fields: Sequence[str | Sequence[str | int]],
+    encoder: Encoder[Any] | JSONEncoder | Literal["builtin"] | None = None,
+    *,
+    wrapper: Wrapper | None = None,
+) -> Callable[..., bytes]:
+    """Creates an encoder for JSON messages that differ only in the values of
+    a few fields, such as IDs and timestamps.
+
+    The template message is encoded once, with placeholders in place of the
+    changing fields. The returned function receives the values of the
+    changing fields, encodes only the values, and splices them into the
+    encoded template. The result is identical to what `create_json_encoder()`
+    would produce for the template with the values filled in.
+
+    Example::
+
+        encode = create_json_template_encoder(
+            {"$fw.version": "1.0", "id": None, "body": {"type": "SYS-PING"}},
+            fields=["id"],
+        )
+        data = encode("a1b2c3")
+
+    Args:
+        template: the message to use as a template; it is not modified
+        fields: the keys of the changing fields in the template, or the paths
+            of keys (and list indices) leading to them from the root of the
+            template. Fields that do not exist in the template are added.
+        encoder: the JSON encoder to use; see `create_json_encoder()`
+        wrapper: the wrapper to use to augment the encoded messages to help
+            the parser separate the individual messages; defaults to
+            appending a newline
+
+    Returns:
+        a function that receives the values of the changing fields as
+        positional arguments, in the order of `fields`, and returns the
+        encoded and wrapped message
+
+    Raises:
+        ValueError: if the template cannot be encoded with placeholders in
+            place of the changing fields
+    """
+    encode_value = _resolve_encoder(encoder)
+    if wrapper is None:
+        wrapper = append_separator(b"\n")
+
+    skeleton = deepcopy(template)
+    placeholders = []
+    for index, field in enumerate(fields):
+        path = (field,) if isinstance(field, str) else tuple(field)
+        if not path:
+            raise ValueError("field path must not be empty")
+
+        placeholder = f"__flockwave_template_field_{index}__"
+        placeholders.append(encode_value(placeholder))
+
+        node = skeleton
+        try:
+            for part in path[:-1]:
+                node = node[part]
+            node[path[-1]] = placeholder
+        except (IndexError, KeyError, TypeError):
+            raise ValueError(f"no such field in template: {field!r}") from None
+
+    encoded = encode_value(skeleton)
+
+    positions = []
+    for index, placeholder in enumerate(placeholders):
+        position = encoded.find(placeholder)
+        if position < 0 or encoded.find(placeholder, position + 1) >= 0:
+            raise ValueError(f"cannot find field in encoded template: {index}")
+        positions.append((position, index))
+    positions.sort()
+
+    # Split the encoded template into the static parts around the fields, and
+    # determine the order in which the fields appear in the encoded template
+    static_parts = []
+    order = []
+    start = 0
+    for position, index in positions:
+        static_parts.append(encoded[start:position])
+        order.append(index)
+        start = position + len(placeholders[index])
+    static_parts.append(encoded[start:])
+
+    num_fields = len(order)
+    head, *tails = static_parts
+    pairs = list(zip(order, tails))
+
+    def encode(*values: Any) -> bytes:
+        if len(values) != num_fields:
+            raise TypeError(f"expected {num_fields} values, got {len(values)}")
+
+        parts = [head]
+        for index, tail in pairs:
+            parts.append(encode_value(values[index]))
+            parts.append(tail)
+
+        return wrapper(b"".join(parts))
+
+    return encode
@@ -0,0 +1,193 @@
+"""Memoization of encoded messages for streams in which the same message is
+sent repeatedly.
+"""
+
+from collections import OrderedDict
+from typing import Any, Callable, Hashable, Iterable
+
+from .types import Encoder, T
+
+__all__ = ("EncoderCache", "memoize_encoder")
+
+
+class EncoderCache:
+    """Bounded cache of encoded and wrapped messages, used by
+    `memoize_encoder()`.
+
+    The cache holds at most a given number of messages and evicts the least
+    recently used message when it is full.
+    """
+
+    __slots__ = ("_entries", "evictions", "hits", "max_entries", "misses")
+
+    evictions: int
+    """Number of messages evicted from the cache because it was full."""
+
+    hits: int
+    """Number of messages that were found in the cache."""
+
+    max_entries: int
+    """Maximum number of messages in the cache."""
+
+    misses: int
+    """Number of messages that were not found in the cache and had to be
+    encoded.
+    """
+
+    _entries: OrderedDict[Hashable, Any]
+
+    def __init__(self, max_entries: int = 256):
+        """Constructor.
+
+        Parameters:
+            max_entries: maximum number of messages in the cache
+        """
+        if max_entries <= 0:
+            raise ValueError("maximum number of entries must be positive")
+
+        self.max_entries = max_entries
+
+        self._entries = OrderedDict()
+
+        self.reset()
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    @property
+    def hit_rate(self) -> float | None:
+        """Ratio of the messages that were found in the cache to all the
+        messages looked up; `None` if no message was looked up yet.
+        """
+        total = self.hits + self.misses
+        return self.hits / total if total else None
+
+    def clear(self) -> None:
+        """Removes all the messages from the cache.
+
+        Call this when a message that is identified by a key has changed, so
+        that it is encoded again the next time it is sent.
+        """
+        self._entries.clear()
+
+    def reset(self) -> None:
+        """Removes all the messages from the cache and resets all the counters
+        to zero.
+        """
+        self.clear()
+        self.evictions = 0
+        self.hits = 0
+        self.misses = 0
+
+    def snapshot(self) -> dict[str, Any]:
+        """Returns the current size of the cache and the values of the
+        counters as a dictionary.
+        """
+        return {
+            "entries": len(self._entries),
+            "evictions": self.evictions,
+            "hit_rate": self.hit_rate,
+            "hits": self.hits,
+            "misses": self.misses,
+        }
+
+
+def memoize_encoder(
+    encoder: Encoder[T],
+    *,
+    key: Callable[[T], Hashable] | None = None,
+    max_entries: int = 256,
+) -> Encoder[T]:
+    """Returns an encoder that remembers the encoded form of recently sent
+    messages, and returns it without calling the original encoder when the
+    same message is sent again.
+
+    This pays off when the same message is sent many times, e.g. when a
+    command or a status message is broadcast to many recipients. The original
+    encoder is typically a complete encoder returned by `create_encoder()` or
+    `create_json_encoder()`, so the cache holds the wrapped messages that are
+    ready to be written to the transport.
+
+    By default, messages are identified by their identity, i.e. the same
+    object is encoded only once while it is in the cache. The cache holds a
+    reference to the object, so the object must not be modified after it was
+    sent; send a new object instead. Pass a key function to identify messages
+    by a key instead (e.g., a message ID and a revision number); in this case
+    the messages themselves are not retained.
+
+    The returned encoder has the same ``encode_many``, ``encode_parts`` and
+    ``encode_many_parts`` attributes as the encoders returned by
+    `create_encoder()`, and a ``cache`` attribute with the `EncoderCache`
+    that holds the messages and reports the hit rate.
+
+    Parameters:
+        encoder: the encoder to memoize
+        key: optional function that returns the key identifying a message
+        max_entries: maximum number of messages to remember
+
+    Returns:
+        the memoizing encoder
+    """
+    cache = EncoderCache(max_entries)
+    entries = cache._entries
+    get = entries.get
+    move_to_end = entries.move_to_end
+    popitem = entries.popitem
+
+    if key is None:
+
+        def encode(message: T) -> bytes:
+            message_id = id(message)
+            entry = get(message_id)
+            if entry is not None and entry[0] is message:
+                move_to_end(message_id)
+                cache.hits += 1
+                return entry[1]
+
+            data = encoder(message)
+            cache.misses += 1
+
+            # Keep a reference to the message so its ID is not reused
+            entries[message_id] = (message, data)
+            move_to_end(message_id)
+            if len(entries) > max_entries:
+                popitem(last=False)
+                cache.evictions += 1
+
+            return data
+
+    else:
+        get_key = key
+
+        def encode(message: T) -> bytes:
+            message_key = get_key(message)
+            data = get(message_key)
+            if data is not None:
+                move_to_end(message_key)
+                cache.hits += 1
+                return data
+
+            data = encoder(message)
+            cache.misses += 1
+
+            entries[message_key] = data
+            if len(entries) > max_entries:
+                popitem(last=False)
+                cache.evictions += 1
+
+            return data
+
+    def encode_many(messages: Iterable[T]) -> bytes:
+        return b"".join([encode(message) for message in messages])
+
+    def encode_parts(message: T) -> tuple[bytes, bytes, bytes]:
+        return b"", encode(message), b""
+
+    def encode_many_parts(messages: Iterable[T]) -> list[bytes]:
+        return [encode(message) for message in messages]
+
+    encode.cache = cache  # type: ignore[attr-defined]
+    encode.encode_many = encode_many  # type: ignore[attr-defined]
+    encode.encode_parts = encode_parts  # type: ignore[attr-defined]
+    encode.encode_many_parts = encode_many_parts  # type: ignore[attr-defined]
+    return encode
@@ -0,0 +1,58 @@
+"""Optional performance counters for message encoders."""
+
+from typing import Any
+
+__all__ = ("EncoderMetrics",)
+
+
+class EncoderMetrics:
+    """Performance counters of a single encoder.
+
+    Pass an instance of this class to `create_encoder()` in the
+    ``metrics=...`` keyword argument to collect metrics. Encoders created
+    without metrics do not pay for the bookkeeping at all.
+    """
+
+    __slots__ = (
+        "bytes_encoded",
+        "encode_failures",
+        "encode_time_ns",
+        "messages_encoded",
+    )
+
+    bytes_encoded: int
+    """Total number of bytes produced by the encoder, including the bytes
+    added by the wrapper.
+    """
+
+    encode_failures: int
+    """Number of messages where the encoder or the wrapper raised an
+    exception.
+    """
+
+    encode_time_ns: int
+    """Cumulative time spent in the encoder and the wrapper, in nanoseconds,
+    as measured by `time.perf_counter_ns()`.
+    """
+
+    messages_encoded: int
+    """Number of messages encoded successfully."""
+
+    def __init__(self):
+        self.reset()
+
+    def reset(self) -> None:
+        """Resets all the counters to zero."""
+        self.bytes_encoded = 0
+        self.encode_failures = 0
+        self.encode_time_ns = 0
+        self.messages_encoded = 0
+
+    def snapshot(self) -> dict[str, Any]:
+        """Returns the current values of the counters as a dictionary."""
+        return {
+            "bytes_encoded": self.bytes_encoded,
+            "encode_failures": self.encode_failures,
+            "encode_time_ns": self.encode_time_ns,
+            "messages_encoded": self.messages_encoded,
+        }
@@ -0,0 +1,209 @@
+"""Precompiled converters that turn dataclasses and messages of known shape
+into JSON-serializable objects.
+"""
+
+from collections.abc import Iterable as IterableABC, Mapping as MappingABC
+from dataclasses import fields, is_dataclass
+from datetime import datetime
+from enum import Enum
+from inspect import isclass
+from types import UnionType
+from typing import (
+    Any,
+    Callable,
+    Iterable,
+    Mapping,
+    Union,
+    get_args,
+    get_origin,
+    get_type_hints,
+)
+
+__all__ = ("compile_schema",)
+
+
+class _SchemaCompiler:
+    """Generates the source code of the converter functions of dataclasses and
+    compiles them.
+
+    Converters of nested dataclasses are generated once and shared, so
+    recursive dataclasses are supported.
+    """
+
+    namespace: dict[str, Any]
+    """Global namespace of the generated functions."""
+
+    native_types: tuple[type, ...]
+    """Types that are passed through as is because the JSON encoder
+    serializes them natively.
+    """
+
+    sort_keys: bool
+    """Whether the keys of the generated objects are sorted."""
+
+    _count: int
+    """Number of converter functions generated so far."""
+
+    _names: dict[type, str]
+    """Names of the converter functions and lookup tables generated so far,
+    keyed by the dataclass or enum they convert.
+    """
+
+    def __init__(self, *, native_types: Iterable[type] = (), sort_keys: bool = False):
+        self.namespace = {}
+        self.native_types = tuple(native_types)
+        self.sort_keys = sort_keys
+        self._count = 0
+        self._names = {}
+
+    def compile(self, schema: type | Mapping[str, Any]) -> Callable[[Any], Any]:
+        """Returns the converter function of the given schema."""
+        name = self._compile(schema)
+        return self.namespace[name]
+
+    def _compile(self, schema: type | Mapping[str, Any]) -> str:
+        if isinstance(schema, MappingABC):
+            items = [(repr(key), f"obj[{key!r}]", tp) for key, tp in schema.items()]
+        elif isclass(schema) and is_dataclass(schema):
+            name = self._names.get(schema)
+            if name is not None:
+                return name
+
+            hints = get_type_hints(schema)
+            items = [
+                (repr(field.name), f"obj.{field.name}", hints.get(field.name, Any))
+                for field in fields(schema)
+            ]
+        else:
+            raise TypeError(f"schema must be a dataclass or a mapping, got {schema!r}")
+
+        # Register the name before generating the body so recursive
+        # dataclasses refer to the function being generated
+        name = f"convert_{self._count}"
+        self._count += 1
+        if not isinstance(schema, MappingABC):
+            self._names[schema] = name
+
+        if self.sort_keys:
+            items.sort()
+
+        entries = []
+        for key, expr, tp in items:
+            entries.append(f"{key}: {self._convert(tp, expr, 0)}")
+
+        source = f"def {name}(obj):\n    return {{{', '.join(entries)}}}\n"
+        exec(compile(source, f"<schema converter {name}>", "exec"), self.namespace)
+        return name
+
+    def _get_enum_names(self, tp: type[Enum]) -> str:
+        """Returns the name of a lookup table that maps the members of the
+        given enum to their names. This is faster than retrieving the name of
+        a member from the member itself.
+        """
+        name = self._names.get(tp)
+        if name is None:
+            name = self._names[tp] = f"names_{self._count}"
+            self._count += 1
+            self.namespace[name] = {member: member.name for member in tp}
+        return name
+
+    def _convert(self, tp: Any, expr: str, depth: int) -> str:
+        """Returns an expression that converts the value of the given
+        expression of the given type to a JSON-serializable form.
+        """
+        if isinstance(tp, MappingABC):
+            return f"{self._compile(tp)}({expr})"
+
+        if isclass(tp):
+            if issubclass(tp, self.native_types):
+                return expr
+            if issubclass(tp, datetime):
+                return f"{expr}.isoformat()"
+            if issubclass(tp, Enum):
+                return f"{self._get_enum_names(tp)}[{expr}]"
+            if is_dataclass(tp):
+                return f"{self._compile(tp)}({expr})"
+            return expr
+
+        origin = get_origin(tp)
+        args = get_args(tp)
+
+        if origin is Union or origin is UnionType:
+            options = [arg for arg in args if arg is not type(None)]
+            if len(options) == 1:
+                converted = self._convert(options[0], expr, depth)
+                if converted != expr:
+                    return f"(None if {expr} is None else {converted})"
+            return expr
+
+        if origin is None or not args:
+            return expr
+
+        if not isclass(origin):
+            return expr
+
+        var = f"v{depth}"
+        if issubclass(origin, MappingABC):
+            if len(args) != 2:
+                return expr
+            converted = self._convert(args[1], var, depth + 1)
+            if converted == var:
+                return expr
+            key = f"k{depth}"
+            return f"{{{key}: {converted} for {key}, {var} in {expr}.items()}}"
+
+        if issubclass(origin, IterableABC):
+            if origin is tuple and not (len(args) == 2 and args[1] is Ellipsis):
+                # Heterogeneous tuple; leave it to the JSON encoder
+                return expr
+            converted = self._convert(args[0], var, depth + 1)
+            if converted == var:
+                return expr
+            return f"[{converted} for {var} in {expr}]"
+
+        return expr
+
+
+def compile_schema(
+    schema: type | Mapping[str, Any],
+    *,
+    native_types: Iterable[type] = (),
+    sort_keys: bool = False,
+) -> Callable[[Any], Any]:
+    """Generates a function that converts objects of a known shape into
+    objects that JSON encoders can serialize natively.
+
+    The schema is either a dataclass or a mapping from keys to types that
+    describes dictionaries; the types in a mapping may also be mappings
+    that describe nested dictionaries. The function is generated once and contains a
+    dedicated expression for each field, so the type of each field is
+    inspected only when the function is generated and not every time an
+    object is converted:
+
+    - `datetime` fields are converted to ISO 8601 strings.
+    - `Enum` fields are converted to the names of their members.
+    - Dataclass fields are converted with their own generated functions.
+    - Optional fields and lists, tuples, sets and dictionaries of the above
+      are converted element by element.
+    - All other fields are passed through as is.
+
+    The generated function reads the fields of dataclasses directly; the
+    ``json`` property of the dataclass, if any, is not used. Every key of a
+    mapping schema must be present in the dictionaries being converted.
+
+    Parameters:
+        schema: the dataclass or the mapping from keys to types
+        native_types: types that are passed through as is because the JSON
+            encoder serializes them natively, e.g. `datetime` and `Enum` with
+            `orjson`
+        sort_keys: whether to sort the keys of the generated objects instead
+            of using the order of the fields in the schema
+
+    Returns:
+        the generated function
+
+    Raises:
+        TypeError: if the schema is neither a dataclass nor a mapping
+    """
+    compiler = _SchemaCompiler(native_types=native_types, sort_keys=sort_keys)
+    return compiler.compile(schema)
@@ -1,7 +1,15 @@
-from typing import Callable, TypeVar
+from typing import Callable, Iterable, Sequence, TypeVar
 
 
-__all__ = ("Encoder", "Wrapper", "T")
+__all__ = (
+    "BatchEncoder",
+    "BatchWrapper",
+    "Encoder",
+    "PartsEncoder",
+    "PartsWrapper",
+    "Wrapper",
+    "T",
+)
 
 T = TypeVar("T")
 
@@ -36,3 +44,76 @@ Returns:
 Raises:
     EncodingError: in case of unrecoverable encoding errors
 """
+
+BatchEncoder = Callable[[Iterable[T]], bytes]
+"""Type specification for functions that encode multiple messages at once
+and return their serialized variants concatenated in a single buffer.
+
+Encoders returned by `create_encoder()` provide a batch encoder in their
+``encode_many`` attribute.
+
+Parameters:
+    messages: the messages to send
+
+Returns:
+    the raw byte representation of all the messages on the network, in a
+    single buffer
+
+Raises:
+    EncodingError: in case of unrecoverable encoding errors
+"""
+
+BatchWrapper = Callable[[Sequence[bytes]], bytes]
+"""Type specification for functions that wrap multiple serialized messages
+at once and return the wrapped messages concatenated in a single buffer.
+
+The built-in wrappers provide a batch wrapper in their ``wrap_many``
+attribute.
+
+Accepts:
+    the raw bytes of the messages to feed into the wrapper
+
+Returns:
+    the wrapped messages, concatenated in a single buffer
+
+Raises:
+    EncodingError: in case of unrecoverable encoding errors
+"""
+
+PartsEncoder = Callable[[T], tuple[bytes, bytes, bytes]]
+"""Type specification for encoder functions that return the header, the
+payload and the trailer of the serialized message separately instead of
+concatenating them.
+
+Encoders returned by `create_encoder()` provide a parts encoder in their
+``encode_parts`` attribute.
+
+Parameters:
+    message: the message to send
+
+Returns:
+    the header, the payload and the trailer of the raw byte representation of
+    the message on the network; the header and the trailer may be empty
+
+Raises:
+    EncodingError: in case of unrecoverable encoding errors
+"""
+
+PartsWrapper = Callable[[bytes], tuple[bytes, bytes, bytes]]
+"""Type specification for wrapper functions that return the header, the
+payload and the trailer of the wrapped message separately instead of
+concatenating them, so the payload does not need to be copied.
+
+The built-in wrappers provide a parts wrapper in their ``wrap_parts``
+attribute.
+
+Accepts:
+    the raw bytes to feed into the wrapper
+
+Returns:
+    the header, the raw bytes and the trailer; the header and the trailer may
+    be empty
+
+Raises:
+    EncodingError: in case of unrecoverable encoding errors
+"""
@@ -1,46 +1,251 @@
 """Wrapper factory functions to be used as building blocks for encoders."""
 
-__all__ = ("append_separator", "prefix_with_length")
+__all__ = (
+    "append_crc",
+    "append_separator",
+    "chain_wrappers",
+    "frame_with_cobs",
+    "frame_with_slip",
+    "frame_with_sync_word",
+    "prefix_with_length",
+)
 
-from functools import lru_cache
+from functools import lru_cache, partial
 from struct import Struct
+from typing import Literal, Sequence
+from zlib import crc32
 
-from ..parsers.splitters import _propose_header_length, _validate_endianness
+from ..parsers.crc import get_crc_algorithm
+from ..parsers.splitters import (
+    DEFAULT_SYNC_WORD,
+    MAX_VARINT_LENGTH,
+    _propose_header_length,
+    _validate_endianness,
+)
 
 from .errors import EncodingError
 from .types import Wrapper
 
 
+@lru_cache(maxsize=None)
+def append_crc(algorithm: str = "crc32", *, endianness: str = "big") -> Wrapper:
+    _validate_endianness(endianness)
+
+    func, size = get_crc_algorithm(algorithm)
+    to_bytes = int.to_bytes
+
+    def wrap_parts(data: bytes) -> tuple[bytes, bytes, bytes]:
+        return b"", data, to_bytes(func(data), size, endianness)
+
+    def wrapper(data: bytes) -> bytes:
+        return data + to_bytes(func(data), size, endianness)
+
+    def wrap_many(payloads: Sequence[bytes]) -> bytes:
+        # Interleave the payloads with the checksums and join them in a
+        # single step so the result is allocated only once
+        parts = [b""] * (2 * len(payloads))
+        parts[::2] = payloads
+        parts[1::2] = [to_bytes(func(data), size, endianness) for data in payloads]
+        return b"".join(parts)
+
+    wrapper.wrap_many = wrap_many  # type: ignore[attr-defined]
+    wrapper.wrap_parts = wrap_parts  # type: ignore[attr-defined]
+    return wrapper
+
+
 @lru_cache(maxsize=None)
 def append_separator(separator: bytes) -> Wrapper:
     def wrapper(data: bytes) -> bytes:
         return data + separator
 
+    def wrap_many(payloads: Sequence[bytes]) -> bytes:
+        # Joining with an extra empty item at the end appends the separator
+        # after the last payload as well, without another allocation
+        return separator.join([*payloads, b""]) if payloads else b""
+
+    def wrap_parts(data: bytes) -> tuple[bytes, bytes, bytes]:
+        return b"", data, separator
+
+    wrapper.wrap_many = wrap_many  # type: ignore[attr-defined]
+    wrapper.wrap_parts = wrap_parts  # type: ignore[attr-defined]
     return wrapper
 
 
+def chain_wrappers(*wrappers: Wrapper) -> Wrapper:
+    """Returns a wrapper that wraps each message with the given wrappers in
+    the order they were given, i.e. the first wrapper is applied first and
+    the last one is applied last.
+
+    The ``wrap_many`` attribute of the last wrapper is used to assemble the
+    output of multiple messages in a single step, and its ``wrap_parts``
+    attribute is used to return the header and the trailer of a message
+    separately.
+    """
+    if not wrappers:
+        raise ValueError("at least one wrapper must be given")
+
+    *inner, outer = wrappers
+
+    def wrap_inner(data: bytes) -> bytes:
+        for func in inner:
+            data = func(data)
+        return data
+
+    wrap_many_outer = getattr(outer, "wrap_many", None)
+    wrap_parts_outer = getattr(outer, "wrap_parts", None)
+
+    def wrapper(data: bytes) -> bytes:
+        return outer(wrap_inner(data))
+
+    def wrap_many(payloads: Sequence[bytes]) -> bytes:
+        if wrap_many_outer is not None:
+            return wrap_many_outer([wrap_inner(data) for data in payloads])
+        else:
+            return b"".join([wrapper(data) for data in payloads])
+
+    def wrap_parts(data: bytes) -> tuple[bytes, bytes, bytes]:
+        if wrap_parts_outer is not None:
+            return wrap_parts_outer(wrap_inner(data))
+        else:
+            return b"", wrapper(data), b""
+
+    wrapper.wrap_many = wrap_many  # type: ignore[attr-defined]
+    wrapper.wrap_parts = wrap_parts  # type: ignore[attr-defined]
+    return wrapper
+
+
+_COBS_CODES = [bytes([code]) for code in range(256)]
+"""Single-byte `bytes` objects of all the possible COBS block codes."""
+
+
+def _encode_cobs(data: bytes, parts: list[bytes]) -> None:
+    """Encodes a message with Consistent Overhead Byte Stuffing and appends
+    the blocks of the encoded message to the given list, without the
+    terminating zero byte.
+
+    The message is split around its zero bytes in a single pass; each run of
+    non-zero bytes is then copied with slicing, in blocks of at most 254
+    bytes.
+    """
+    codes = _COBS_CODES
+    runs = data.split(b"\x00")
+    last = len(runs) - 1
+
+    for index, run in enumerate(runs):
+        length = len(run)
+        pos = 0
+        while length - pos >= 254:
+            parts.append(b"\xff")
+            parts.append(run[pos : pos + 254])
+            pos += 254
+
+        # A run at the end of the message that fits exactly into full blocks
+        # needs no extra empty block
+        if pos < length or pos == 0 or index < last:
+            parts.append(codes[length - pos + 1])
+            parts.append(run[pos:] if pos else run)
+
+
+@lru_cache(maxsize=None)
+def frame_with_cobs() -> Wrapper:
+    def wrapper(data: bytes) -> bytes:
+        parts: list[bytes] = []
+        _encode_cobs(data, parts)
+        parts.append(b"\x00")
+        return b"".join(parts)
+
+    def wrap_many(payloads: Sequence[bytes]) -> bytes:
+        parts: list[bytes] = []
+        for data in payloads:
+            _encode_cobs(data, parts)
+            parts.append(b"\x00")
+        return b"".join(parts)
+
+    def wrap_parts(data: bytes) -> tuple[bytes, bytes, bytes]:
+        parts: list[bytes] = []
+        _encode_cobs(data, parts)
+        return b"", b"".join(parts), b"\x00"
+
+    wrapper.wrap_many = wrap_many  # type: ignore[attr-defined]
+    wrapper.wrap_parts = wrap_parts  # type: ignore[attr-defined]
+    return wrapper
+
+
+def _escape_slip(data: bytes) -> bytes:
+    # ESC must be escaped first so the ESC bytes of the escaped END bytes
+    # are not escaped again
+    return (
+        data.replace(b"\xdb", b"\xdb\xdd").replace(b"\xc0", b"\xdb\xdc")
+        if b"\xdb" in data or b"\xc0" in data
+        else data
+    )
+
+
+@lru_cache(maxsize=None)
+def frame_with_slip() -> Wrapper:
+    def wrapper(data: bytes) -> bytes:
+        return _escape_slip(data) + b"\xc0"
+
+    def wrap_many(payloads: Sequence[bytes]) -> bytes:
+        return b"\xc0".join([*map(_escape_slip, payloads), b""]) if payloads else b""
+
+    def wrap_parts(data: bytes) -> tuple[bytes, bytes, bytes]:
+        return b"", _escape_slip(data), b"\xc0"
+
+    wrapper.wrap_many = wrap_many  # type: ignore[attr-defined]
+    wrapper.wrap_parts = wrap_parts  # type: ignore[attr-defined]
+    return wrapper
+
+
+_VARINTS = [bytes([value]) for value in range(128)]
+"""Varint encodings of all the lengths that fit into a single byte."""
+
+
+def _encode_varint(value: int) -> bytes:
+    """Encodes a non-negative integer as an unsigned LEB128 varint."""
+    if value < 0x80:
+        return _VARINTS[value]
+    if value < 0x4000:
+        return bytes(((value & 0x7F) | 0x80, value >> 7))
+
+    result = bytearray()
+    while value >= 0x80:
+        result.append((value & 0x7F) | 0x80)
+        value >>= 7
+    result.append(value)
+    return bytes(result)
+
+
 def prefix_with_length(
     *,
     max_length: int | None = None,
-    header_length: int | None = None,
+    header_length: int | Literal["varint"] | None = None,
     endianness: str = "big",
 ) -> Wrapper:
-    header_length = header_length or _propose_header_length(max_length)
-    if max_length is None:
-        max_length = (2 ** (8 * header_length)) - 1
+    _validate_endianness(endianness)
 
-    assert max_length is not None
+    if header_length == "varint":
+        if max_length is None:
+            max_length = (2 ** (7 * MAX_VARINT_LENGTH)) - 1
+    else:
+        header_length = header_length or _propose_header_length(max_length)
+        if max_length is None:
+            max_length = (2 ** (8 * header_length)) - 1
 
-    _validate_endianness(endianness)
+    assert max_length is not None
 
-    if header_length == 1:
-        length_struct = Struct("B")
+    if header_length == "varint":
+        encode_length = _encode_varint
+    elif header_length == 1:
+        encode_length = Struct("B").pack
     elif header_length == 2:
-        length_struct = Struct(">H") if endianness == "big" else Struct("<H")
+        encode_length = Struct(">H" if endianness == "big" else "<H").pack
     elif header_length == 4:
-        length_struct = Struct(">I") if endianness == "big" else Struct("<I")
+        encode_length = Struct(">I" if endianness == "big" else "<I").pack
     else:
-        length_struct = None
+        encode_length = partial(
+            int.to_bytes, length=header_length, byteorder=endianness
+        )
 
     def wrapper(data: bytes) -> bytes:
         length = len(data)
@@ -49,17 +254,76 @@ def prefix_with_length(
                 f"packet length exceeds limit ({length} > {max_length})"
             )
 
-        if length_struct:
-            return length_struct.pack(length) + data
-        else:
-            header = [0] * header_length
-            i = 0
-            while length > 0:
-                header[i] = length & 0xFF
-                length >>= 8
-                i += 1
-            if endianness == "big":
-                header.reverse()
-            return bytes(header) + data
+        return encode_length(length) + data
+
+    def wrap_parts(data: bytes) -> tuple[bytes, bytes, bytes]:
+        length = len(data)
+        if length > max_length:
+            raise EncodingError(
+                f"packet length exceeds limit ({length} > {max_length})"
+            )
+
+        return encode_length(length), data, b""
+
+    def wrap_many(payloads: Sequence[bytes]) -> bytes:
+        lengths = [len(data) for data in payloads]
+        if lengths:
+            longest = max(lengths)
+            if longest > max_length:
+                raise EncodingError(
+                    f"packet length exceeds limit ({longest} > {max_length})"
+                )
+
+        # Interleave the headers with the payloads and join them in a single
+        # step so the result is allocated only once
+        parts = [b""] * (2 * len(lengths))
+        parts[::2] = [encode_length(length) for length in lengths]
+        parts[1::2] = payloads
+        return b"".join(parts)
+
+    wrapper.wrap_many = wrap_many  # type: ignore[attr-defined]
+    wrapper.wrap_parts = wrap_parts  # type: ignore[attr-defined]
+    return wrapper
+
+
+def frame_with_sync_word(
+    *,
+    max_length: int | None = None,
+    header_length: int | None = None,
+    endianness: str = "big",
+    sync_word: bytes = DEFAULT_SYNC_WORD,
+) -> Wrapper:
+    header_length = header_length or _propose_header_length(max_length)
+    if max_length is None:
+        max_length = (2 ** (8 * header_length)) - 1
+
+    assert max_length is not None
+
+    _validate_endianness(endianness)
+    if not sync_word:
+        raise ValueError("sync word must not be empty")
+
+    sync_word = bytes(sync_word)
+    encode_checksum = Struct(">I" if endianness == "big" else "<I").pack
+    encode_length = prefix_with_length(
+        max_length=max_length, header_length=header_length, endianness=endianness
+    ).wrap_parts  # type: ignore[attr-defined]
+
+    def wrap_parts(data: bytes) -> tuple[bytes, bytes, bytes]:
+        length, _, _ = encode_length(data)
+        return (
+            sync_word + length,
+            data,
+            encode_checksum(crc32(data, crc32(length))),
+        )
+
+    def wrapper(data: bytes) -> bytes:
+        header, data, trailer = wrap_parts(data)
+        return b"".join((header, data, trailer))
+
+    def wrap_many(payloads: Sequence[bytes]) -> bytes:
+        return b"".join([part for data in payloads for part in wrap_parts(data)])
 
+    wrapper.wrap_many = wrap_many  # type: ignore[attr-defined]
+    wrapper.wrap_parts = wrap_parts  # type: ignore[attr-defined]
     return wrapper
@@ -1,15 +1,43 @@
 """Message parsers for the Flockwave application suite."""
 
-from .errors import ParseError
-from .factories import create_length_prefixed_parser, create_line_parser, create_parser
+from .dispatch import Dispatcher
+from .errors import DispatchError, ParseError
+from .factories import (
+    create_cobs_parser,
+    create_length_prefixed_parser,
+    create_line_parser,
+    create_parser,
+    create_slip_parser,
+    create_sync_word_parser,
+)
+from .files import iter_file_frames, parse_file
+from .index import FrameIndex, IndexedRecording
+from .metrics import ParserMetrics
+from .parallel import create_parallel_parser
+from .sharding import ShardedParser
+from .streams import ParserProtocol, parse_stream
 from .types import Filter, Parser, Splitter
 
 __all__ = (
+    "create_cobs_parser",
     "create_parser",
     "create_length_prefixed_parser",
     "create_line_parser",
+    "create_parallel_parser",
+    "create_slip_parser",
+    "create_sync_word_parser",
+    "DispatchError",
+    "Dispatcher",
     "Filter",
+    "FrameIndex",
+    "IndexedRecording",
+    "iter_file_frames",
     "ParseError",
     "Parser",
+    "ParserMetrics",
+    "ParserProtocol",
+    "parse_file",
+    "parse_stream",
+    "ShardedParser",
     "Splitter",
 )
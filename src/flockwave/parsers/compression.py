@@ -0,0 +1,198 @@
+"""Decompression of individually framed messages that were compressed with a
+long-lived `zlib` compression context on the sending side.
+"""
+
+from binascii import Error as Base64Error, a2b_base64
+from collections import Counter
+from typing import Any, Callable, Iterable
+from zlib import decompressobj, error as ZlibError
+
+from .errors import ParseError
+from .splitters import BufferedSplitter
+from .types import Splitter
+
+__all__ = (
+    "CompressionMetrics",
+    "DecompressingSplitter",
+    "decompress_frames",
+    "train_zlib_dictionary",
+)
+
+SYNC_FLUSH_TRAILER = b"\x00\x00\xff\xff"
+"""The bytes that end the output of the compressor after each message is
+flushed with `Z_SYNC_FLUSH`. They are identical for every message, so they are
+omitted from the compressed messages and re-added before decompression.
+"""
+
+MAX_DICTIONARY_SIZE = 32768
+"""Maximum size of a preset dictionary that `zlib` can make use of; only the
+last 32 KiB of the dictionary fit into the compression window.
+"""
+
+
+class CompressionMetrics:
+    """Counters of the amount of data that passed through a compressing
+    wrapper or a decompressing splitter.
+    """
+
+    __slots__ = ("bytes_compressed", "bytes_uncompressed", "messages")
+
+    bytes_compressed: int
+    """Total number of bytes in the compressed messages."""
+
+    bytes_uncompressed: int
+    """Total number of bytes in the messages before compression."""
+
+    messages: int
+    """Number of messages processed."""
+
+    def __init__(self):
+        self.reset()
+
+    @property
+    def ratio(self) -> float | None:
+        """Compression ratio, i.e. the number of uncompressed bytes divided by
+        the number of compressed bytes; `None` if no data was processed yet.
+        """
+        if not self.bytes_compressed:
+            return None
+        return self.bytes_uncompressed / self.bytes_compressed
+
+    def reset(self) -> None:
+        """Resets all the counters to zero."""
+        self.bytes_compressed = 0
+        self.bytes_uncompressed = 0
+        self.messages = 0
+
+    def snapshot(self) -> dict[str, Any]:
+        """Returns the current values of the counters as a dictionary."""
+        return {
+            "bytes_compressed": self.bytes_compressed,
+            "bytes_uncompressed": self.bytes_uncompressed,
+            "messages": self.messages,
+            "ratio": self.ratio,
+        }
+
+
+class DecompressingSplitter(BufferedSplitter):
+    """Splitter engine that splits the incoming data with another splitter and
+    decompresses each message with a single long-lived `zlib` decompression
+    context, as created by `compress_with_zlib()` on the encoder side.
+
+    Since the compression context is shared by all the messages of a stream,
+    every message must be decompressed in order, including the ones that are
+    later rejected by the filters of the parser. Decompressing the messages
+    in the splitter guarantees this.
+    """
+
+    __slots__ = ("_decompress", "_splitter", "_text_safe", "metrics")
+
+    metrics: CompressionMetrics
+    """Counters of the amount of data decompressed by the splitter."""
+
+    def __init__(
+        self,
+        splitter: Splitter,
+        *,
+        zdict: bytes | None = None,
+        text_safe: bool = False,
+    ):
+        super().__init__()
+
+        decompressor = (
+            decompressobj(wbits=-15, zdict=zdict)
+            if zdict is not None
+            else decompressobj(wbits=-15)
+        )
+
+        self._decompress = decompressor.decompress
+        self._splitter = splitter
+        self._text_safe = text_safe
+        self.metrics = CompressionMetrics()
+
+        next(splitter)
+
+    @property
+    def pending(self) -> int:
+        return getattr(self._splitter, "pending", 0)
+
+    def feed(self, data: bytes) -> list[bytes]:
+        frames = self._splitter.send(data)
+        if not frames:
+            return []
+
+        decompress = self._decompress
+        metrics = self.metrics
+        result = []
+
+        try:
+            for frame in frames:
+                if self._text_safe:
+                    frame = a2b_base64(frame)
+                message = decompress(frame + SYNC_FLUSH_TRAILER)
+                metrics.bytes_compressed += len(frame)
+                metrics.bytes_uncompressed += len(message)
+                result.append(message)
+        except (Base64Error, ZlibError) as ex:
+            raise ParseError(f"failed to decompress message: {ex}") from ex
+
+        metrics.messages += len(result)
+        return result
+
+
+def decompress_frames(
+    splitter: Splitter | Callable[[], Splitter],
+    *,
+    zdict: bytes | None = None,
+    text_safe: bool = False,
+) -> Splitter:
+    """Returns a splitter that splits the incoming data with the given
+    splitter and decompresses each message that was compressed with
+    `compress_with_zlib()` on the encoder side.
+
+    The returned splitter has a ``metrics`` attribute that reports the
+    compression ratio of the stream.
+
+    Parameters:
+        splitter: the splitter that separates the compressed messages, or a
+            function that creates it
+        zdict: the preset dictionary that was used by the compressor, if any
+        text_safe: whether the compressed messages were encoded in base64
+
+    Returns:
+        a splitter that can be used with `create_parser()`
+
+    Raises:
+        ParseError: when a message cannot be decompressed; the compression
+            context of the stream is lost in this case
+    """
+    if callable(splitter):
+        splitter = splitter()
+    return DecompressingSplitter(splitter, zdict=zdict, text_safe=text_safe)
+
+
+def train_zlib_dictionary(
+    samples: Iterable[bytes], size: int = MAX_DICTIONARY_SIZE
+) -> bytes:
+    """Creates a preset dictionary for `zlib` from sample messages.
+
+    The distinct samples are ordered by the number of times they occur, with
+    the most common ones at the end of the dictionary where `zlib` can refer
+    to them with the shortest distances. The dictionary is then truncated
+    from the front to the given size.
+
+    Parameters:
+        samples: the sample messages, typically encoded messages recorded from
+            real traffic
+        size: maximum size of the dictionary in bytes
+
+    Returns:
+        the dictionary to pass as ``zdict`` to both the compressing wrapper
+        and the decompressing splitter
+    """
+    if size <= 0:
+        raise ValueError("dictionary size must be positive")
+
+    counts = Counter(samples)
+    ordered = sorted(counts, key=counts.__getitem__)
+    return b"".join(ordered)[-size:]
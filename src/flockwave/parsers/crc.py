@@ -0,0 +1,97 @@
+"""CRC algorithms used by the checksum-verifying filters and the
+checksum-appending wrappers.
+"""
+
+from binascii import crc_hqx
+from typing import Callable
+from zlib import crc32
+
+__all__ = ("crc16_ccitt", "crc16_mcrf4xx", "crc32", "get_crc_algorithm")
+
+_REVERSED_BITS = bytes(int(f"{i:08b}"[::-1], 2) for i in range(256))
+"""Translation table that reverses the order of the bits in each byte."""
+
+
+def crc16_ccitt(data: bytes, value: int = 0xFFFF) -> int:
+    """Calculates the CRC-16-CCITT checksum (also known as CRC-16/CCITT-FALSE)
+    of the given data: polynomial 0x1021, initial value 0xFFFF, no reflection
+    and no final XOR.
+
+    The calculation is delegated to the table-driven C implementation of
+    `binascii.crc_hqx()`.
+
+    Parameters:
+        data: the data to calculate the checksum of
+        value: the initial value; pass the checksum of the preceding data to
+            calculate a checksum incrementally
+    """
+    return crc_hqx(data, value)
+
+
+def crc16_mcrf4xx(data: bytes, value: int = 0xFFFF) -> int:
+    """Calculates the CRC-16/MCRF4XX checksum (the X.25 checksum without the
+    final XOR, used by MAVLink) of the given data: reflected polynomial
+    0x8408, initial value 0xFFFF and no final XOR.
+
+    A reflected CRC is equal to the non-reflected CRC of the bit-reversed
+    input, bit-reversed again. The input is therefore bit-reversed with a
+    single table-driven `bytes.translate()` call and the checksum itself is
+    calculated by `binascii.crc_hqx()`, so no Python code runs per byte.
+
+    Parameters:
+        data: the data to calculate the checksum of
+        value: the initial value; pass the checksum of the preceding data to
+            calculate a checksum incrementally
+    """
+    table = _REVERSED_BITS
+    value = (table[value & 0xFF] << 8) | table[value >> 8]
+    value = crc_hqx(bytes(data).translate(table), value)
+    return (table[value & 0xFF] << 8) | table[value >> 8]
+
+
+_CRC_ALGORITHMS: dict[str, tuple[Callable[[bytes], int], int]] = {
+    "crc16-ccitt": (crc16_ccitt, 2),
+    "crc16-mcrf4xx": (crc16_mcrf4xx, 2),
+    "crc32": (crc32, 4),
+}
+"""Supported CRC algorithms, keyed by name, with the number of bytes that
+their checksums occupy.
+"""
+
+
+_CRC_RESIDUES: dict[str, tuple[str, int]] = {
+    "crc16-ccitt": ("big", 0),
+    "crc16-mcrf4xx": ("little", 0),
+    "crc32": ("little", 0x2144DF1C),
+}
+"""Byte order of the checksum in which the checksum of a message followed by
+its own checksum is a constant (the residue) for each algorithm, and the value
+of the residue.
+"""
+
+
+def get_crc_algorithm(name: str) -> tuple[Callable[[bytes], int], int]:
+    """Returns the function that calculates the checksum with the CRC
+    algorithm of the given name, and the number of bytes that the checksum
+    occupies.
+
+    Parameters:
+        name: the name of the algorithm; one of ``crc16-ccitt``,
+            ``crc16-mcrf4xx`` or ``crc32``
+
+    Raises:
+        ValueError: if the algorithm is not supported
+    """
+    try:
+        return _CRC_ALGORITHMS[name]
+    except KeyError:
+        raise ValueError(f"unknown CRC algorithm: {name}") from None
+
+
+def _get_crc_residue(name: str, endianness: str) -> int | None:
+    """Returns the checksum of any message followed by its own checksum in
+    the given byte order with the CRC algorithm of the given name, or `None`
+    if this is not a constant for the given byte order.
+    """
+    byte_order, residue = _CRC_RESIDUES[name]
+    return residue if byte_order == endianness else None
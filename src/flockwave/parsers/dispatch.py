@@ -0,0 +1,262 @@
+"""Dispatching of parsed messages to handlers based on their types."""
+
+from typing import Any, Callable, Generic, Hashable, Sequence, overload
+
+from .errors import DispatchError
+from .json import FLOCKWAVE_TYPE_KEY
+from .types import T
+
+__all__ = ("Dispatcher",)
+
+
+def _create_path_getter(path: Sequence[str]) -> Callable[[Any], Any]:
+    """Returns a function that walks the given path of keys in a decoded JSON
+    message and returns the value at the end of the path, or `None` if the
+    path does not exist in the message.
+    """
+    path = tuple(path)
+    if not path:
+        raise ValueError("key path must not be empty")
+
+    if len(path) == 1:
+        (key,) = path
+
+        def get_one(message: Any) -> Any:
+            try:
+                return message[key]
+            except (KeyError, IndexError, TypeError):
+                return None
+
+        return get_one
+
+    if len(path) == 2:
+        first, second = path
+
+        def get_two(message: Any) -> Any:
+            try:
+                return message[first][second]
+            except (KeyError, IndexError, TypeError):
+                return None
+
+        return get_two
+
+    def get(message: Any) -> Any:
+        try:
+            for part in path:
+                message = message[part]
+        except (KeyError, IndexError, TypeError):
+            return None
+        return message
+
+    return get
+
+
+class Dispatcher(Generic[T]):
+    """Dispatcher that hands each parsed message to the handler registered
+    for the type of the message.
+
+    The handlers are stored in a table keyed by message type, so finding the
+    handler of a message takes a single dictionary lookup no matter how many
+    handlers there are. Handlers registered with ``batch=True`` are called
+    once per chunk of input with the list of all the messages of their type
+    in the chunk, in the order they were received.
+
+    A dispatcher is plugged into a parser with ``dispatcher=...`` (see
+    `create_parser_generator()`). The parser then returns only the messages
+    that no handler was registered for; all the other messages are consumed
+    by the dispatcher.
+
+    Example::
+
+        dispatcher = Dispatcher()
+
+        @dispatcher.on("UAV-INF", batch=True)
+        def handle_status(messages):
+            ...
+
+        parser = create_json_parser(
+            dispatcher=dispatcher, types=dispatcher.keys()
+        )
+
+    The type of an RPC message is its method name; use
+    ``Dispatcher(key=get_rpc_method)`` with `create_rpc_parser()`.
+    """
+
+    __slots__ = ("_batch_handlers", "_default", "_get_key", "_handlers")
+
+    _batch_handlers: dict[Hashable, Callable[[list[T]], Any]]
+    _default: Callable[[T], Any] | None
+    _get_key: Callable[[T], Any]
+    _handlers: dict[Hashable, Callable[[T], Any]]
+
+    def __init__(
+        self,
+        key: Callable[[T], Any] | str | Sequence[str] = FLOCKWAVE_TYPE_KEY,
+        *,
+        default: Callable[[T], Any] | None = None,
+    ):
+        """Constructor.
+
+        Parameters:
+            key: function that returns the type of a message, or a key or
+                path of keys leading to the type in a decoded JSON message;
+                defaults to the type of a message in the Flockwave envelope
+            default: optional function to call with the messages whose type
+                has no handler; when omitted, these messages are returned
+                from the parser instead
+        """
+        if isinstance(key, str):
+            key = _create_path_getter((key,))
+        elif not callable(key):
+            key = _create_path_getter(key)
+
+        self._batch_handlers = {}
+        self._default = default
+        self._get_key = key
+        self._handlers = {}
+
+    def __call__(self, messages: list[T]) -> list[T]:
+        return self.dispatch_many(messages)
+
+    def __contains__(self, key: Hashable) -> bool:
+        return key in self._handlers or key in self._batch_handlers
+
+    def dispatch(self, message: T) -> bool:
+        """Hands a single message to the handler registered for its type.
+
+        Batch handlers are called with a list containing the message only.
+
+        Returns:
+            whether the message was handled, either by the handler of its type
+            or by the default handler
+        """
+        return not self.dispatch_many([message])
+
+    def dispatch_many(self, messages: list[T]) -> list[T]:
+        """Hands each message in a list to the handler registered for its
+        type.
+
+        Handlers of individual messages are called in the order the messages
+        appear in the list. Batch handlers are called after that, in the
+        order they were registered.
+
+        An exception raised by a handler does not stop the dispatching; all
+        the messages are handed to their handlers first, and the exceptions
+        are then raised together in a `DispatchError`.
+
+        Returns:
+            the messages that have no handler; empty if there is a default
+            handler
+
+        Raises:
+            DispatchError: if one or more handlers raised an exception
+        """
+        get_key = self._get_key
+        default = self._default
+        unhandled: list[T] = []
+
+        if self._batch_handlers:
+            # Messages of batched types are collected into lists by making
+            # the append method of the list the handler of the type
+            batches = {key: [] for key in self._batch_handlers}
+            handlers = {key: batch.append for key, batch in batches.items()}
+            handlers.update(self._handlers)
+        else:
+            batches = None
+            handlers = self._handlers
+
+        errors: list[Exception] = []
+
+        for message in messages:
+            try:
+                handler = handlers.get(get_key(message))
+            except TypeError:
+                # Unhashable type, e.g. an object
+                handler = None
+
+            try:
+                if handler is not None:
+                    handler(message)
+                elif default is not None:
+                    default(message)
+                else:
+                    unhandled.append(message)
+            except Exception as ex:
+                errors.append(ex)
+
+        if batches:
+            batch_handlers = self._batch_handlers
+            for key, batch in batches.items():
+                if batch:
+                    try:
+                        batch_handlers[key](batch)
+                    except Exception as ex:
+                        errors.append(ex)
+
+        if errors:
+            raise DispatchError(errors, unhandled) from errors[0]
+
+        return unhandled
+
+    def keys(self) -> frozenset[Hashable]:
+        """Returns the message types that have a handler.
+
+        This can be passed as ``types=...`` to `create_json_parser()` to
+        drop all other messages before they are decoded when there is no
+        default handler.
+        """
+        return frozenset(self._handlers) | frozenset(self._batch_handlers)
+
+    @overload
+    def on(
+        self, key: Hashable, handler: None = None, *, batch: bool = False
+    ) -> Callable[[Callable[..., Any]], Callable[..., Any]]: ...
+
+    @overload
+    def on(
+        self, key: Hashable, handler: Callable[..., Any], *, batch: bool = False
+    ) -> Callable[..., Any]: ...
+
+    def on(
+        self,
+        key: Hashable,
+        handler: Callable[..., Any] | None = None,
+        *,
+        batch: bool = False,
+    ):
+        """Registers a handler for the messages of the given type, replacing
+        any earlier handler of the same type.
+
+        Can also be used as a decorator if the handler is omitted.
+
+        Parameters:
+            key: the message type to handle
+            handler: the handler to call with each message of the given type,
+                or with the list of messages of the given type in a chunk if
+                `batch` is ``True``
+            batch: whether the handler receives all the messages of its type
+                from a chunk of input in a single call
+
+        Returns:
+            the handler, or a decorator that registers the handler if the
+            handler was omitted
+        """
+        if handler is None:
+
+            def decorator(handler: Callable[..., Any]) -> Callable[..., Any]:
+                return self.on(key, handler, batch=batch)
+
+            return decorator
+
+        self.off(key)
+        if batch:
+            self._batch_handlers[key] = handler
+        else:
+            self._handlers[key] = handler
+
+        return handler
+
+    def off(self, key: Hashable) -> None:
+        """Removes the handler of the messages of the given type, if any."""
+        self._handlers.pop(key, None)
+        self._batch_handlers.pop(key, None)
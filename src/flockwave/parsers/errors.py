@@ -1,4 +1,35 @@
+from typing import Any
+
+
 class ParseError(RuntimeError):
     """Error thrown by all parses in case of unrecoverable parsing errors."""
 
     pass
+
+
+class DispatchError(RuntimeError):
+    """Error thrown by a `Dispatcher` when one or more of its handlers raised
+    an exception while the messages of a chunk were being dispatched.
+
+    The dispatcher hands all the messages of the chunk to their handlers
+    before raising this error, so a failing handler does not prevent other
+    messages from being handled. The first exception is also available as
+    the cause of this error.
+    """
+
+    errors: list[Exception]
+    """The exceptions raised by the handlers, in the order they were raised."""
+
+    unhandled: list[Any]
+    """The messages of the chunk that had no handler; these would have been
+    returned by the dispatcher if no handler had failed.
+    """
+
+    def __init__(self, errors: list[Exception], unhandled: list[Any]):
+        count = len(errors)
+        super().__init__(
+            f"{count} message handler{'s' if count > 1 else ''} failed; "
+            f"first error: {errors[0]!r}"
+        )
+        self.errors = errors
+        self.unhandled = unhandled
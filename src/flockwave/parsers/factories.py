@@ -2,17 +2,31 @@
 Flockwave application suite.
 """
 
-from typing import Callable, overload
-
-from .filters import reject_shorter_than
-from .splitters import dummy_splitter, split_lines, split_using_length_prefix
-from .types import Filter, Parser, ParserGenerator, Splitter, T
+from time import perf_counter_ns
+from typing import Any, Callable, Iterable, Literal, overload
+
+from .crc import get_crc_algorithm
+from .filters import reject_shorter_than, verify_crc
+from .metrics import ParserMetrics
+from .splitters import (
+    DEFAULT_SYNC_WORD,
+    dummy_splitter,
+    split_lines,
+    split_using_cobs,
+    split_using_length_prefix,
+    split_using_slip,
+    split_using_sync_word,
+)
+from .types import BatchDecoder, Filter, Parser, ParserGenerator, Splitter, T
 
 __all__ = (
+    "create_cobs_parser",
     "create_length_prefixed_parser",
     "create_line_parser",
     "create_parser",
     "create_parser_generator",
+    "create_slip_parser",
+    "create_sync_word_parser",
 )
 
 
@@ -20,10 +34,13 @@ __all__ = (
 def create_parser_generator(
     *,
     decoder: None = None,
+    batch_decoder: None = None,
     splitter: Splitter | Callable[[], Splitter] | None = None,
     pre_filter: Filter[bytes] | None = None,
     post_filter: Filter[bytes] | None = None,
     filter: Filter[bytes] | None = None,
+    metrics: ParserMetrics | None = None,
+    dispatcher: Callable[[list[bytes]], list[bytes]] | None = None,
 ) -> ParserGenerator[bytes]: ...
 
 
@@ -31,20 +48,40 @@ def create_parser_generator(
 def create_parser_generator(
     *,
     decoder: Callable[[bytes], T],
+    batch_decoder: None = None,
+    splitter: Splitter | Callable[[], Splitter] | None = None,
+    pre_filter: Filter[bytes] | None = None,
+    post_filter: Filter[T] | None = None,
+    filter: Filter[T] | None = None,
+    metrics: ParserMetrics | None = None,
+    dispatcher: Callable[[list[T]], list[T]] | None = None,
+) -> ParserGenerator[T]: ...
+
+
+@overload
+def create_parser_generator(
+    *,
+    decoder: None = None,
+    batch_decoder: BatchDecoder[T],
     splitter: Splitter | Callable[[], Splitter] | None = None,
     pre_filter: Filter[bytes] | None = None,
     post_filter: Filter[T] | None = None,
     filter: Filter[T] | None = None,
+    metrics: ParserMetrics | None = None,
+    dispatcher: Callable[[list[T]], list[T]] | None = None,
 ) -> ParserGenerator[T]: ...
 
 
 def create_parser_generator(
     *,
     decoder: Callable[[bytes], T] | None = None,
+    batch_decoder: BatchDecoder[T] | None = None,
     splitter: Splitter | Callable[[], Splitter] | None = None,
     pre_filter: Filter[bytes] | None = None,
     post_filter: Filter[T] | None = None,
     filter: Filter[T] | None = None,
+    metrics: ParserMetrics | None = None,
+    dispatcher: Callable[[list[T]], list[T]] | None = None,
 ) -> ParserGenerator[T]:
     """Creates a parser generator from a splitter and a decoder function
     and several optional filters.
@@ -58,20 +95,43 @@ def create_parser_generator(
             incoming message before it is given to the callback as
             the first argument. The return value of the function will be
             given to the callback instead of the incoming message.
+        batch_decoder: optional function to call on the list of raw messages
+            detected in a single chunk of the input, after pre-filtering.
+            It must return the list of decoded messages, in the same order as
+            the raw messages. Use this instead of `decoder` if decoding many
+            messages at once is cheaper than decoding them one by one.
+            Mutually exclusive with `decoder`.
         pre_filter: optional function to call on the raw bytes of each
             detected incoming message before it is given to the decoder. The
             function must return ``True`` or ``False``; if it returns
-            ``False``, the message will be dropped.
+            ``False``, the message will be dropped. If the function has a
+            ``filter_many`` attribute, it is called instead with the list of
+            all the raw messages in a chunk and it must return the list of
+            messages to keep.
         post_filter: optional function to call on each detected incoming
             message after it was passed through the decoder. The function
             must return ``True`` or ``False``; if it returns ``False``, the
             message will be dropped. `filter` is an alias to this keyword
             argument.
         filter: alias to ``post_filter``.
+        metrics: optional metrics object that the parser will update with
+            its performance counters
+        dispatcher: optional function to call with the list of messages
+            parsed from a single chunk of the input, after post-filtering.
+            It must return the list of messages that the parser should
+            return. Typically a `Dispatcher` that hands the messages to
+            handlers based on their types and returns the ones without a
+            handler. Note that an exception raised by the dispatcher
+            terminates the generator; parsers created with `create_parser()`
+            call the dispatcher outside the generator so they keep working
+            after a handler raised an exception.
     """
     if filter and post_filter:
         raise ValueError("filter=... and post_filter=... are mutually exclusive")
 
+    if decoder and batch_decoder:
+        raise ValueError("decoder=... and batch_decoder=... are mutually exclusive")
+
     post_filter = post_filter or filter
 
     if splitter is None:
@@ -86,10 +146,51 @@ def create_parser_generator(
     next(splitter_gen)  # prime the generator
     data = yield ()
 
+    if metrics is not None:
+        metrics.splitter = splitter_gen
+        yield from _parse_with_metrics(
+            data,
+            splitter_gen,
+            decoder=decoder,
+            batch_decoder=batch_decoder,
+            pre_filter=pre_filter,
+            post_filter=post_filter,
+            metrics=metrics,
+            dispatcher=dispatcher,
+        )
+
+    # Pre-filters may provide a faster way to check all the raw messages of
+    # a chunk in a single call
+    filter_many = getattr(pre_filter, "filter_many", None)
+
+    if batch_decoder:
+        while True:
+            chunks = splitter_gen.send(data)
+            if filter_many:
+                chunks = filter_many(chunks)
+            elif pre_filter:
+                chunks = [chunk for chunk in chunks if pre_filter(chunk)]
+
+            messages = batch_decoder(chunks) if chunks else []
+            if post_filter:
+                messages = [message for message in messages if post_filter(message)]
+
+            if dispatcher and messages:
+                messages = dispatcher(messages)
+
+            data = yield messages
+
+    if filter_many:
+        pre_filter = None
+
     while True:
         messages = []
 
-        for chunk in splitter_gen.send(data):
+        chunks = splitter_gen.send(data)
+        if filter_many:
+            chunks = filter_many(chunks)
+
+        for chunk in chunks:
             if pre_filter and not pre_filter(chunk):
                 continue
 
@@ -100,9 +201,86 @@ def create_parser_generator(
 
             messages.append(message)
 
+        if dispatcher and messages:
+            messages = dispatcher(messages)
+
         data = yield messages
 
 
+def _parse_with_metrics(
+    data: bytes,
+    splitter_gen: Splitter,
+    *,
+    decoder: Callable[[bytes], T] | None,
+    batch_decoder: BatchDecoder[T] | None,
+    pre_filter: Filter[bytes] | None,
+    post_filter: Filter[T] | None,
+    metrics: ParserMetrics,
+    dispatcher: Callable[[list[T]], list[T]] | None,
+) -> ParserGenerator[T]:
+    """Main loop of a parser generator that collects metrics.
+
+    This is kept separate from the main loop in `create_parser_generator()`
+    so parsers without metrics do not pay for the bookkeeping.
+    """
+    while True:
+        metrics.bytes_fed += len(data)
+
+        chunks = list(splitter_gen.send(data))
+        metrics.frames_split += len(chunks)
+
+        if pre_filter:
+            num_chunks = len(chunks)
+            filter_many = getattr(pre_filter, "filter_many", None)
+            if filter_many:
+                chunks = filter_many(chunks)
+            else:
+                chunks = [chunk for chunk in chunks if pre_filter(chunk)]
+            metrics.frames_dropped_by_pre_filter += num_chunks - len(chunks)
+
+        started_at = perf_counter_ns()
+        try:
+            if batch_decoder:
+                messages = batch_decoder(chunks) if chunks else []
+            elif decoder:
+                messages = [decoder(chunk) for chunk in chunks]
+            else:
+                messages = chunks
+        except Exception:
+            metrics.decode_failures += 1
+            raise
+        finally:
+            metrics.decode_time_ns += perf_counter_ns() - started_at
+
+        if post_filter:
+            num_messages = len(messages)
+            messages = [message for message in messages if post_filter(message)]
+            metrics.frames_dropped_by_post_filter += num_messages - len(messages)
+
+        if dispatcher and messages:
+            messages = dispatcher(messages)
+
+        data = yield messages  # type: ignore
+
+
+def _strip_trailer(kwds: dict[str, Any], size: int) -> None:
+    """Updates the keyword arguments of `create_parser()` in place such that
+    the given number of bytes are removed from the end of each raw message
+    before it is decoded.
+    """
+    decoder = kwds.get("decoder")
+    batch_decoder = kwds.get("batch_decoder")
+
+    if batch_decoder:
+        kwds["batch_decoder"] = lambda chunks: batch_decoder(
+            [chunk[:-size] for chunk in chunks]
+        )
+    elif decoder:
+        kwds["decoder"] = lambda chunk: decoder(chunk[:-size])
+    else:
+        kwds["decoder"] = lambda chunk: chunk[:-size]
+
+
 def create_parser(gen: ParserGenerator[T] | None = None, **kwds) -> Parser[T]:
     """Creates a parser from a parser generator.
 
@@ -113,31 +291,106 @@ def create_parser(gen: ParserGenerator[T] | None = None, **kwds) -> Parser[T]:
     function.
 
     See the docstring of `create_parser_generator()` for the list of allowed
-    keyword arguments.
+    keyword arguments. As a shorthand, you may also pass ``metrics=True`` to
+    collect metrics in a new `ParserMetrics` object. When the parser collects
+    metrics, the metrics object is available in the ``metrics`` attribute of
+    the returned parser.
+
+    When the parser is created from keyword arguments, the splitter of the
+    parser is available in the ``splitter`` attribute of the returned parser,
+    e.g. to find out how many bytes of an incomplete message it is holding on
+    to at the end of the input.
     """
+    metrics = kwds.get("metrics")
+    if metrics is True:
+        metrics = kwds["metrics"] = ParserMetrics()
+    elif not metrics:
+        kwds.pop("metrics", None)
+
+    # The dispatcher is called outside the generator so an exception raised
+    # by one of its handlers propagates to the caller without terminating
+    # the generator
+    dispatcher = kwds.pop("dispatcher", None)
+
     if gen is None:
+        # Create the splitter here so it can be exposed on the parser
+        splitter = kwds.get("splitter")
+        if splitter is None:
+            splitter = dummy_splitter()
+        elif callable(splitter):
+            splitter = splitter()
+        kwds["splitter"] = splitter
+
         gen = create_parser_generator(**kwds)  # type: ignore
-    elif kwds:
+    elif kwds or dispatcher:
         raise ValueError(
             "no keyword arguments should be specified if you supply a generator directly"
         )
+    else:
+        splitter = None
 
     assert gen is not None
 
     next(gen)
-    return gen.send
+
+    send = gen.send
+    if dispatcher:
+
+        def parser(data: bytes) -> Iterable[T]:
+            messages = send(data)
+            return dispatcher(messages) if messages else messages
+
+    elif splitter is not None:
+
+        def parser(data: bytes) -> Iterable[T]:
+            return send(data)
+
+    else:
+        return send
+
+    if metrics:
+        parser.metrics = metrics  # type: ignore[attr-defined]
+    if splitter is not None:
+        parser.splitter = splitter  # type: ignore[attr-defined]
+
+    return parser
+
+
+def create_cobs_parser(*, min_length: int | None = None, **kwds) -> Parser[T]:
+    """Creates a parser that assumes that incoming messages are encoded with
+    Consistent Overhead Byte Stuffing (COBS) and separated by zero bytes.
+
+    Invalid frames are dropped; the number of bytes dropped is reported in
+    the ``bytes_skipped`` counter of the metrics object of the parser when it
+    is created with ``metrics=...``.
+
+    All keyword arguments not mentioned here are forwarded to
+    ``create_parser()``.
+
+    Keyword arguments:
+        min_length: minimum length of the decoded messages that we are
+            interested in
+    """
+    if min_length is not None:
+        kwds["pre_filter"] = reject_shorter_than(min_length)
+
+    return create_parser(splitter=split_using_cobs, **kwds)
 
 
 def create_length_prefixed_parser(
     *,
     min_length: int | None = None,
     max_length: int | None = None,
-    header_length: int | None = None,
+    header_length: int | Literal["varint"] | None = None,
     endianness: str = "big",
+    crc: str | None = None,
     **kwds,
 ) -> Parser[T]:
     """Creates a parser that assumes that incoming messages are prefixed by
-    their length in bytes.
+    their length in bytes, and optionally followed by a checksum.
+
+    Messages with an invalid checksum are dropped, and the checksum is
+    removed from the valid messages before they are decoded.
 
     All keyword arguments not mentioned here are forwarded to
     ``create_parser()``.
@@ -148,11 +401,24 @@ def create_length_prefixed_parser(
             will also be used to decide how many bytes the protocol uses to
             encode the message lengths unless `header_length` is specified
         header_length: number of bytes that the protocol uses to encode
-            message lengths; inferred from `max_length` if not present
-        endianness: whether lengths are encoded in little endian or big endian
-            (relevant only if lengths are encoded in more than one byte)
+            message lengths; inferred from `max_length` if not present.
+            ``"varint"`` means that the lengths are encoded as unsigned
+            LEB128 varints with a variable number of bytes.
+        endianness: whether lengths and checksums are encoded in little endian
+            or big endian (relevant only if they are encoded in more than one
+            byte)
+        crc: the name of the CRC algorithm that was used to calculate the
+            checksum after each message; see `get_crc_algorithm()` for the
+            supported algorithms. `None` means that there are no checksums.
+            The lengths of the messages include the checksums.
     """
-    if min_length is not None:
+    if crc is not None:
+        kwds["pre_filter"] = verify_crc(
+            crc, endianness=endianness, min_length=min_length or 0
+        )
+        _, size = get_crc_algorithm(crc)
+        _strip_trailer(kwds, size)
+    elif min_length is not None:
         kwds["pre_filter"] = reject_shorter_than(min_length)
 
     return create_parser(
@@ -177,3 +443,65 @@ def create_line_parser(*, min_length: int | None = None, **kwds) -> Parser[T]:
         kwds["pre_filter"] = reject_shorter_than(min_length)
 
     return create_parser(splitter=split_lines, **kwds)
+
+
+def create_slip_parser(*, min_length: int | None = None, **kwds) -> Parser[T]:
+    """Creates a parser that assumes that incoming messages are framed with
+    SLIP (RFC 1055).
+
+    All keyword arguments not mentioned here are forwarded to
+    ``create_parser()``.
+
+    Keyword arguments:
+        min_length: minimum length of the unescaped messages that we are
+            interested in
+    """
+    if min_length is not None:
+        kwds["pre_filter"] = reject_shorter_than(min_length)
+
+    return create_parser(splitter=split_using_slip, **kwds)
+
+
+def create_sync_word_parser(
+    *,
+    min_length: int | None = None,
+    max_length: int | None = None,
+    header_length: int | None = None,
+    endianness: str = "big",
+    sync_word: bytes = DEFAULT_SYNC_WORD,
+    **kwds,
+) -> Parser[T]:
+    """Creates a parser that assumes that incoming messages are framed with a
+    sync word, a length header and a checksum, and that resynchronises to the
+    next valid frame when the stream is corrupted instead of failing.
+
+    The number of bytes skipped and frames recovered is reported in the
+    ``bytes_skipped`` and ``frames_recovered`` counters of the metrics object
+    of the parser when it is created with ``metrics=...``.
+
+    All keyword arguments not mentioned here are forwarded to
+    ``create_parser()``.
+
+    Keyword arguments:
+        min_length: minimum length of messages that we are interested in
+        max_length: maximum length of messages that we are interested in; it
+            will also be used to decide how many bytes the protocol uses to
+            encode the message lengths unless `header_length` is specified
+        header_length: number of bytes that the protocol uses to encode
+            message lengths; inferred from `max_length` if not present
+        endianness: whether lengths and checksums are encoded in little endian
+            or big endian
+        sync_word: the bytes that mark the start of each frame
+    """
+    if min_length is not None:
+        kwds["pre_filter"] = reject_shorter_than(min_length)
+
+    return create_parser(
+        splitter=split_using_sync_word(
+            max_length=max_length,
+            header_length=header_length,
+            endianness=endianness,
+            sync_word=sync_word,
+        ),
+        **kwds,
+    )
@@ -0,0 +1,122 @@
+"""Bulk parsing of recorded streams stored in files."""
+
+from mmap import ACCESS_READ, mmap
+from os import PathLike
+from typing import Any, Callable, Iterator
+
+from .errors import ParseError
+from .factories import create_parser
+from .splitters import split_lines
+from .types import Splitter, T
+
+__all__ = ("iter_file_frames", "parse_file")
+
+DEFAULT_WINDOW_SIZE = 1 << 20
+"""Default number of bytes of the file to process in a single step."""
+
+
+def _passthrough_splitter() -> Splitter:
+    """Splitter that receives lists of raw messages and yields them as is.
+
+    Used to feed the frames found in a file into the filters and decoders of
+    a standard parser.
+    """
+    frames = []
+    while True:
+        frames = yield frames
+
+
+def iter_file_frames(
+    path: str | PathLike[str],
+    splitter: Splitter | Callable[[], Splitter] | None = None,
+    *,
+    window_size: int = DEFAULT_WINDOW_SIZE,
+    strict: bool = True,
+) -> Iterator[list[bytes]]:
+    """Memory-maps a file containing a recorded stream and yields the raw
+    messages found in it, in batches.
+
+    The file is fed into the splitter in windows of `window_size` bytes, as
+    memoryviews into the mapping, so the file is never loaded into memory
+    as a whole. The length-prefixed splitter slices the messages directly
+    from the mapping; the delimiter-based splitters copy each window once and
+    split it in a single pass. Each batch contains the messages that end in
+    the same window of the file. The splitter enforces its own limits (e.g.,
+    the maximum message length) exactly as it would for a stream.
+
+    Parameters:
+        path: the path of the file
+        splitter: the splitter to use; defaults to `split_lines()`
+        window_size: number of bytes to process in a single step
+        strict: whether to raise an error if the file ends in the middle of a
+            message
+
+    Yields:
+        lists of raw messages found in the file
+
+    Raises:
+        ParseError: in case of unrecoverable parse errors, or when `strict`
+            is set and the file ends in the middle of a message
+    """
+    if window_size <= 0:
+        raise ValueError("window size must be positive")
+
+    if splitter is None:
+        splitter = split_lines()
+    elif callable(splitter):
+        splitter = splitter()
+
+    with open(path, "rb") as fp:
+        size = fp.seek(0, 2)
+        if not size:
+            return
+
+        with mmap(fp.fileno(), 0, access=ACCESS_READ) as mapping:
+            next(splitter)
+            with memoryview(mapping) as view:
+                for start in range(0, size, window_size):
+                    with view[start : start + window_size] as window:
+                        frames = splitter.send(window)
+                    if frames:
+                        yield list(frames)
+
+    pending = getattr(splitter, "pending", 0)
+
+    if strict and pending:
+        raise ParseError(
+            f"file ended in the middle of a message ({pending} bytes pending)"
+        )
+
+
+def parse_file(
+    path: str | PathLike[str],
+    splitter: Splitter | Callable[[], Splitter] | None = None,
+    *,
+    window_size: int = DEFAULT_WINDOW_SIZE,
+    strict: bool = True,
+    **kwds: Any,
+) -> Iterator[list[T]]:
+    """Memory-maps a file containing a recorded stream and yields the parsed
+    messages found in it, in batches.
+
+    The raw messages are found with `iter_file_frames()` and then passed
+    through the filters and the decoder specified in the keyword arguments,
+    exactly as `create_parser()` would do. All keyword arguments not
+    mentioned here are forwarded to `create_parser()`.
+
+    See `iter_file_frames()` for the meaning of the keyword arguments
+    mentioned here.
+
+    Yields:
+        non-empty lists of parsed messages found in the file
+    """
+    parser = create_parser(splitter=_passthrough_splitter, **kwds)
+    for frames in iter_file_frames(
+        path,
+        splitter,
+        window_size=window_size,
+        strict=strict,
+    ):
+        messages = parser(frames)  # type: ignore[arg-type]
+        if messages:
+            yield messages  # type: ignore[misc]
@@ -2,9 +2,22 @@
 automatically rejects certain messages.
 """
 
+from collections import OrderedDict
+from hashlib import blake2b
+from threading import Lock
+from time import monotonic
+from typing import Any, Callable, Hashable, Iterable
+
+from .crc import _get_crc_residue, get_crc_algorithm
+from .splitters import _validate_endianness
 from .types import Filter
 
-__all__ = ("reject_shorter_than",)
+__all__ = (
+    "DeduplicationCache",
+    "reject_duplicates",
+    "reject_shorter_than",
+    "verify_crc",
+)
 
 
 def reject_shorter_than(min_length: int) -> Filter[bytes]:
@@ -16,3 +29,316 @@ def reject_shorter_than(min_length: int) -> Filter[bytes]:
         return len(data) >= min_length
 
     return filter
+
+
+def verify_crc(
+    algorithm: str = "crc32", *, endianness: str = "big", min_length: int = 0
+) -> Filter[bytes]:
+    """Returns a pre-filter that can be used to reject messages whose trailing
+    checksum does not match the checksum of the rest of the message.
+
+    The filter does not remove the checksum from the message; parsers
+    created with ``create_length_prefixed_parser(crc=...)`` strip it before
+    decoding.
+
+    The filter also has a ``filter_many`` attribute that receives a list of
+    messages and returns the ones with valid checksums in a single call;
+    parsers use this automatically. When the checksum is stored in the
+    natural byte order of the algorithm (little endian for ``crc32`` and
+    ``crc16-mcrf4xx``, big endian for ``crc16-ccitt``), the checksum is
+    verified in a single pass over the whole message, without slicing it.
+
+    Parameters:
+        algorithm: the name of the CRC algorithm; see `get_crc_algorithm()`
+            for the supported algorithms
+        endianness: whether the checksum is encoded in little endian or big
+            endian
+        min_length: minimum length of messages, not including the checksum
+    """
+    _validate_endianness(endianness)
+
+    func, size = get_crc_algorithm(algorithm)
+    residue = _get_crc_residue(algorithm, endianness)
+    from_bytes = int.from_bytes
+    min_length += size
+
+    if residue is not None:
+
+        def filter(data: bytes) -> bool:
+            return len(data) >= min_length and func(data) == residue
+
+        def filter_many(frames: list[bytes]) -> list[bytes]:
+            return [
+                data
+                for data in frames
+                if len(data) >= min_length and func(data) == residue
+            ]
+
+    else:
+
+        def filter(data: bytes) -> bool:
+            return len(data) >= min_length and func(data[:-size]) == from_bytes(
+                data[-size:], endianness
+            )
+
+        def filter_many(frames: list[bytes]) -> list[bytes]:
+            return [
+                data
+                for data in frames
+                if len(data) >= min_length
+                and func(data[:-size]) == from_bytes(data[-size:], endianness)
+            ]
+
+    filter.filter_many = filter_many  # type: ignore[attr-defined]
+    return filter
+
+
+class DeduplicationCache:
+    """Bounded cache of the keys of recently seen messages, used by
+    `reject_duplicates()` to detect repeated messages.
+
+    The cache holds at most a given number of keys and evicts the least
+    recently seen key when it is full. A key also expires a given time after
+    it was first seen, after which the same message is considered new again.
+    This allows messages that legitimately repeat over time (e.g., status
+    messages that do not change between ticks) to pass through, while copies
+    of the same message that arrive on multiple links in quick succession
+    are dropped.
+
+    A single cache can be shared by several parsers, even if they run in
+    different threads, to drop duplicates across all of them.
+    """
+
+    __slots__ = (
+        "_clock",
+        "_entries",
+        "_lock",
+        "duplicates",
+        "evictions",
+        "expirations",
+        "max_entries",
+        "nbytes",
+        "ttl",
+    )
+
+    duplicates: int
+    """Number of keys that were found in the cache, i.e. the number of
+    duplicates detected.
+    """
+
+    evictions: int
+    """Number of keys evicted from the cache because it was full."""
+
+    expirations: int
+    """Number of keys that were removed or replaced because they expired."""
+
+    max_entries: int
+    """Maximum number of keys in the cache."""
+
+    nbytes: int
+    """Total length of the keys in the cache that are bytes, e.g. the
+    digests of the raw messages when `reject_duplicates()` is used without a
+    key function.
+    """
+
+    ttl: float | None
+    """Number of seconds after which a key expires; `None` if keys never
+    expire.
+    """
+
+    _clock: Callable[[], float]
+    _entries: OrderedDict[Hashable, float]
+    _lock: Lock
+
+    def __init__(
+        self,
+        max_entries: int = 1024,
+        ttl: float | None = 1.0,
+        *,
+        clock: Callable[[], float] = monotonic,
+    ):
+        """Constructor.
+
+        Parameters:
+            max_entries: maximum number of keys in the cache
+            ttl: number of seconds after which a key expires; `None` if keys
+                never expire
+
+        Keyword arguments:
+            clock: function that returns the current time in seconds
+        """
+        if max_entries <= 0:
+            raise ValueError("maximum number of entries must be positive")
+        if ttl is not None and ttl <= 0:
+            raise ValueError("time to live must be positive")
+
+        self.max_entries = max_entries
+        self.ttl = ttl
+
+        self._clock = clock
+        self._entries = OrderedDict()
+        self._lock = Lock()
+
+        self.reset()
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def add(self, key: Hashable) -> bool:
+        """Adds a key to the cache.
+
+        Returns:
+            ``True`` if the key is new, ``False`` if it was seen recently
+        """
+        return self.add_many((key,))[0]
+
+    def add_many(self, keys: Iterable[Hashable]) -> list[bool]:
+        """Adds multiple keys to the cache, in order.
+
+        Returns:
+            ``True`` for each key that is new and ``False`` for each key that
+            was seen recently, including earlier in the same call
+        """
+        entries = self._entries
+        get = entries.get
+        move_to_end = entries.move_to_end
+        max_entries = self.max_entries
+        ttl = self.ttl
+
+        result = []
+        append = result.append
+        duplicates = 0
+
+        with self._lock:
+            now = self._clock()
+            if ttl is not None:
+                self._expire(now - ttl)
+            else:
+                ttl = float("inf")
+
+            for key in keys:
+                seen_at = get(key)
+                if seen_at is not None:
+                    move_to_end(key)
+                    if now - seen_at < ttl:
+                        duplicates += 1
+                        append(False)
+                        continue
+
+                    self.expirations += 1
+                else:
+                    if len(entries) >= max_entries:
+                        evicted, _ = entries.popitem(last=False)
+                        if isinstance(evicted, bytes):
+                            self.nbytes -= len(evicted)
+                        self.evictions += 1
+                    if isinstance(key, bytes):
+                        self.nbytes += len(key)
+
+                entries[key] = now
+                append(True)
+
+            self.duplicates += duplicates
+
+        return result
+
+    def clear(self) -> None:
+        """Removes all the keys from the cache."""
+        with self._lock:
+            self._entries.clear()
+            self.nbytes = 0
+
+    def reset(self) -> None:
+        """Removes all the keys from the cache and resets all the counters to
+        zero.
+        """
+        self.clear()
+        self.duplicates = 0
+        self.evictions = 0
+        self.expirations = 0
+
+    def snapshot(self) -> dict[str, Any]:
+        """Returns the current size of the cache and the values of the
+        counters as a dictionary.
+        """
+        return {
+            "duplicates": self.duplicates,
+            "entries": len(self._entries),
+            "evictions": self.evictions,
+            "expirations": self.expirations,
+            "nbytes": self.nbytes,
+        }
+
+    def _expire(self, threshold: float) -> None:
+        """Removes the keys from the front of the cache that were last added
+        before the given time. Expired keys behind a more recent key are
+        left in place; they are replaced when they are seen again or evicted
+        when the cache is full.
+        """
+        entries = self._entries
+        while entries:
+            key, seen_at = next(iter(entries.items()))
+            if seen_at >= threshold:
+                break
+
+            del entries[key]
+            if isinstance(key, bytes):
+                self.nbytes -= len(key)
+            self.expirations += 1
+
+
+def _digest(data: bytes) -> bytes:
+    """Returns a 128-bit digest of a raw message that identifies it in a
+    deduplication cache.
+    """
+    return blake2b(data, digest_size=16).digest()
+
+
+def reject_duplicates(
+    cache: DeduplicationCache | None = None,
+    *,
+    key: Callable[[bytes], Hashable] | None = None,
+    max_entries: int = 1024,
+    ttl: float | None = 1.0,
+) -> Filter[bytes]:
+    """Returns a pre-filter that can be used to reject raw messages that were
+    seen recently, e.g. copies of the same message that arrive on multiple
+    links.
+
+    The filter also has a ``filter_many`` attribute that receives a list of
+    messages and returns the ones that were not seen recently in a single
+    call; parsers use this automatically. The cache of the filter is
+    available in its ``cache`` attribute.
+
+    Parameters:
+        cache: the cache of recently seen messages. Pass the same cache to
+            the filters of multiple parsers to drop duplicates that arrive on
+            different links. A new cache is created with the given limits if
+            omitted.
+        key: optional function that returns the key identifying a raw
+            message. By default, messages are identified by a 128-bit BLAKE2b
+            digest of their raw bytes, so the memory used by the cache does
+            not depend on the size of the messages. Use a key function that
+            extracts a sequence number if the messages have one, or `bytes`
+            to identify messages by their raw bytes exactly, at the cost of
+            holding on to them in the cache.
+        max_entries: maximum number of messages in a new cache
+        ttl: number of seconds after which a message is no longer considered
+            a duplicate in a new cache; `None` means forever
+    """
+    if cache is None:
+        cache = DeduplicationCache(max_entries, ttl)
+
+    add_many = cache.add_many
+    get_key = key or _digest
+
+    def filter(data: bytes) -> bool:
+        return add_many((get_key(data),))[0]
+
+    def filter_many(frames: list[bytes]) -> list[bytes]:
+        keys = [get_key(data) for data in frames]
+        return [data for data, new in zip(frames, add_many(keys)) if new]
+
+    filter.cache = cache  # type: ignore[attr-defined]
+    filter.filter_many = filter_many  # type: ignore[attr-defined]
+    return filter
@@ -0,0 +1,438 @@
+"""Frame offset indices for random access into recorded streams of
+length-prefixed messages.
+"""
+
+from array import array
+from mmap import ACCESS_READ, mmap
+from os import PathLike, fspath, replace
+from struct import Struct
+from sys import byteorder
+from typing import Any, overload
+
+from .errors import ParseError
+from .factories import create_parser
+from .files import _passthrough_splitter
+from .splitters import _propose_header_length, _validate_endianness
+from .types import T
+
+__all__ = ("FrameIndex", "IndexedRecording")
+
+_HEADER = Struct("<4sBBBxQQ")
+"""Header of the sidecar file of a frame index: magic bytes, version, header
+length, endianness flag, padding, number of bytes covered by the index and
+number of frames.
+"""
+
+_MAGIC = b"FWFI"
+_VERSION = 1
+
+_LENGTH_FORMATS = {1: "B", 2: "H", 4: "I", 8: "Q"}
+"""Struct formats of the length headers that can be decoded with `struct`."""
+
+
+class FrameIndex:
+    """Index of the frames in a recorded stream of length-prefixed messages.
+
+    The index stores the byte offset and the length of the body of each frame
+    in two compact arrays of 64-bit integers, and the number of bytes of the
+    recording that it covers. The index can be extended incrementally with
+    `update()` when the recording grows, and it can be saved to and loaded
+    from a sidecar file.
+    """
+
+    __slots__ = (
+        "endianness",
+        "header_length",
+        "lengths",
+        "max_length",
+        "offsets",
+        "size",
+    )
+
+    endianness: str
+    """Endianness of the length headers of the frames."""
+
+    header_length: int
+    """Number of bytes in the length header of each frame."""
+
+    lengths: array
+    """Lengths of the bodies of the frames."""
+
+    max_length: int | None
+    """Maximum allowed length of a frame body; `None` if there is no limit."""
+
+    offsets: array
+    """Byte offsets of the bodies of the frames, after their length headers."""
+
+    size: int
+    """Number of bytes of the recording covered by the index, i.e. the end of
+    the last complete frame.
+    """
+
+    def __init__(
+        self,
+        *,
+        header_length: int | None = None,
+        max_length: int | None = None,
+        endianness: str = "big",
+    ):
+        """Constructor.
+
+        Keyword arguments:
+            header_length: number of bytes in the length header of each frame;
+                inferred from `max_length` if not present
+            max_length: maximum allowed length of a frame body
+            endianness: whether lengths are encoded in little endian or big
+                endian (relevant only if lengths are encoded in more than one
+                byte)
+        """
+        _validate_endianness(endianness)
+
+        self.endianness = endianness
+        self.header_length = header_length or _propose_header_length(max_length)
+        self.lengths = array("Q")
+        self.max_length = max_length
+        self.offsets = array("Q")
+        self.size = 0
+
+    def __len__(self) -> int:
+        return len(self.offsets)
+
+    @classmethod
+    def load(
+        cls, path: str | PathLike[str], *, max_length: int | None = None
+    ) -> "FrameIndex":
+        """Loads a frame index from a sidecar file.
+
+        Parameters:
+            path: the path of the sidecar file
+            max_length: maximum allowed length of a frame body when the index
+                is updated later; not stored in the sidecar file
+
+        Raises:
+            ValueError: if the file is not a valid sidecar file
+        """
+        with open(path, "rb") as fp:
+            data = fp.read()
+
+        if len(data) < _HEADER.size:
+            raise ValueError("frame index file is truncated")
+
+        magic, version, header_length, big_endian, size, count = _HEADER.unpack_from(
+            data
+        )
+        if magic != _MAGIC or version != _VERSION:
+            raise ValueError("not a frame index file or unsupported version")
+        if len(data) != _HEADER.size + 16 * count:
+            raise ValueError("frame index file is truncated")
+
+        result = cls(
+            header_length=header_length,
+            max_length=max_length,
+            endianness="big" if big_endian else "little",
+        )
+
+        with memoryview(data) as view:
+            split = _HEADER.size + 8 * count
+            result.offsets.frombytes(view[_HEADER.size : split])
+            result.lengths.frombytes(view[split:])
+
+        if byteorder != "little":
+            result.offsets.byteswap()
+            result.lengths.byteswap()
+
+        result.size = size
+        return result
+
+    def save(self, path: str | PathLike[str]) -> None:
+        """Saves the frame index to a sidecar file.
+
+        The index is written to a temporary file first and then moved in
+        place, so readers never see a partially written index.
+
+        Parameters:
+            path: the path of the sidecar file
+        """
+        offsets, lengths = self.offsets, self.lengths
+        if byteorder != "little":
+            offsets, lengths = array("Q", offsets), array("Q", lengths)
+            offsets.byteswap()
+            lengths.byteswap()
+
+        header = _HEADER.pack(
+            _MAGIC,
+            _VERSION,
+            self.header_length,
+            self.endianness == "big",
+            self.size,
+            len(offsets),
+        )
+
+        tmp_path = fspath(path) + ".tmp"
+        with open(tmp_path, "wb") as fp:
+            fp.write(header)
+            offsets.tofile(fp)
+            lengths.tofile(fp)
+        replace(tmp_path, path)
+
+    def clear(self) -> None:
+        """Removes all the frames from the index."""
+        del self.offsets[:]
+        del self.lengths[:]
+        self.size = 0
+
+    def is_valid_for(self, data: Any) -> bool:
+        """Returns whether the index is consistent with the given contents of
+        the recording, i.e. the recording is at least as long as the part
+        covered by the index and the header of the last indexed frame is still
+        the same.
+
+        Parameters:
+            data: the contents of the recording as a bytes-like object
+        """
+        if len(data) < self.size:
+            return False
+        if not self.offsets:
+            return self.size == 0
+
+        offset, length = self.offsets[-1], self.lengths[-1]
+        header = data[offset - self.header_length : offset]
+        return (
+            int.from_bytes(header, self.endianness) == length  # type: ignore[arg-type]
+            and offset + length == self.size
+        )
+
+    def update(self, data: Any) -> int:
+        """Scans the part of the recording that is not covered by the index
+        yet and adds the complete frames found in it to the index.
+
+        Parameters:
+            data: the contents of the recording as a bytes-like object, e.g.
+                a memory-mapped file
+
+        Returns:
+            the number of frames added to the index
+
+        Raises:
+            ParseError: if a frame is longer than the maximum allowed length
+        """
+        endianness = self.endianness
+        header_length = self.header_length
+        max_length = self.max_length
+
+        fmt = _LENGTH_FORMATS.get(header_length)
+        unpack_from = (
+            Struct((">" if endianness == "big" else "<") + fmt).unpack_from
+            if fmt
+            else None
+        )
+
+        add_offset = self.offsets.append
+        add_length = self.lengths.append
+        from_bytes = int.from_bytes
+
+        count = len(self.offsets)
+        pos = self.size
+        end = len(data)
+
+        with memoryview(data) as view:
+            while end - pos >= header_length:
+                if unpack_from is not None:
+                    (length,) = unpack_from(view, pos)
+                else:
+                    length = from_bytes(view[pos : pos + header_length], endianness)
+
+                if max_length is not None and length > max_length:
+                    raise ParseError(
+                        f"packet length exceeds limit ({length} > {max_length}) "
+                        f"at offset {pos}"
+                    )
+
+                body = pos + header_length
+                if end - body < length:
+                    break
+
+                add_offset(body)
+                add_length(length)
+                pos = body + length
+
+        self.size = pos
+        return len(self.offsets) - count
+
+
+class IndexedRecording:
+    """Random access to the messages of a recorded stream of length-prefixed
+    messages, backed by a `FrameIndex` that is stored in a sidecar file next
+    to the recording.
+
+    The recording is scanned only once; later instances load the index from
+    the sidecar file and scan only the part of the recording that was
+    appended since the index was saved. The recording is memory-mapped, and
+    reading a frame or a range of frames touches only the pages of the
+    recording that contain them.
+
+    Example::
+
+        with IndexedRecording("capture.bin", header_length=2) as recording:
+            messages = recording.parse(1000, 2000, decoder=decode)
+    """
+
+    index: FrameIndex
+    """The frame index of the recording."""
+
+    _index_path: str
+    _mapping: mmap | None
+    _path: str | PathLike[str]
+
+    def __init__(
+        self,
+        path: str | PathLike[str],
+        *,
+        header_length: int | None = None,
+        max_length: int | None = None,
+        endianness: str = "big",
+        index_path: str | PathLike[str] | None = None,
+    ):
+        """Constructor.
+
+        Parameters:
+            path: the path of the recording
+
+        Keyword arguments:
+            header_length: number of bytes in the length header of each frame;
+                inferred from `max_length` if not present
+            max_length: maximum allowed length of a frame body
+            endianness: whether lengths are encoded in little endian or big
+                endian (relevant only if lengths are encoded in more than one
+                byte)
+            index_path: the path of the sidecar file of the index; defaults to
+                the path of the recording with ``.idx`` appended
+
+        Raises:
+            ParseError: if a frame in the recording is longer than the maximum
+                allowed length
+        """
+        index = FrameIndex(
+            header_length=header_length, max_length=max_length, endianness=endianness
+        )
+
+        self._index_path = fspath(index_path or fspath(path) + ".idx")
+        self._mapping = None
+        self._path = path
+
+        try:
+            loaded = FrameIndex.load(self._index_path, max_length=max_length)
+        except (OSError, ValueError):
+            pass
+        else:
+            if (
+                loaded.header_length == index.header_length
+                and loaded.endianness == index.endianness
+            ):
+                index = loaded
+
+        self.index = index
+        self.refresh()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_value, tb) -> None:
+        self.close()
+
+    def __len__(self) -> int:
+        return len(self.index)
+
+    @overload
+    def __getitem__(self, key: int) -> bytes: ...
+
+    @overload
+    def __getitem__(self, key: slice) -> list[bytes]: ...
+
+    def __getitem__(self, key: int | slice) -> bytes | list[bytes]:
+        if isinstance(key, slice):
+            start, stop, step = key.indices(len(self.index))
+            if step != 1:
+                return [self[i] for i in range(start, stop, step)]
+            return self.frames(start, stop)
+
+        offset, length = self.index.offsets[key], self.index.lengths[key]
+        return self._mapping[offset : offset + length]  # type: ignore[index]
+
+    def close(self) -> None:
+        """Closes the memory mapping of the recording."""
+        if self._mapping is not None:
+            self._mapping.close()
+            self._mapping = None
+
+    def frames(self, start: int = 0, stop: int | None = None) -> list[bytes]:
+        """Returns the raw messages in the given range of frames.
+
+        Parameters:
+            start: index of the first frame to return
+            stop: index of the frame after the last one to return; `None`
+                means the end of the recording
+        """
+        mapping = self._mapping
+        if mapping is None:
+            return []
+
+        return [
+            mapping[offset : offset + length]
+            for offset, length in zip(
+                self.index.offsets[start:stop], self.index.lengths[start:stop]
+            )
+        ]
+
+    def parse(self, start: int = 0, stop: int | None = None, **kwds: Any) -> list[T]:
+        """Decodes the messages in the given range of frames.
+
+        The raw messages are passed through the filters and the decoder
+        specified in the keyword arguments, exactly as `create_parser()`
+        would do. All keyword arguments not mentioned here are forwarded to
+        `create_parser()`.
+
+        Parameters:
+            start: index of the first frame to decode
+            stop: index of the frame after the last one to decode; `None`
+                means the end of the recording
+
+        Returns:
+            the decoded messages
+        """
+        parser = create_parser(splitter=_passthrough_splitter, **kwds)
+        return parser(self.frames(start, stop))  # type: ignore[arg-type,return-value]
+
+    def refresh(self) -> int:
+        """Re-maps the recording and adds the frames that were appended to it
+        since the last refresh to the index. The index is rebuilt from scratch
+        if the recording was truncated or rewritten.
+
+        The sidecar file is updated if the index has changed.
+
+        Returns:
+            the number of frames added to the index
+
+        Raises:
+            ParseError: if a frame in the recording is longer than the maximum
+                allowed length
+        """
+        self.close()
+
+        index = self.index
+        size = index.size
+
+        with open(self._path, "rb") as fp:
+            if fp.seek(0, 2):
+                self._mapping = mmap(fp.fileno(), 0, access=ACCESS_READ)
+
+        data = self._mapping if self._mapping is not None else b""
+        rebuilt = not index.is_valid_for(data)
+        if rebuilt:
+            index.clear()
+
+        added = index.update(data)
+        if rebuilt or index.size != size:
+            index.save(self._index_path)
+
+        return added
@@ -1,13 +1,26 @@
 """JSON object parser."""
 
-from json import JSONDecoder
-from typing import Any, Callable, Literal
+from json import JSONDecoder, dumps
+from re import compile, escape
+from typing import Any, Callable, Iterable, Literal, Sequence
 from warnings import warn
 
 from .factories import create_parser
 from .filters import reject_shorter_than
 from .splitters import split_lines
-from .types import Parser
+from .types import BatchDecoder, Filter, Parser
+
+__all__ = ("create_json_parser", "filter_json_types", "peek_json_key")
+
+FLOCKWAVE_TYPE_KEY = ("body", "type")
+"""Path of the key that holds the type of a message in the Flockwave
+message envelope.
+"""
+
+_STRING_VALUE = rb'\s*:\s*"([^"\\]*)"'
+"""Regular expression that matches the colon after a key in a JSON object
+and a string value without escape sequences after it.
+"""
 
 
 def _adapt_builtin_decoder(decoder: JSONDecoder) -> Parser[Any]:
@@ -24,8 +37,237 @@ def _adapt_orjson_decoder() -> Parser[Any]:
     return loads
 
 
+def _create_batch_decoder(decoder: Callable[[bytes], Any]) -> BatchDecoder[Any]:
+    def decode_batch(frames: list[bytes]) -> list[Any]:
+        """Decodes all the messages of a chunk in a single list
+        comprehension.
+
+        The messages are not joined into a single JSON array because the
+        decoded array cannot be mapped back to the messages reliably; the
+        fragments of malformed messages could be merged into valid items.
+        """
+        return [decoder(frame) for frame in frames]
+
+    return decode_batch
+
+
+def _create_default_decoder() -> Parser[Any]:
+    try:
+        return _adapt_orjson_decoder()
+    except ImportError:
+        return _adapt_builtin_decoder(JSONDecoder())
+
+
+def _get_depth(data: bytes, end: int) -> int:
+    """Returns the number of JSON objects and arrays that enclose the given
+    position in a raw JSON message without escape sequences.
+    """
+    # Without escape sequences, every second quote ends a string, so the
+    # even-numbered segments between quotes are outside of strings
+    outside = b"".join(data[:end].split(b'"')[::2])
+    return (
+        outside.count(b"{")
+        + outside.count(b"[")
+        - outside.count(b"}")
+        - outside.count(b"]")
+    )
+
+
+def _compile_key_search(
+    key: str | Sequence[str],
+) -> tuple[tuple[str, ...], bytes, Callable[[bytes], bytes | None]]:
+    """Returns the path of keys leading to the given key, the encoded form of
+    the last key in the path, and a function that slices the string value of
+    the key out of a raw message.
+
+    The function returns `None` when the value cannot be sliced out safely,
+    i.e. when the last key of the path does not occur exactly once in the
+    message, it is not at the nesting depth designated by the path, it is not
+    followed by a string value, or the message contains escape sequences.
+    A single occurrence at the right depth designates the path unambiguously
+    only for top-level keys, and for the type of a message in the Flockwave
+    envelope, which is present in every valid message. The function always
+    returns `None` for other paths.
+    """
+    path = (key,) if isinstance(key, str) else tuple(key)
+    if not path:
+        raise ValueError("key path must not be empty")
+
+    needle = dumps(path[-1], ensure_ascii=False).encode("utf-8")
+
+    if len(path) > 1 and path != FLOCKWAVE_TYPE_KEY:
+
+        def match_value(data: bytes) -> bytes | None:
+            return None
+
+        return path, needle, match_value
+
+    search = compile(escape(needle) + _STRING_VALUE).search
+    depth = len(path)
+
+    def match_value(data: bytes) -> bytes | None:
+        match = search(data)
+        if (
+            match is None
+            or data.count(needle) != 1
+            or b"\\" in data
+            or _get_depth(data, match.start()) != depth
+        ):
+            return None
+        return match.group(1)
+
+    return path, needle, match_value
+
+
+def peek_json_key(
+    key: str | Sequence[str] = FLOCKWAVE_TYPE_KEY,
+    *,
+    decoder: Callable[[bytes], Any] | None = None,
+) -> Callable[[bytes], Any]:
+    """Returns a function that extracts the value of a key from a raw JSON
+    message without decoding the whole message whenever possible.
+
+    The function looks for the last key of the path in the raw bytes of the
+    message. When the key occurs exactly once, at the nesting depth
+    designated by the path, is followed by a string value, and the message
+    contains no escape sequences that could hide another occurrence, the
+    value is sliced out of the raw bytes directly. Otherwise the function
+    falls back to decoding the whole message and walking the path in the
+    decoded object.
+
+    The fast path is used only for top-level keys and for the type of a
+    message in the Flockwave envelope, where a single occurrence of the key
+    at the right depth designates the path unambiguously. Messages are
+    always decoded for other nested paths.
+
+    Parameters:
+        key: the key to extract, or the path of keys leading to it from the
+            root of the message; defaults to the type of a message in the
+            Flockwave envelope
+        decoder: the JSON decoder to use when the message has to be decoded;
+            defaults to `orjson` if it is installed and the built-in JSON
+            decoder otherwise
+
+    Returns:
+        a function that receives a raw message and returns the value of the
+        key, or `None` if the key is not present. The function raises a
+        `ValueError` if it has to decode the message and the message is not
+        valid JSON.
+    """
+    path, needle, match_value = _compile_key_search(key)
+    decode = decoder or _create_default_decoder()
+
+    def peek_decoded(data: bytes) -> Any:
+        value = decode(data)
+        for part in path:
+            if not isinstance(value, dict):
+                return None
+            value = value.get(part)
+        return value
+
+    def peek(data: bytes) -> Any:
+        value = match_value(data)
+        if value is not None:
+            return value.decode("utf-8")
+
+        if needle in data or b"\\" in data:
+            return peek_decoded(data)
+
+        return None
+
+    return peek
+
+
+def filter_json_types(
+    types: Iterable[Any],
+    *,
+    exclude: bool = False,
+    key: str | Sequence[str] = FLOCKWAVE_TYPE_KEY,
+    decoder: Callable[[bytes], Any] | None = None,
+) -> Filter[bytes]:
+    """Returns a pre-filter that accepts or rejects raw JSON messages based on
+    the value of a discriminator key, typically the type of the message,
+    before the messages are decoded.
+
+    The value of the key is extracted with `peek_json_key()`, which decodes
+    the message only when the raw bytes are ambiguous. Rejected messages are
+    therefore never decoded in the common case. Inspecting the raw bytes
+    still takes a few regular expression and substring searches per
+    message, so the filter pays off for messages longer than a few hundred
+    bytes with `orjson`, and for messages of any size with the built-in JSON
+    decoder.
+
+    Empty messages are always rejected. Messages that cannot be decoded when
+    the fallback is needed are accepted so the decoder of the parser can
+    report the error.
+
+    The filter also has a ``filter_many`` attribute that receives a list of
+    messages and returns the ones to keep in a single call; parsers use this
+    automatically.
+
+    Parameters:
+        types: the values of the key to accept, or to reject if `exclude`
+            is ``True``
+        exclude: whether to reject the messages with the given values instead
+            of accepting them
+        key: the key to look at, or the path of keys leading to it from the
+            root of the message; defaults to the type of a message in the
+            Flockwave envelope
+        decoder: the JSON decoder to use when the message has to be decoded;
+            defaults to `orjson` if it is installed and the built-in JSON
+            decoder otherwise
+    """
+    peek = peek_json_key(key, decoder=decoder)
+    _, _, match_value = _compile_key_search(key)
+    selected = frozenset(types)
+    selected_raw = frozenset(
+        value.encode("utf-8") for value in selected if isinstance(value, str)
+    )
+
+    def filter(data: bytes) -> bool:
+        if not data:
+            return False
+
+        value = match_value(data)
+        if value is not None:
+            return (value in selected_raw) is not exclude
+
+        try:
+            value = peek(data)
+        except ValueError:
+            return True
+        try:
+            return (value in selected) is not exclude
+        except TypeError:
+            # Unhashable value, e.g. an object
+            return exclude
+
+    def filter_many(frames: list[bytes]) -> list[bytes]:
+        result = []
+        append = result.append
+
+        # Fast path of filter() inlined to save a function call per message
+        for data in frames:
+            value = match_value(data)
+            if value is not None:
+                if (value in selected_raw) is not exclude:
+                    append(data)
+            elif filter(data):
+                append(data)
+
+        return result
+
+    filter.filter_many = filter_many  # type: ignore[attr-defined]
+    return filter
+
+
 def create_json_parser(
     decoder: Callable[[bytes], Any] | JSONDecoder | Literal["builtin"] | None = None,
+    *,
+    batch: bool = False,
+    types: Iterable[Any] | None = None,
+    exclude_types: Iterable[Any] | None = None,
+    type_key: str | Sequence[str] = FLOCKWAVE_TYPE_KEY,
     **kwds,
 ) -> Parser[Any]:
     """Creates a parser that parses incoming bytes as JSON objects.
@@ -40,6 +282,20 @@ def create_json_parser(
 
     Args:
         decoder: the JSON parser to use
+        batch: whether to decode all the messages detected in a single chunk
+            of the input in one step instead of passing them through the
+            parser loop one by one. This is faster for chunks containing many
+            small messages; malformed messages raise the same errors as
+            without batching.
+        types: when specified, only messages whose type is one of the given
+            types are decoded; all other messages are dropped based on their
+            raw bytes. See `filter_json_types()` for details.
+        exclude_types: when specified, messages whose type is one of the
+            given types are dropped based on their raw bytes without being
+            decoded. Mutually exclusive with `types`.
+        type_key: the key holding the type of a message, or the path of keys
+            leading to it from the root of the message; defaults to the type
+            of a message in the Flockwave envelope
         splitter: the splitter to use to determine the boundaries between
             objects to be decoded.
         encoding: the encoding of the inbound messages to parse
@@ -67,6 +323,24 @@ def create_json_parser(
     if isinstance(decoder, JSONDecoder):
         decoder = _adapt_builtin_decoder(decoder)
 
+    if types is not None and exclude_types is not None:
+        raise ValueError("types=... and exclude_types=... are mutually exclusive")
+
+    if types is not None or exclude_types is not None:
+        pre_filter = filter_json_types(
+            exclude_types if types is None else types,  # type: ignore[arg-type]
+            exclude=types is None,
+            key=type_key,
+            decoder=decoder,
+        )
+    else:
+        pre_filter = reject_shorter_than(1)
+
+    if batch:
+        kwds["batch_decoder"] = _create_batch_decoder(decoder)
+    else:
+        kwds["decoder"] = decoder
+
     if "splitter" in kwds:
         splitter = kwds.pop("splitter")
     else:
@@ -74,7 +348,6 @@ def create_json_parser(
 
     return create_parser(
         splitter=splitter,
-        decoder=decoder,
-        pre_filter=reject_shorter_than(1),
+        pre_filter=pre_filter,
         **kwds,
     )
@@ -0,0 +1,221 @@
+"""Memoization of decoded messages for streams in which the same raw message
+is received repeatedly.
+"""
+
+from collections import OrderedDict
+from copy import copy as shallow_copy, deepcopy
+from threading import Lock
+from typing import Any, Callable, Literal
+
+from .types import T
+
+__all__ = ("DecoderCache", "memoize_decoder")
+
+
+class DecoderCache:
+    """Bounded cache of decoded messages keyed by their raw bytes, used by
+    `memoize_decoder()`.
+
+    The cache holds at most a given number of messages, and the total length
+    of the raw messages in the cache is also limited. The least recently used
+    message is evicted when either limit is exceeded.
+
+    The cache may be used from multiple threads at the same time, e.g. by
+    a decoder running in the worker threads of `create_parallel_parser()`.
+    """
+
+    __slots__ = (
+        "_entries",
+        "_lock",
+        "evictions",
+        "hits",
+        "max_bytes",
+        "max_entries",
+        "misses",
+        "nbytes",
+    )
+
+    evictions: int
+    """Number of messages evicted from the cache because it was full."""
+
+    hits: int
+    """Number of messages that were found in the cache."""
+
+    max_bytes: int
+    """Maximum total length of the raw messages in the cache."""
+
+    max_entries: int
+    """Maximum number of messages in the cache."""
+
+    misses: int
+    """Number of messages that were not found in the cache and had to be
+    decoded.
+    """
+
+    nbytes: int
+    """Total length of the raw messages in the cache."""
+
+    _entries: OrderedDict[bytes, Any]
+    _lock: Lock
+
+    def __init__(self, max_entries: int = 1024, max_bytes: int = 1 << 20):
+        """Constructor.
+
+        Parameters:
+            max_entries: maximum number of messages in the cache
+            max_bytes: maximum total length of the raw messages in the cache;
+                longer messages are never cached
+        """
+        if max_entries <= 0:
+            raise ValueError("maximum number of entries must be positive")
+        if max_bytes <= 0:
+            raise ValueError("maximum number of bytes must be positive")
+
+        self.max_bytes = max_bytes
+        self.max_entries = max_entries
+
+        self._entries = OrderedDict()
+        self._lock = Lock()
+
+        self.reset()
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    @property
+    def hit_rate(self) -> float | None:
+        """Ratio of the messages that were found in the cache to all the
+        messages looked up; `None` if no message was looked up yet.
+        """
+        total = self.hits + self.misses
+        return self.hits / total if total else None
+
+    def clear(self) -> None:
+        """Removes all the messages from the cache."""
+        with self._lock:
+            self._entries.clear()
+            self.nbytes = 0
+
+    def reset(self) -> None:
+        """Removes all the messages from the cache and resets all the counters
+        to zero.
+        """
+        self.clear()
+        self.evictions = 0
+        self.hits = 0
+        self.misses = 0
+
+    def snapshot(self) -> dict[str, Any]:
+        """Returns the current size of the cache and the values of the
+        counters as a dictionary.
+        """
+        return {
+            "entries": len(self._entries),
+            "evictions": self.evictions,
+            "hit_rate": self.hit_rate,
+            "hits": self.hits,
+            "misses": self.misses,
+            "nbytes": self.nbytes,
+        }
+
+
+_COPY_POLICIES: dict[str, Callable[[Any], Any] | None] = {
+    "none": None,
+    "shallow": shallow_copy,
+    "deep": deepcopy,
+}
+"""Functions that copy a decoded message before it is returned from the
+cache, keyed by the name of the copy policy.
+"""
+
+
+def memoize_decoder(
+    decoder: Callable[[bytes], T],
+    *,
+    max_entries: int = 1024,
+    max_bytes: int = 1 << 20,
+    copy: Literal["none", "shallow", "deep"] | Callable[[T], T] = "none",
+) -> Callable[[bytes], T]:
+    """Returns a decoder that remembers the decoded form of recently seen raw
+    messages, and returns it without calling the original decoder when the
+    same raw message is received again.
+
+    This pays off for streams where a large share of the messages are
+    byte-identical, e.g. status messages that do not change between ticks.
+    Messages that fail to decode are not cached.
+
+    The returned decoder has a ``cache`` attribute with the `DecoderCache`
+    that holds the messages and reports the hit rate.
+
+    Parameters:
+        decoder: the decoder to memoize
+        max_entries: maximum number of messages to remember
+        max_bytes: maximum total length of the raw messages to remember;
+            longer messages are never cached
+        copy: policy that determines what is returned for a message found in
+            the cache. ``none`` returns the same object that was returned the
+            first time, which is the fastest but the caller must not modify
+            it. ``shallow`` and ``deep`` return a shallow or a deep copy of
+            the object. A function can also be given that receives the cached
+            object and returns the object to return.
+
+    Returns:
+        the memoizing decoder
+    """
+    if callable(copy):
+        copy_func = copy
+    else:
+        try:
+            copy_func = _COPY_POLICIES[copy]
+        except KeyError:
+            raise ValueError(f"unknown copy policy: {copy!r}") from None
+
+    cache = DecoderCache(max_entries, max_bytes)
+    entries = cache._entries
+    lock = cache._lock
+    get = entries.get
+    move_to_end = entries.move_to_end
+    popitem = entries.popitem
+    missing = object()
+
+    def decode(data: bytes) -> T:
+        with lock:
+            try:
+                value = get(data, missing)
+            except TypeError:
+                # Unhashable raw message, e.g. a bytearray
+                hashable = False
+            else:
+                hashable = True
+                if value is not missing:
+                    move_to_end(data)
+                    cache.hits += 1
+                else:
+                    cache.misses += 1
+
+        if not hashable:
+            return decoder(data)
+
+        if value is missing:
+            # Decode outside the lock so other threads are not blocked while
+            # the message is being decoded
+            value = decoder(data)
+
+            size = len(data)
+            if size <= max_bytes:
+                with lock:
+                    if data in entries:
+                        # Another thread decoded the same message meanwhile
+                        cache.nbytes -= size
+                    entries[data] = value
+                    move_to_end(data)
+                    cache.nbytes += size
+                    while len(entries) > max_entries or cache.nbytes > max_bytes:
+                        evicted, _ = popitem(last=False)
+                        cache.nbytes -= len(evicted)
+                        cache.evictions += 1
+
+        return copy_func(value) if copy_func else value
+
+    decode.cache = cache  # type: ignore[attr-defined]
+    return decode
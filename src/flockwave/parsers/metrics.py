@@ -0,0 +1,100 @@
+"""Optional performance counters for message parsers."""
+
+from typing import Any
+
+from .types import Splitter
+
+__all__ = ("ParserMetrics",)
+
+
+class ParserMetrics:
+    """Performance counters of a single parser.
+
+    Pass an instance of this class to `create_parser()` or
+    `create_parser_generator()` in the ``metrics=...`` keyword argument to
+    collect metrics. Parsers created without metrics do not pay for the
+    bookkeeping at all.
+    """
+
+    __slots__ = (
+        "bytes_fed",
+        "decode_failures",
+        "decode_time_ns",
+        "frames_dropped_by_post_filter",
+        "frames_dropped_by_pre_filter",
+        "frames_split",
+        "splitter",
+    )
+
+    bytes_fed: int
+    """Total number of bytes fed into the parser."""
+
+    decode_failures: int
+    """Number of chunks where the decoder raised an exception."""
+
+    decode_time_ns: int
+    """Cumulative time spent in the decoder, in nanoseconds, as measured by
+    `time.perf_counter_ns()`.
+    """
+
+    frames_dropped_by_post_filter: int
+    """Number of decoded messages that were dropped by the post-filter."""
+
+    frames_dropped_by_pre_filter: int
+    """Number of raw messages that were dropped by the pre-filter."""
+
+    frames_split: int
+    """Number of raw messages produced by the splitter."""
+
+    splitter: Splitter | None
+    """The splitter of the parser; used to query how many bytes it is
+    holding on to. Set by the parser when it starts.
+    """
+
+    def __init__(self):
+        self.splitter = None
+        self.reset()
+
+    @property
+    def buffered_bytes(self) -> int | None:
+        """Number of bytes held in the splitter as part of an incomplete
+        message; `None` if the splitter does not support this query.
+        """
+        return getattr(self.splitter, "pending", None)
+
+    @property
+    def bytes_skipped(self) -> int | None:
+        """Number of bytes that the splitter discarded while resynchronising
+        to the next valid frame; `None` if the splitter does not resynchronise.
+        """
+        return getattr(self.splitter, "bytes_skipped", None)
+
+    @property
+    def frames_recovered(self) -> int | None:
+        """Number of valid frames that the splitter found after discarding
+        some bytes; `None` if the splitter does not resynchronise.
+        """
+        return getattr(self.splitter, "frames_recovered", None)
+
+    def reset(self) -> None:
+        """Resets all the counters to zero."""
+        self.bytes_fed = 0
+        self.decode_failures = 0
+        self.decode_time_ns = 0
+        self.frames_dropped_by_post_filter = 0
+        self.frames_dropped_by_pre_filter = 0
+        self.frames_split = 0
+
+    def snapshot(self) -> dict[str, Any]:
+        """Returns the current values of the counters as a dictionary."""
+        return {
+            "bytes_fed": self.bytes_fed,
+            "buffered_bytes": self.buffered_bytes,
+            "bytes_skipped": self.bytes_skipped,
+            "decode_failures": self.decode_failures,
+            "decode_time_ns": self.decode_time_ns,
+            "frames_dropped_by_post_filter": self.frames_dropped_by_post_filter,
+            "frames_dropped_by_pre_filter": self.frames_dropped_by_pre_filter,
+            "frames_recovered": self.frames_recovered,
+            "frames_split": self.frames_split,
+        }
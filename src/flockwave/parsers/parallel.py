@@ -0,0 +1,122 @@
+"""Parsers that decode messages in parallel in a thread or process pool."""
+
+from collections import deque
+from concurrent.futures import Executor, Future
+from functools import partial
+from itertools import islice
+from typing import Callable
+
+from .factories import create_parser
+from .types import BatchDecoder, Parser, T
+
+__all__ = ("create_parallel_batch_decoder", "create_parallel_parser")
+
+
+def _decode_all(decoder: Callable[[bytes], T], frames: list[bytes]) -> list[T]:
+    """Decodes a batch of raw messages with the given decoder.
+
+    This function is submitted to the executor; it is defined at module level
+    so it can be pickled for process pools.
+    """
+    return [decoder(frame) for frame in frames]
+
+
+def create_parallel_batch_decoder(
+    decoder: Callable[[bytes], T],
+    executor: Executor,
+    *,
+    batch_size: int = 256,
+    max_in_flight: int | None = None,
+) -> BatchDecoder[T]:
+    """Creates a batch decoder that splits the raw messages it receives into
+    batches, decodes the batches in parallel in the given executor and
+    returns the decoded messages in their original order.
+
+    The batch decoder blocks until all the messages it received are decoded.
+    The first batch is decoded in the calling thread while the executor is
+    working on the rest; chunks that fit into a single batch are therefore
+    decoded without involving the executor at all.
+
+    Parameters:
+        decoder: the decoder to call on each raw message. It must be picklable
+            (e.g., a function defined at module level or a `partial()` of
+            such a function) when used with a process pool.
+        executor: the executor to decode the batches in. Use a process pool
+            for CPU-heavy decoders and a thread pool for decoders that
+            release the GIL.
+        batch_size: maximum number of raw messages to send to the executor
+            in a single task
+        max_in_flight: maximum number of tasks that may be submitted to the
+            executor at the same time; `None` means no limit
+
+    Returns:
+        a batch decoder that can be passed to `create_parser()`
+    """
+    if batch_size < 1:
+        raise ValueError("batch size must be positive")
+    if max_in_flight is not None and max_in_flight < 1:
+        raise ValueError("maximum number of tasks in flight must be positive")
+
+    decode_all = partial(_decode_all, decoder)
+
+    def decode_batch(frames: list[bytes]) -> list[T]:
+        batches = [
+            frames[start : start + batch_size]
+            for start in range(0, len(frames), batch_size)
+        ]
+        if len(batches) <= 1:
+            # Not worth sending a single batch to the executor
+            return decode_all(frames)
+
+        pending: deque[Future[list[T]]] = deque()
+        remaining = iter(batches[1:])
+        limit = max_in_flight or len(batches)
+
+        try:
+            for batch in islice(remaining, limit):
+                pending.append(executor.submit(decode_all, batch))
+
+            # Decode the first batch in the calling thread while the executor
+            # is working on the rest
+            result = decode_all(batches[0])
+
+            while pending:
+                result.extend(pending.popleft().result())
+                batch = next(remaining, None)
+                if batch is not None:
+                    pending.append(executor.submit(decode_all, batch))
+        finally:
+            for future in pending:
+                future.cancel()
+
+        return result
+
+    return decode_batch
+
+
+def create_parallel_parser(
+    *,
+    decoder: Callable[[bytes], T],
+    executor: Executor,
+    batch_size: int = 256,
+    max_in_flight: int | None = None,
+    **kwds,
+) -> Parser[T]:
+    """Creates a parser that splits the incoming data in the calling thread
+    and decodes the raw messages in parallel in the given executor.
+
+    The messages are returned in the same order as they appear in the input,
+    and the pre- and post-filters are still applied in the calling thread.
+    The caller is responsible for shutting down the executor when it is not
+    needed any more.
+
+    All keyword arguments not mentioned here are forwarded to
+    `create_parser()`. See `create_parallel_batch_decoder()` for the meaning
+    of the keyword arguments mentioned here.
+    """
+    return create_parser(
+        batch_decoder=create_parallel_batch_decoder(
+            decoder, executor, batch_size=batch_size, max_in_flight=max_in_flight
+        ),
+        **kwds,
+    )
@@ -7,7 +7,7 @@ except ImportError:
     raise ImportError("install 'tinyrpc' to use RPC-related parsers") from None
 
 from functools import partial
-from typing import Union
+from typing import Any, Union
 
 from .factories import create_parser
 from .splitters import split_using_length_prefix
@@ -27,6 +27,16 @@ def _parse_rpc_message(protocol: RPCProtocol, data: bytes) -> RPCMessage:
             raise ex from None
 
 
+def get_rpc_method(message: Any) -> str | None:
+    """Returns the name of the method of an RPC request, or `None` for RPC
+    responses.
+
+    Use this as the key function of a `Dispatcher` to dispatch RPC requests
+    based on their method names.
+    """
+    return getattr(message, "method", None)
+
+
 def create_rpc_parser(*, protocol: RPCProtocol, **kwds) -> Parser[RPCMessage]:
     """Creates a parser that parses incoming bytes as RPC requests and responses
     according to some RPC protocol.
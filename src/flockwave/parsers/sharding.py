@@ -0,0 +1,169 @@
+"""Runtime that runs many independent parsers on a pool of worker threads."""
+
+from concurrent.futures import Future, ThreadPoolExecutor
+from os import cpu_count
+from threading import Lock
+from typing import Any, Callable, Generic, Hashable, TypeVar
+
+from .types import Parser, T
+
+__all__ = ("ShardedParser",)
+
+K = TypeVar("K", bound=Hashable)
+
+
+class _Shard(Generic[K, T]):
+    """A single worker thread of a `ShardedParser` and the parsers of the
+    streams pinned to it.
+
+    The parsers are accessed only from the worker thread so they need no
+    locking.
+    """
+
+    __slots__ = ("executor", "num_streams", "parsers")
+
+    executor: ThreadPoolExecutor
+    """Single-threaded executor that runs the parsers of the shard."""
+
+    num_streams: int
+    """Number of streams pinned to the shard."""
+
+    parsers: dict[K, Parser[T]]
+    """The parsers of the streams pinned to the shard, keyed by stream ID."""
+
+    def __init__(self, name: str):
+        self.executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix=name)
+        self.num_streams = 0
+        self.parsers = {}
+
+
+class ShardedParser(Generic[K, T]):
+    """Runtime that owns many independent parsers, one for each stream,
+    keyed by arbitrary stream IDs, and runs them on a pool of worker threads.
+
+    Each stream is pinned to a single worker thread when it is seen for the
+    first time, picking the worker with the fewest streams. All the data of
+    a stream is therefore parsed in the order it was fed, while different
+    streams are parsed in parallel. This scales across cores with decoders
+    that release the GIL, or on free-threaded Python builds.
+
+    A parser that raised an error is discarded; the next chunk of data on
+    the same stream is fed into a new parser.
+
+    Example::
+
+        with ShardedParser(create_json_parser, callback=handle) as runtime:
+            runtime.feed("uav-1", data)
+    """
+
+    _callback: Callable[[K, list[T]], Any] | None
+    _factory: Callable[[], Parser[T]]
+    _lock: Lock
+    _shards: list[_Shard[K, T]]
+    _shard_of_stream: dict[K, _Shard[K, T]]
+
+    def __init__(
+        self,
+        factory: Callable[[], Parser[T]],
+        *,
+        workers: int | None = None,
+        callback: Callable[[K, list[T]], Any] | None = None,
+    ):
+        """Constructor.
+
+        Parameters:
+            factory: function that creates a new parser for a stream when the
+                stream is seen for the first time
+            workers: number of worker threads; defaults to the number of CPU
+                cores
+            callback: optional function to call in the worker thread with the
+                stream ID and the list of parsed messages after each chunk of
+                data was parsed
+        """
+        workers = workers or cpu_count() or 1
+        if workers < 1:
+            raise ValueError("number of workers must be positive")
+
+        self._callback = callback
+        self._factory = factory
+        self._lock = Lock()
+        self._shards = [_Shard(f"ShardedParser-{i}") for i in range(workers)]
+        self._shard_of_stream = {}
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_value, tb) -> None:
+        self.shutdown()
+
+    @property
+    def num_streams(self) -> int:
+        """Number of streams known to the runtime."""
+        return len(self._shard_of_stream)
+
+    def feed(self, stream_id: K, data: bytes) -> Future[list[T]]:
+        """Feeds a chunk of data into the parser of the given stream.
+
+        The data is parsed asynchronously in the worker thread of the stream.
+        The caller must not modify the data until it has been parsed.
+
+        Returns:
+            a future that resolves to the list of messages parsed from the
+            chunk, or to the error raised by the parser
+        """
+        with self._lock:
+            shard = self._shard_of_stream.get(stream_id)
+            if shard is None:
+                shard = min(self._shards, key=_get_num_streams)
+                shard.num_streams += 1
+                self._shard_of_stream[stream_id] = shard
+
+        return shard.executor.submit(self._parse, shard, stream_id, data)
+
+    def remove_stream(self, stream_id: K) -> Future[None]:
+        """Removes the parser of the given stream, discarding any incomplete
+        message that it holds.
+
+        Returns:
+            a future that resolves when the parser was removed, after all the
+            data fed into it earlier has been parsed
+        """
+        with self._lock:
+            shard = self._shard_of_stream.pop(stream_id, None)
+            if shard is None:
+                future: Future[None] = Future()
+                future.set_result(None)
+                return future
+            shard.num_streams -= 1
+
+        return shard.executor.submit(shard.parsers.pop, stream_id, None)
+
+    def shutdown(self, wait: bool = True) -> None:
+        """Shuts down the worker threads of the runtime.
+
+        Parameters:
+            wait: whether to wait until all the data fed into the runtime has
+                been parsed
+        """
+        for shard in self._shards:
+            shard.executor.shutdown(wait=wait)
+
+    def _parse(self, shard: _Shard[K, T], stream_id: K, data: bytes) -> list[T]:
+        parser = shard.parsers.get(stream_id)
+        if parser is None:
+            parser = shard.parsers[stream_id] = self._factory()
+
+        try:
+            messages = list(parser(data))
+        except BaseException:
+            del shard.parsers[stream_id]
+            raise
+
+        if self._callback:
+            self._callback(stream_id, messages)
+
+        return messages
+
+
+def _get_num_streams(shard: _Shard[Any, Any]) -> int:
+    return shard.num_streams
@@ -1,7 +1,9 @@
 """Splitter generators to be used as building blocks for parsers."""
 
-from functools import partial
+from abc import abstractmethod
 from math import ceil, log
+from typing import Generator, Literal
+from zlib import crc32
 
 from .errors import ParseError
 from .types import Splitter
@@ -20,53 +22,6 @@ def dummy_splitter() -> Splitter:
         chunk = [data]
 
 
-def split_around_delimiters(delimiters: bytes) -> Splitter:
-    """Generator function that takes a set of delimiters, and returns a generator
-    that splits incoming messages around the given delimiters, assuming that no
-    message contains any of the delimiter characters.
-
-    Parameters:
-        delimiters: the delimiter bytes between messages; any non-empty sequence
-            consisting solely of these bytes is considered a delimiter between
-            messages
-
-    Returns:
-        a generator that can be used with `create_parser()`
-    """
-    separator = bytes([delimiters[0]])
-    trans = bytes.maketrans(delimiters, separator * len(delimiters))
-
-    chunks = []
-    batch = []
-
-    data = yield ()
-    data = data.translate(trans)
-
-    while True:
-        while True:
-            head, mid, data = data.partition(separator)
-            chunks.append(head)
-            if mid:
-                batch.append(b"".join(chunks))
-                del chunks[:]
-            else:
-                break
-
-        data = yield batch
-        del batch[:]
-        data = data.translate(trans)
-
-
-def split_lines() -> Splitter:
-    """Generator function that returns a generator that splits incoming
-    messages around newline characters (``\r`` and ``\n``).
-
-    Returns:
-        a generator that can be used with `create_parser()`
-    """
-    yield from split_around_delimiters(b"\r\n")
-
-
 def _propose_header_length(max_length: int | None) -> int:
     """Proposes how many bytes the parser should need to represent the
     length of the packets when using a length-prefixed splitter.
@@ -91,76 +46,695 @@ def _validate_endianness(endianness: str) -> None:
         raise ValueError(f"unknown endianness: {endianness}")
 
 
-def _get_body_length_from_header(header: bytes, endianness: str) -> int:
-    """Given a fully retrieved packet header, returns how many bytes we
-    should read to retrieve the full body packet.
+class BufferedSplitter(Generator[list[bytes], bytes, None]):
+    """Base class for splitters that keep their unprocessed input in an
+    internal, growable buffer.
+
+    Instances of this class behave like primed splitter generators so they
+    can be used anywhere a splitter is expected. Subclasses must implement
+    `feed()`, which receives the next chunk of input and returns the list of
+    messages that were completed by the chunk.
+
+    The input of `feed()` may be any bytes-like object, including a
+    `memoryview` into a buffer that the caller reuses later; subclasses must
+    not keep references to the input after `feed()` returns.
     """
-    if len(header) == 1:
-        return header[0]
-    elif len(header) == 2:
-        if endianness == "big":
-            return (header[0] << 8) + header[1]
-        else:
-            return (header[1] << 8) + header[0]
-    else:
-        it = reversed(header) if endianness == "big" else iter(header)
-        result = 0
-        for byte in it:
-            result = (result << 8) + byte
-        return result
 
+    __slots__ = ("_buffer",)
 
-def split_using_length_prefix(
-    max_length: int | None = None,
-    header_length: int | None = None,
-    endianness: str = "big",
-):
-    _validate_endianness(endianness)
+    _buffer: bytearray
+    """Unprocessed bytes carried over from previous chunks."""
 
-    header_length = header_length or _propose_header_length(max_length)
-    get_body_length = partial(_get_body_length_from_header, endianness=endianness)
+    def __init__(self):
+        self._buffer = bytearray()
 
-    chunks = []
-    state = "header"
-    remaining_bytes = header_length
+    @property
+    def pending(self) -> int:
+        """Number of bytes of the current, incomplete message that the
+        splitter is holding on to.
+        """
+        return len(self._buffer)
 
-    while True:
+    @abstractmethod
+    def feed(self, data: bytes) -> list[bytes]:
+        """Feeds the next chunk of input into the splitter.
+
+        Returns:
+            the list of raw messages completed by the chunk
+
+        Raises:
+            ParseError: in case of unrecoverable parse errors
+        """
+        raise NotImplementedError
+
+    def send(self, data: bytes | None) -> list[bytes]:
+        # `None` is sent when the splitter is primed with next()
+        return [] if data is None else self.feed(data)
+
+    def throw(self, typ, val=None, tb=None):
+        return super().throw(typ, val, tb)
+
+
+class DelimitedSplitter(BufferedSplitter):
+    """Splitter engine for messages that are separated by delimiter bytes.
+
+    Each incoming chunk is split in a single pass; only the unterminated part
+    at the end of the chunk is carried over to the next one.
+    """
+
+    __slots__ = ("_delimiters", "_separator", "_table")
+
+    _delimiters: tuple[bytes, ...]
+    """The individual delimiter bytes, each as a separate `bytes` object."""
+
+    _separator: bytes
+    """The delimiter that all other delimiters are mapped to when a chunk
+    contains more than one kind of delimiter.
+    """
+
+    _table: bytes | None
+    """Translation table that maps all delimiters to the separator; `None`
+    if there is only a single delimiter.
+    """
+
+    def __init__(self, delimiters: bytes):
+        super().__init__()
+
+        if not delimiters:
+            raise ValueError("at least one delimiter must be specified")
+
+        self._delimiters = tuple(bytes([d]) for d in delimiters)
+        self._separator = self._delimiters[0]
+        self._table = (
+            bytes.maketrans(delimiters, self._separator * len(delimiters))
+            if len(self._delimiters) > 1
+            else None
+        )
+
+    def feed(self, data: bytes) -> list[bytes]:
+        if type(data) is not bytes:
+            data = bytes(data)
+
+        separator = self._separator
+        if self._table is not None:
+            # Translating the chunk needs a full copy, so check first whether
+            # we can get away with a single kind of delimiter, which is the
+            # common case (e.g. only newlines in line-based protocols)
+            present = [d for d in self._delimiters if d in data]
+            if len(present) > 1:
+                data = data.translate(self._table)
+            elif present:
+                separator = present[0]
+
+        parts = data.split(separator)
+        tail = parts.pop()
+
+        buffer = self._buffer
+        if parts and buffer:
+            buffer += parts[0]
+            parts[0] = bytes(buffer)
+            buffer.clear()
+
+        if tail:
+            buffer += tail
+
+        return parts
+
+
+def _decode_cobs(frame: bytes) -> bytes:
+    """Decodes a single frame encoded with Consistent Overhead Byte Stuffing,
+    without its terminating zero byte.
+
+    Raises:
+        ValueError: if the frame is not a valid COBS frame
+    """
+    parts = []
+    pos = 0
+    end = len(frame)
+
+    while pos < end:
+        code = frame[pos]
+        next_pos = pos + code
+        if next_pos > end:
+            raise ValueError("truncated COBS block")
+
+        parts.append(frame[pos + 1 : next_pos])
+        pos = next_pos
+
+        # Blocks shorter than the maximum imply a zero byte after them,
+        # except at the end of the frame
+        if code < 0xFF and pos < end:
+            parts.append(b"\x00")
+
+    return b"".join(parts)
+
+
+class COBSSplitter(DelimitedSplitter):
+    """Splitter engine for messages encoded with Consistent Overhead Byte
+    Stuffing (COBS) and terminated by zero bytes.
+
+    The frames are split around the zero bytes in a single pass and then
+    decoded block by block with slice copies, so the decoding cost depends on
+    the number of zero bytes in the message and not on its length.
+
+    Empty frames (i.e. consecutive zero bytes) are ignored. Frames that are
+    not valid COBS frames are dropped; the number of bytes dropped is reported
+    in the `bytes_skipped` attribute.
+    """
+
+    __slots__ = ("bytes_skipped",)
+
+    bytes_skipped: int
+    """Number of bytes in invalid frames that were dropped."""
+
+    def __init__(self):
+        super().__init__(b"\x00")
+        self.bytes_skipped = 0
+
+    def feed(self, data: bytes) -> list[bytes]:
         result = []
-        data = yield
+        for frame in super().feed(data):
+            if not frame:
+                continue
 
-        while True:
-            chunks.append(data)
-            remaining_bytes -= len(data)
+            try:
+                result.append(_decode_cobs(frame))
+            except ValueError:
+                self.bytes_skipped += len(frame) + 1
 
-            remaining = remaining_bytes
-            if remaining <= 0:
-                data = b"".join(chunks)
-                if remaining < 0:
-                    data, rest = data[:remaining], data[remaining:]
-                else:
-                    rest = b""
+        return result
+
+
+class SLIPSplitter(DelimitedSplitter):
+    """Splitter engine for messages framed with SLIP (RFC 1055).
+
+    The frames are split around ``END`` bytes in a single pass. Escape
+    sequences never contain an ``END`` byte, so they are undone only after a
+    frame is complete, which handles escape sequences that straddle chunk
+    boundaries without any extra state. Each frame is unescaped with two bulk
+    `bytes.replace()` calls; ``ESC ESC_END`` must be replaced first so the
+    ``ESC`` bytes produced by the second replacement are not processed again.
+
+    Empty frames (i.e. consecutive ``END`` bytes) are ignored.
+    """
+
+    __slots__ = ()
+
+    def __init__(self):
+        super().__init__(b"\xc0")
+
+    def feed(self, data: bytes) -> list[bytes]:
+        if type(data) is not bytes:
+            data = bytes(data)
+
+        # Most chunks contain no escape sequences at all; check this once
+        # for the entire chunk instead of for each frame
+        escaped = b"\xdb" in data or b"\xdb" in self._buffer
+
+        frames = list(filter(None, super().feed(data)))
+        if escaped:
+            frames = [
+                frame.replace(b"\xdb\xdc", b"\xc0").replace(b"\xdb\xdd", b"\xdb")
+                if b"\xdb" in frame
+                else frame
+                for frame in frames
+            ]
+
+        return frames
 
-                chunks[:] = []
 
-                if state == "header":
-                    remaining_bytes = get_body_length(data)
-                    if max_length is not None and remaining_bytes > max_length:
+def split_around_delimiters(delimiters: bytes) -> Splitter:
+    """Returns a splitter that splits incoming messages around the given
+    delimiters, assuming that no message contains any of the delimiter
+    characters.
+
+    Parameters:
+        delimiters: the delimiter bytes between messages; each occurrence of
+            any of these bytes terminates the current message (which may
+            therefore be empty)
+
+    Returns:
+        a splitter that can be used with `create_parser()`
+    """
+    return DelimitedSplitter(delimiters)
+
+
+def split_lines() -> Splitter:
+    """Returns a splitter that splits incoming messages around newline
+    characters (``\r`` and ``\n``).
+
+    Returns:
+        a splitter that can be used with `create_parser()`
+    """
+    return split_around_delimiters(b"\r\n")
+
+
+class LengthPrefixedSplitter(BufferedSplitter):
+    """Splitter engine for messages that are prefixed by their lengths.
+
+    Complete messages are sliced directly from the incoming chunk whenever
+    possible; only the trailing, incomplete part of the chunk is copied into
+    the internal buffer. When the next chunk arrives, only the bytes that
+    complete the pending header or message are appended to the buffer, and
+    the rest of the chunk is sliced directly again.
+    """
+
+    __slots__ = ("_body_length", "_endianness", "_header_length", "_max_length")
+
+    _body_length: int
+    """Length of the body of the current message if its header has been
+    processed already, -1 if we are waiting for the header.
+    """
+
+    def __init__(
+        self,
+        *,
+        header_length: int,
+        max_length: int | None = None,
+        endianness: str = "big",
+    ):
+        super().__init__()
+
+        _validate_endianness(endianness)
+
+        self._body_length = -1
+        self._endianness = endianness
+        self._header_length = header_length
+        self._max_length = max_length
+
+    @property
+    def pending(self) -> int:
+        result = len(self._buffer)
+        if self._body_length >= 0:
+            result += self._header_length
+        return result
+
+    def feed(self, data: bytes) -> list[bytes]:
+        buffer = self._buffer
+        endianness = self._endianness
+        header_length = self._header_length
+        max_length = self._max_length
+        body_length = self._body_length
+
+        from_bytes = int.from_bytes
+        result = []
+        pos = 0
+
+        with memoryview(data) as view:
+            end = view.nbytes
+
+            if buffer:
+                # Append only the bytes that complete the pending header or
+                # message to the buffer
+                pos = (header_length if body_length < 0 else body_length) - len(buffer)
+                if end < pos:
+                    buffer += view
+                    return result
+
+                buffer += view[:pos]
+                if body_length < 0:
+                    body_length = from_bytes(buffer, endianness)
+                    if max_length is not None and body_length > max_length:
                         raise ParseError(
                             f"packet length exceeds limit "
-                            f"({remaining_bytes} > {max_length})"
+                            f"({body_length} > {max_length})"
                         )
-                    state = "body"
                 else:
-                    if max_length is None or len(data) <= max_length:
-                        result.append(data)
+                    result.append(bytes(buffer))
+                    body_length = -1
+                buffer.clear()
+
+            while True:
+                if body_length < 0:
+                    if end - pos < header_length:
+                        break
+
+                    if header_length == 1:
+                        body_length = view[pos]
+                    else:
+                        body_length = from_bytes(
+                            view[pos : pos + header_length], endianness
+                        )
+                    pos += header_length
+
+                    if max_length is not None and body_length > max_length:
+                        raise ParseError(
+                            f"packet length exceeds limit "
+                            f"({body_length} > {max_length})"
+                        )
+
+                if end - pos < body_length:
+                    break
+
+                next_pos = pos + body_length
+                result.append(view[pos:next_pos].tobytes())
+                pos = next_pos
+                body_length = -1
+
+            if pos < end:
+                buffer += view[pos:]
+
+        self._body_length = body_length
+        return result
+
+
+MAX_VARINT_LENGTH = 10
+"""Maximum number of bytes in a varint length prefix; enough to encode any
+64-bit unsigned integer.
+"""
+
+
+class VarintLengthPrefixedSplitter(BufferedSplitter):
+    """Splitter engine for messages that are prefixed by their lengths,
+    encoded as unsigned LEB128 varints (as in Protocol Buffers).
+
+    The length of a message is checked against the maximum length as soon as
+    its header is complete (and even before that if the header is already
+    too large), before any part of the body is buffered. Like the fixed-width
+    splitter, complete messages are sliced directly from the incoming chunk
+    whenever possible.
+    """
+
+    __slots__ = ("_body_length", "_header_length", "_max_length")
+
+    _body_length: int
+    """Length of the body of the current message if its header has been
+    processed already, -1 if we are waiting for the header.
+    """
+
+    _header_length: int
+    """Length of the header of the current message if its header has been
+    processed already.
+    """
+
+    def __init__(self, *, max_length: int | None = None):
+        super().__init__()
+
+        self._body_length = -1
+        self._header_length = 0
+        self._max_length = max_length
+
+    @property
+    def pending(self) -> int:
+        result = len(self._buffer)
+        if self._body_length >= 0:
+            result += self._header_length
+        return result
+
+    def feed(self, data: bytes) -> list[bytes]:
+        buffer = self._buffer
+        if buffer:
+            buffer += data
+            source = buffer
+        else:
+            source = data
+
+        max_length = self._max_length
+        body_length = self._body_length
+
+        result = []
+        pos = 0
+
+        with memoryview(source) as view:
+            end = view.nbytes
+            while True:
+                if body_length < 0:
+                    if pos >= end:
+                        break
+
+                    body_length = view[pos]
+                    if body_length < 0x80:
+                        header_length = 1
+                    else:
+                        # Slow path for lengths that need multiple bytes
+                        body_length &= 0x7F
+                        header_length = 1
+                        shift = 0
+                        while True:
+                            if pos + header_length >= end:
+                                # Header continues in the next chunk
+                                body_length = -1
+                                break
+
+                            byte = view[pos + header_length]
+                            header_length += 1
+                            shift += 7
+                            body_length |= (byte & 0x7F) << shift
+
+                            if max_length is not None and body_length > max_length:
+                                break
+                            if byte < 0x80:
+                                break
+                            if header_length >= MAX_VARINT_LENGTH:
+                                raise ParseError("varint length prefix is too long")
+
+                        if body_length < 0:
+                            break
+
+                    pos += header_length
+                    self._header_length = header_length
+
+                    if max_length is not None and body_length > max_length:
+                        raise ParseError(
+                            f"packet length exceeds limit "
+                            f"({body_length} > {max_length})"
+                        )
+
+                if end - pos < body_length:
+                    break
+
+                next_pos = pos + body_length
+                result.append(view[pos:next_pos].tobytes())
+                pos = next_pos
+                body_length = -1
+
+            if source is not buffer and pos < end:
+                buffer += view[pos:]
 
-                    remaining_bytes = header_length
-                    state = "header"
+        if source is buffer:
+            del buffer[:pos]
 
-                data = rest
+        self._body_length = body_length
+        return result
+
+
+def split_using_length_prefix(
+    max_length: int | None = None,
+    header_length: int | Literal["varint"] | None = None,
+    endianness: str = "big",
+) -> Splitter:
+    """Returns a splitter that splits incoming messages that are prefixed by
+    their lengths in bytes.
+
+    Parameters:
+        max_length: maximum length of messages; it will also be used to decide
+            how many bytes the protocol uses to encode the message lengths
+            unless `header_length` is specified
+        header_length: number of bytes that the protocol uses to encode
+            message lengths; inferred from `max_length` if not present.
+            ``"varint"`` means that the lengths are encoded as unsigned
+            LEB128 varints with a variable number of bytes.
+        endianness: whether lengths are encoded in little endian or big endian
+            (relevant only if lengths are encoded in more than one byte and
+            they are not varints)
+
+    Returns:
+        a splitter that can be used with `create_parser()`
+
+    Raises:
+        ParseError: when the splitter encounters a message whose length exceeds
+            the maximum length
+    """
+    if header_length == "varint":
+        return VarintLengthPrefixedSplitter(max_length=max_length)
+
+    return LengthPrefixedSplitter(
+        header_length=header_length or _propose_header_length(max_length),
+        max_length=max_length,
+        endianness=endianness,
+    )
+
+
+def split_using_cobs() -> Splitter:
+    """Returns a splitter that splits incoming messages encoded with
+    Consistent Overhead Byte Stuffing (COBS) around zero bytes and decodes
+    them.
+
+    See `COBSSplitter` for the details.
+
+    Returns:
+        a splitter that can be used with `create_parser()`
+    """
+    return COBSSplitter()
+
+
+def split_using_slip() -> Splitter:
+    """Returns a splitter that splits incoming messages framed with SLIP
+    (RFC 1055) and undoes the escaping of the messages.
+
+    See `SLIPSplitter` for the details.
+
+    Returns:
+        a splitter that can be used with `create_parser()`
+    """
+    return SLIPSplitter()
+
+
+DEFAULT_SYNC_WORD = b"\x55\xaa"
+"""Default sync word that marks the start of each frame in the framing mode
+implemented by `split_using_sync_word()`.
+"""
+
+
+class SyncWordSplitter(BufferedSplitter):
+    """Splitter engine for frames that start with a sync word, followed by the
+    length of the message, the message itself and a CRC-32 checksum of the
+    length and the message.
+
+    Corrupted frames do not stop the splitter; it skips forward byte by byte
+    to the next occurrence of the sync word until it finds a frame with a
+    valid length and checksum. The number of bytes skipped and the number of
+    frames found after skipping are reported in the `bytes_skipped` and
+    `frames_recovered` attributes.
+
+    A corrupted length that is still within the maximum length makes the
+    splitter wait for the rest of the bogus frame before it can reject it;
+    a tight maximum length therefore speeds up recovery.
+    """
+
+    __slots__ = (
+        "_endianness",
+        "_header_length",
+        "_in_sync",
+        "_max_length",
+        "_sync_word",
+        "bytes_skipped",
+        "frames_recovered",
+    )
+
+    bytes_skipped: int
+    """Number of bytes discarded while looking for a valid frame."""
+
+    frames_recovered: int
+    """Number of valid frames found after discarding some bytes."""
+
+    _in_sync: bool
+    """Whether the last frame was found without skipping any bytes before it."""
+
+    def __init__(
+        self,
+        *,
+        header_length: int,
+        max_length: int | None = None,
+        endianness: str = "big",
+        sync_word: bytes = DEFAULT_SYNC_WORD,
+    ):
+        super().__init__()
+
+        _validate_endianness(endianness)
+        if not sync_word:
+            raise ValueError("sync word must not be empty")
+
+        self._endianness = endianness
+        self._header_length = header_length
+        self._in_sync = True
+        self._max_length = (
+            max_length if max_length is not None else 2 ** (8 * header_length) - 1
+        )
+        self._sync_word = bytes(sync_word)
+
+        self.bytes_skipped = 0
+        self.frames_recovered = 0
+
+    def feed(self, data: bytes) -> list[bytes]:
+        buffer = self._buffer
+        buffer += data
 
-            else:
-                data = yield result
-                del result[:]
+        endianness = self._endianness
+        header_length = self._header_length
+        max_length = self._max_length
+        sync_word = self._sync_word
+        sync_length = len(sync_word)
 
+        from_bytes = int.from_bytes
+        result = []
+        pos = 0
+        end = len(buffer)
+
+        with memoryview(buffer) as view:
+            while True:
+                start = buffer.find(sync_word, pos)
+                if start < 0:
+                    # Keep the bytes that may be the beginning of a sync word
+                    start = max(pos, end - sync_length + 1)
+
+                if start > pos:
+                    self.bytes_skipped += start - pos
+                    self._in_sync = False
+                    pos = start
+
+                body_start = start + sync_length + header_length
+                if end < body_start:
+                    break
+
+                length = from_bytes(view[start + sync_length : body_start], endianness)
+                body_end = body_start + length
+                if length > max_length:
+                    self.bytes_skipped += 1
+                    self._in_sync = False
+                    pos += 1
+                    continue
+
+                if end < body_end + 4:
+                    break
+
+                checksum = crc32(view[start + sync_length : body_end])
+                if checksum != from_bytes(view[body_end : body_end + 4], endianness):
+                    self.bytes_skipped += 1
+                    self._in_sync = False
+                    pos += 1
+                    continue
+
+                result.append(view[body_start:body_end].tobytes())
+                pos = body_end + 4
+
+                if not self._in_sync:
+                    self.frames_recovered += 1
+                    self._in_sync = True
+
+        del buffer[:pos]
         return result
+
+
+def split_using_sync_word(
+    max_length: int | None = None,
+    header_length: int | None = None,
+    endianness: str = "big",
+    sync_word: bytes = DEFAULT_SYNC_WORD,
+) -> Splitter:
+    """Returns a splitter that splits incoming frames that start with a sync
+    word and end with a checksum, as created by `frame_with_sync_word()` on
+    the encoder side, and resynchronises to the next valid frame when the
+    stream is corrupted.
+
+    See `SyncWordSplitter` for the details of the framing.
+
+    Parameters:
+        max_length: maximum length of messages; it will also be used to decide
+            how many bytes the protocol uses to encode the message lengths
+            unless `header_length` is specified
+        header_length: number of bytes that the protocol uses to encode
+            message lengths; inferred from `max_length` if not present
+        endianness: whether lengths and checksums are encoded in little endian
+            or big endian
+        sync_word: the bytes that mark the start of each frame
+
+    Returns:
+        a splitter that can be used with `create_parser()`
+    """
+    return SyncWordSplitter(
+        header_length=header_length or _propose_header_length(max_length),
+        max_length=max_length,
+        endianness=endianness,
+        sync_word=sync_word,
+    )
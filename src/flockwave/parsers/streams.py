@@ -0,0 +1,189 @@
+"""Adapters that feed the data read from asynchronous streams into parsers."""
+
+from asyncio import BaseTransport, BufferedProtocol, sleep
+from functools import partial
+from typing import Any, AsyncIterator, Awaitable, Callable, Generic
+
+from .errors import ParseError
+from .types import Parser, T
+
+__all__ = ("ParserProtocol", "parse_stream")
+
+
+def _get_pending_bytes(parser: Parser[Any]) -> int | None:
+    """Returns how many bytes of an incomplete message the given parser is
+    holding on to, or `None` if the parser cannot tell.
+    """
+    return getattr(getattr(parser, "splitter", None), "pending", None)
+
+
+async def parse_stream(
+    stream: Any,
+    parser: Parser[T],
+    *,
+    read_size: int = 65536,
+    yield_every: int = 16,
+    checkpoint: Callable[[], Awaitable[Any]] = partial(sleep, 0),
+    strict: bool = True,
+) -> AsyncIterator[T]:
+    """Reads chunks of data from an asynchronous stream until the end of the
+    stream, feeds them into a parser and yields the parsed messages.
+
+    The stream may be an `asyncio.StreamReader` or any other object with an
+    asynchronous ``read(n)`` method, or an object with an asynchronous
+    ``receive()`` method that takes no arguments (like the byte streams of
+    `anyio`). The end of the stream is signalled by an empty chunk or by an
+    exception named ``EndOfStream`` (raised by `anyio`).
+
+    Reading from a stream that already has data buffered does not suspend
+    the current task, so the adapter explicitly yields control to the event
+    loop after every `yield_every` chunks to ensure that a single busy stream
+    cannot starve the other tasks.
+
+    Parameters:
+        stream: the stream to read from
+        parser: the parser to feed the data into
+        read_size: maximum number of bytes to read in a single step from
+            streams that have a ``read(n)`` method
+        yield_every: number of chunks to process before yielding control to
+            the event loop; zero or negative numbers disable yielding
+        checkpoint: async function to call to yield control to the event loop;
+            the default works with `asyncio`
+        strict: whether to raise an error when the stream ends in the middle
+            of a message. This works only with parsers that expose a splitter
+            that reports how many bytes it is holding on to, i.e. parsers
+            created by `create_parser()` from keyword arguments with one of
+            the built-in splitters; the remaining bytes of an incomplete
+            message are silently discarded with other parsers.
+
+    Yields:
+        the parsed messages
+
+    Raises:
+        ParseError: in case of unrecoverable parse errors, or when `strict`
+            is set and the stream ended in the middle of a message
+        TypeError: if the stream has neither a ``read()`` nor a ``receive()``
+            method
+    """
+    if hasattr(stream, "read"):
+        read = partial(stream.read, read_size)
+    elif hasattr(stream, "receive"):
+        read = stream.receive
+    else:
+        raise TypeError(f"cannot read from stream of type {type(stream).__name__}")
+
+    chunks_since_checkpoint = 0
+
+    while True:
+        try:
+            data = await read()
+        except Exception as ex:
+            # anyio signals the end of the stream with an exception; we
+            # match it by name to avoid depending on anyio
+            if type(ex).__name__ == "EndOfStream":
+                break
+            raise
+
+        if not data:
+            break
+
+        for message in parser(data):
+            yield message
+
+        if yield_every > 0:
+            chunks_since_checkpoint += 1
+            if chunks_since_checkpoint >= yield_every:
+                chunks_since_checkpoint = 0
+                await checkpoint()
+
+    if strict:
+        pending = _get_pending_bytes(parser)
+        if pending:
+            raise ParseError(
+                f"stream ended in the middle of a message ({pending} bytes pending)"
+            )
+
+
+class ParserProtocol(BufferedProtocol, Generic[T]):
+    """asyncio protocol that feeds the data received from a stream-oriented
+    transport directly into a parser and hands the parsed messages to a
+    callback.
+
+    The protocol lets the transport read directly into a preallocated
+    receive buffer and passes the freshly received part of the buffer to the
+    parser as a `memoryview`, without creating an intermediate `bytes`
+    object. The length-prefixed splitter slices complete messages straight
+    out of the receive buffer and copies only the incomplete tail into its
+    own buffer; the delimiter-based splitters need a single copy of each
+    chunk. The receive buffer is reused for the next read, therefore the
+    parser must not keep references to its input; all the built-in splitters
+    except `dummy_splitter()` satisfy this requirement.
+
+    Parse errors raised by the parser close the transport; the error is
+    then passed to `on_connection_lost`.
+    """
+
+    _buffer: bytearray
+    """The receive buffer that the transport reads into."""
+
+    _callback: Callable[[T], Any]
+    """Function to call with each parsed message."""
+
+    _on_connection_lost: Callable[[Exception | None], Any] | None
+    """Function to call when the connection is lost or closed."""
+
+    _parser: Parser[T]
+    """The parser to feed the received data into."""
+
+    _view: memoryview
+    """A view into the receive buffer."""
+
+    transport: BaseTransport | None
+    """The transport that the protocol is connected to."""
+
+    def __init__(
+        self,
+        parser: Parser[T],
+        callback: Callable[[T], Any],
+        *,
+        buffer_size: int = 65536,
+        on_connection_lost: Callable[[Exception | None], Any] | None = None,
+    ):
+        """Constructor.
+
+        Parameters:
+            parser: the parser to feed the received data into
+            callback: function to call with each parsed message
+            buffer_size: size of the receive buffer; this is the maximum
+                number of bytes that the transport reads in a single step
+            on_connection_lost: function to call when the connection is lost
+                or closed, with the exception that caused it or `None` if the
+                connection was closed normally
+        """
+        if buffer_size <= 0:
+            raise ValueError("buffer size must be positive")
+
+        self._buffer = bytearray(buffer_size)
+        self._callback = callback
+        self._on_connection_lost = on_connection_lost
+        self._parser = parser
+        self._view = memoryview(self._buffer)
+
+        self.transport = None
+
+    def connection_made(self, transport: BaseTransport) -> None:
+        self.transport = transport
+
+    def connection_lost(self, exc: Exception | None) -> None:
+        self.transport = None
+        if self._on_connection_lost:
+            self._on_connection_lost(exc)
+
+    def get_buffer(self, sizehint: int) -> memoryview:
+        return self._view
+
+    def buffer_updated(self, nbytes: int) -> None:
+        callback = self._callback
+        with self._view[:nbytes] as chunk:
+            for message in self._parser(chunk):
+                callback(message)
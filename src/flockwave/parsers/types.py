@@ -1,7 +1,7 @@
 from typing import Callable, Generator, Iterable, TypeVar
 
 
-__all__ = ("Parser", "ParserGenerator", "Splitter", "T")
+__all__ = ("BatchDecoder", "Parser", "ParserGenerator", "Splitter", "T")
 
 T = TypeVar("T")
 
@@ -59,3 +59,14 @@ processed further.
 Post-filters accept parsed (converted) messages and return whether they should
 be yielded back to the caller of the parser.
 """
+
+BatchDecoder = Callable[[list[bytes]], list[T]]
+"""Type specification for batch decoder functions that decode all the raw
+messages detected in a single chunk of the input in one go.
+
+Parameters:
+    the list of raw messages to decode
+
+Returns:
+    the list of decoded messages, in the same order as the raw messages
+"""
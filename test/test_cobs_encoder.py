@@ -0,0 +1,46 @@
+from flockwave.encoders import create_cobs_encoder
+
+import pytest
+
+
+@pytest.mark.parametrize(
+    ("data", "expected"),
+    [
+        (b"", b"\x01\x00"),
+        (b"\x00", b"\x01\x01\x00"),
+        (b"\x00\x00", b"\x01\x01\x01\x00"),
+        (b"\x00\x11\x00", b"\x01\x02\x11\x01\x00"),
+        (b"\x11\x22\x00\x33", b"\x03\x11\x22\x02\x33\x00"),
+        (b"\x11\x22\x33\x44", b"\x05\x11\x22\x33\x44\x00"),
+        (b"\x11\x00\x00\x00", b"\x02\x11\x01\x01\x01\x00"),
+        (bytes(range(1, 255)), b"\xff" + bytes(range(1, 255)) + b"\x00"),
+        (
+            bytes(range(0, 255)),
+            b"\x01\xff" + bytes(range(1, 255)) + b"\x00",
+        ),
+        (
+            bytes(range(1, 256)),
+            b"\xff" + bytes(range(1, 255)) + b"\x02\xff\x00",
+        ),
+        (
+            bytes(range(2, 256)) + b"\x00",
+            b"\xff" + bytes(range(2, 256)) + b"\x01\x01\x00",
+        ),
+        (
+            bytes(range(3, 256)) + b"\x00\x01",
+            b"\xfe" + bytes(range(3, 256)) + b"\x02\x01\x00",
+        ),
+    ],
+)
+def test_cobs_encoder(data, expected):
+    encoder = create_cobs_encoder()
+    assert expected == encoder(data)
+    assert (b"", expected[:-1], b"\x00") == encoder.encode_parts(data)
+
+
+def test_cobs_encoder_encode_many():
+    encoder = create_cobs_encoder()
+    messages = [b"foo", b"", b"\x00" * 300, b"x" * 600]
+    expected = b"".join(encoder(message) for message in messages)
+    assert expected == encoder.encode_many(messages)
+    assert b"" == encoder.encode_many([])
@@ -0,0 +1,54 @@
+from flockwave.encoders import create_cobs_encoder
+from flockwave.parsers import create_cobs_parser
+from random import Random
+
+import pytest
+
+
+@pytest.mark.parametrize(
+    ("data", "expected"),
+    [
+        ([b""], []),
+        ([b"\x03\x11\x22\x02\x33\x00"], [b"\x11\x22\x00\x33"]),
+        ([b"\x01\x00\x00\x01\x01\x00"], [b"", b"\x00"]),
+        ([b"\x03\x11", b"\x22\x02", b"\x33\x00\x02"], [b"\x11\x22\x00\x33"]),
+        ([b"\xff" + bytes(range(1, 255)) + b"\x00"], [bytes(range(1, 255))]),
+        (
+            [b"\xff" + bytes(range(1, 255)) + b"\x02\xff\x00"],
+            [bytes(range(1, 256))],
+        ),
+    ],
+)
+def test_cobs_parser(data, expected):
+    parser = create_cobs_parser()
+    result = []
+    for chunk in data:
+        result.extend(parser(chunk))
+    assert expected == result
+
+
+def test_cobs_parser_drops_invalid_frames():
+    parser = create_cobs_parser(metrics=True)
+    assert parser(b"\x05\x11\x00\x02\x22\x00") == [b"\x22"]
+    assert parser.metrics.bytes_skipped == 3
+
+
+def test_cobs_parser_with_min_length():
+    parser = create_cobs_parser(min_length=2)
+    assert parser(b"\x02\x11\x00\x03\x11\x22\x00") == [b"\x11\x22"]
+
+
+def test_cobs_roundtrip():
+    rng = Random(42)
+    messages = [
+        bytes(rng.choice((0, 1, 0x7F, 0xFF)) for _ in range(rng.randrange(1, 1000)))
+        for _ in range(200)
+    ]
+    data = create_cobs_encoder().encode_many(messages)
+
+    parser = create_cobs_parser()
+    result = []
+    for start in range(0, len(data), 37):
+        result.extend(parser(data[start : start + 37]))
+
+    assert messages == result
@@ -0,0 +1,105 @@
+from flockwave.encoders import create_encoder
+from flockwave.encoders.compression import compress_with_zlib
+from flockwave.encoders.wrappers import (
+    append_separator,
+    chain_wrappers,
+    prefix_with_length,
+)
+from flockwave.parsers import ParseError, create_parser
+from flockwave.parsers.compression import decompress_frames, train_zlib_dictionary
+from flockwave.parsers.splitters import split_lines, split_using_length_prefix
+from json import dumps, loads
+
+import pytest
+
+
+def _messages(count, start=0):
+    return [
+        {"type": "UAV-INF", "id": f"uav-{i % 7}", "pos": [47.1 + i, 19.2], "alt": i}
+        for i in range(start, start + count)
+    ]
+
+
+def _encode(message):
+    return dumps(message).encode("utf-8")
+
+
+@pytest.mark.parametrize("chunk_size", [1, 7, 65536])
+@pytest.mark.parametrize("framing", ["lines", "length_prefix"])
+def test_roundtrip(framing, chunk_size):
+    if framing == "lines":
+        framer, splitter, text_safe = append_separator(b"\n"), split_lines, True
+    else:
+        framer = prefix_with_length(header_length=2)
+        splitter = split_using_length_prefix(header_length=2)
+        text_safe = False
+
+    compressor = compress_with_zlib(text_safe=text_safe)
+    encoder = create_encoder(_encode, chain_wrappers(compressor, framer))
+    data = b"".join(encoder(message) for message in _messages(100))
+    data += encoder("")
+
+    splitter = decompress_frames(splitter, text_safe=text_safe)
+    parser = create_parser(splitter=splitter, decoder=loads)
+    result = []
+    for start in range(0, len(data), chunk_size):
+        result.extend(parser(data[start : start + chunk_size]))
+
+    assert result == _messages(100) + [""]
+    assert splitter.metrics.messages == 101
+    assert splitter.metrics.snapshot() == compressor.metrics.snapshot()
+
+
+def test_shared_context_improves_ratio():
+    compressor = compress_with_zlib()
+    first = compressor(_encode(_messages(1)[0]))
+    later = [compressor(_encode(message)) for message in _messages(50, 1)]
+
+    # Later messages refer back to the contents of earlier ones
+    assert max(len(item) for item in later) < len(first) / 2
+    assert compressor.metrics.ratio > 3
+
+
+def test_preset_dictionary():
+    samples = [_encode(message) for message in _messages(20, 1000)]
+    zdict = train_zlib_dictionary(samples, size=1024)
+    assert len(zdict) <= 1024
+
+    message = _encode(_messages(1)[0])
+    without_dict = compress_with_zlib()(message)
+    with_dict = compress_with_zlib(zdict=zdict)(message)
+    assert len(with_dict) < len(without_dict)
+
+    splitter = decompress_frames(
+        split_using_length_prefix(header_length=2), zdict=zdict
+    )
+    next(splitter)
+    assert splitter.send(prefix_with_length(header_length=2)(with_dict)) == [message]
+
+
+def test_train_zlib_dictionary_orders_by_frequency():
+    assert train_zlib_dictionary([b"a", b"b", b"b", b"c", b"b"]) in (b"acb", b"cab")
+    assert train_zlib_dictionary([b"abc", b"abc", b"def"], size=4) == b"fabc"
+
+    with pytest.raises(ValueError):
+        train_zlib_dictionary([b"abc"], size=0)
+
+
+def test_corrupted_message():
+    parser = create_parser(splitter=decompress_frames(split_lines, text_safe=True))
+    with pytest.raises(ParseError, match="failed to decompress"):
+        parser(b"not base64!\n")
+
+    parser = create_parser(
+        splitter=decompress_frames(split_using_length_prefix(header_length=1))
+    )
+    with pytest.raises(ParseError, match="failed to decompress"):
+        parser(b"\x02\xff\xff")
+
+
+def test_pending_bytes_are_reported():
+    parser = create_parser(
+        splitter=decompress_frames(split_lines, text_safe=True), metrics=True
+    )
+    parser(b"abc")
+    assert parser.metrics.buffered_bytes == 3
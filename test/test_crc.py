@@ -0,0 +1,106 @@
+from flockwave.encoders import create_length_prefixed_encoder
+from flockwave.encoders.wrappers import append_crc
+from flockwave.parsers import create_length_prefixed_parser
+from flockwave.parsers.crc import (
+    crc16_ccitt,
+    crc16_mcrf4xx,
+    crc32,
+    get_crc_algorithm,
+)
+from flockwave.parsers.filters import verify_crc
+from json import dumps, loads
+
+import pytest
+
+ALGORITHMS = ("crc16-ccitt", "crc16-mcrf4xx", "crc32")
+
+
+def _reference_crc16_mcrf4xx(data: bytes) -> int:
+    crc = 0xFFFF
+    for byte in data:
+        crc ^= byte
+        for _ in range(8):
+            crc = (crc >> 1) ^ 0x8408 if crc & 1 else crc >> 1
+    return crc
+
+
+def test_check_values():
+    assert crc16_ccitt(b"123456789") == 0x29B1
+    assert crc16_mcrf4xx(b"123456789") == 0x6F91
+    assert crc32(b"123456789") == 0xCBF43926
+
+
+def test_crc16_mcrf4xx():
+    for length in range(300):
+        data = bytes((i * 37 + length) & 0xFF for i in range(length))
+        assert crc16_mcrf4xx(data) == _reference_crc16_mcrf4xx(data)
+
+    data = b"foobarbaz"
+    assert crc16_mcrf4xx(data[3:], crc16_mcrf4xx(data[:3])) == crc16_mcrf4xx(data)
+    assert crc16_mcrf4xx(memoryview(data)) == crc16_mcrf4xx(data)
+
+
+def test_unknown_algorithm():
+    with pytest.raises(ValueError, match="unknown CRC algorithm"):
+        get_crc_algorithm("crc64")
+
+
+@pytest.mark.parametrize("endianness", ["big", "little"])
+@pytest.mark.parametrize("algorithm", ALGORITHMS)
+def test_append_and_verify_crc(algorithm, endianness):
+    func, size = get_crc_algorithm(algorithm)
+    wrapper = append_crc(algorithm, endianness=endianness)
+    assert wrapper(b"foo") == b"foo" + func(b"foo").to_bytes(size, endianness)
+    assert wrapper.wrap_parts(b"foo") == (b"", b"foo", wrapper(b"foo")[3:])
+    assert wrapper.wrap_many([b"foo", b"", b"bar"]) == b"".join(
+        wrapper(data) for data in (b"foo", b"", b"bar")
+    )
+
+    filter = verify_crc(algorithm, endianness=endianness)
+    frames = [wrapper(b"foo"), wrapper(b""), b"x" + wrapper(b"foo"), b"", b"\x00"]
+    assert [filter(frame) for frame in frames] == [True, True, False, False, False]
+    assert filter.filter_many(frames) == frames[:2]
+
+    filter = verify_crc(algorithm, endianness=endianness, min_length=1)
+    assert filter.filter_many(frames) == frames[:1]
+
+
+@pytest.mark.parametrize("endianness", ["big", "little"])
+@pytest.mark.parametrize("algorithm", ALGORITHMS)
+def test_length_prefixed_roundtrip_with_crc(algorithm, endianness):
+    encoder = create_length_prefixed_encoder(
+        header_length=2, endianness=endianness, crc=algorithm
+    )
+    data = encoder.encode_many([b"foo", b"", b"spam"])
+    assert data == b"".join(encoder(msg) for msg in (b"foo", b"", b"spam"))
+    assert b"".join(encoder.encode_parts(b"foo")) == encoder(b"foo")
+
+    # Corrupt the second message
+    corrupted = bytearray(data)
+    corrupted[data.index(b"spam") + 1] ^= 0x40
+
+    parser = create_length_prefixed_parser(
+        header_length=2, endianness=endianness, crc=algorithm, metrics=True
+    )
+    assert parser(bytes(corrupted)) == [b"foo", b""]
+    assert parser(data) == [b"foo", b"", b"spam"]
+    assert parser.metrics.frames_dropped_by_pre_filter == 1
+
+    parser = create_length_prefixed_parser(
+        header_length=2, endianness=endianness, crc=algorithm, min_length=1
+    )
+    assert parser(data) == [b"foo", b"spam"]
+
+
+@pytest.mark.parametrize("batch", [False, True])
+def test_length_prefixed_parser_strips_crc_before_decoding(batch):
+    encoder = create_length_prefixed_encoder(
+        header_length=2, crc="crc32", encoder=lambda obj: dumps(obj).encode()
+    )
+    if batch:
+        decoder = {"batch_decoder": lambda frames: [loads(f) for f in frames]}
+    else:
+        decoder = {"decoder": loads}
+
+    parser = create_length_prefixed_parser(header_length=2, crc="crc32", **decoder)
+    assert parser(encoder.encode_many([{"a": 1}, [2, 3]])) == [{"a": 1}, [2, 3]]
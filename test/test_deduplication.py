@@ -0,0 +1,118 @@
+from flockwave.parsers import create_length_prefixed_parser
+from flockwave.parsers.filters import DeduplicationCache, reject_duplicates
+from flockwave.encoders.wrappers import prefix_with_length
+
+import pytest
+
+
+class FakeClock:
+    def __init__(self):
+        self.now = 0.0
+
+    def __call__(self):
+        return self.now
+
+
+def test_cache_detects_duplicates_and_expires_keys():
+    clock = FakeClock()
+    cache = DeduplicationCache(max_entries=10, ttl=1.0, clock=clock)
+
+    assert cache.add_many([b"a", b"b", b"a"]) == [True, True, False]
+    assert cache.add(b"b") is False
+    assert len(cache) == 2
+    assert cache.nbytes == 2
+
+    clock.now = 0.5
+    assert cache.add(b"c") is True
+
+    # a and b expire, c does not
+    clock.now = 1.2
+    assert cache.add_many([b"c", b"a"]) == [False, True]
+    assert len(cache) == 2
+
+    assert cache.snapshot() == {
+        "duplicates": 3,
+        "entries": 2,
+        "evictions": 0,
+        "expirations": 2,
+        "nbytes": 2,
+    }
+
+
+def test_cache_replaces_expired_keys_behind_recent_ones():
+    clock = FakeClock()
+    cache = DeduplicationCache(ttl=1.0, clock=clock)
+
+    cache.add("a")
+    clock.now = 0.9
+    cache.add("b")
+    cache.add("a")  # moves "a" behind "b" without refreshing it
+
+    clock.now = 1.5
+    assert cache.add("a") is True
+    assert cache.add("b") is False
+    assert cache.expirations == 1
+
+
+def test_cache_evicts_least_recently_seen_keys():
+    cache = DeduplicationCache(max_entries=2, ttl=None)
+
+    assert cache.add_many([b"a", b"b", b"a", b"c"]) == [True, True, False, True]
+    assert cache.evictions == 1
+    assert len(cache) == 2
+    assert cache.add_many([b"a", b"b"]) == [False, True]
+
+    cache.reset()
+    assert len(cache) == 0
+    assert cache.snapshot()["duplicates"] == 0
+    assert cache.nbytes == 0
+
+
+@pytest.mark.parametrize(("max_entries", "ttl"), [(0, 1.0), (10, 0)])
+def test_cache_checks_arguments(max_entries, ttl):
+    with pytest.raises(ValueError):
+        DeduplicationCache(max_entries, ttl)
+
+
+def test_reject_duplicates():
+    filter = reject_duplicates()
+    assert filter(b"a")
+    assert not filter(b"a")
+    assert filter.filter_many([b"a", b"b", b"b", b"c"]) == [b"b", b"c"]  # type: ignore[attr-defined]
+    assert filter.cache.duplicates == 3  # type: ignore[attr-defined]
+
+
+def test_reject_duplicates_stores_digests_of_messages():
+    filter = reject_duplicates()
+    frames = [bytes(1000), bytes(2000), bytes(1000)]
+    assert filter.filter_many(frames) == frames[:2]  # type: ignore[attr-defined]
+    assert len(filter.cache) == 2  # type: ignore[attr-defined]
+    assert filter.cache.nbytes == 32  # type: ignore[attr-defined]
+
+    filter = reject_duplicates(key=bytes)
+    assert filter.filter_many([b"abc", b"abc"]) == [b"abc"]  # type: ignore[attr-defined]
+    assert filter.cache.nbytes == 3  # type: ignore[attr-defined]
+
+
+def test_reject_duplicates_with_key_function():
+    filter = reject_duplicates(key=lambda data: data[:1])
+    assert filter(b"1abc")
+    assert not filter(b"1def")
+    assert filter.filter_many([b"2x", b"1x", b"2y", b"3"]) == [b"2x", b"3"]  # type: ignore[attr-defined]
+
+
+def test_shared_cache_across_parsers():
+    cache = DeduplicationCache()
+    wrap = prefix_with_length(header_length=1)
+
+    first = create_length_prefixed_parser(
+        header_length=1, pre_filter=reject_duplicates(cache)
+    )
+    second = create_length_prefixed_parser(
+        header_length=1, pre_filter=reject_duplicates(cache), metrics=True
+    )
+
+    assert list(first(wrap(b"hello") + wrap(b"world"))) == [b"hello", b"world"]
+    assert list(second(wrap(b"world") + wrap(b"again") + wrap(b"hello"))) == [b"again"]
+    assert second.metrics.frames_dropped_by_pre_filter == 2  # type: ignore[attr-defined]
+    assert cache.duplicates == 2
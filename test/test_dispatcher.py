@@ -0,0 +1,165 @@
+from flockwave.parsers import DispatchError, Dispatcher, create_parser
+from flockwave.parsers.json import create_json_parser
+from flockwave.parsers.splitters import split_lines
+
+import pytest
+
+
+def msg(type, **kwds):
+    return {"body": {"type": type, **kwds}}
+
+
+def test_dispatcher_calls_handlers_by_type():
+    calls = []
+    dispatcher = Dispatcher()
+    dispatcher.on("A", lambda message: calls.append(("A", message)))
+
+    @dispatcher.on("B", batch=True)
+    def handle_b(messages):
+        calls.append(("B", messages))
+
+    assert handle_b is not None
+    assert "A" in dispatcher and "B" in dispatcher and "C" not in dispatcher
+    assert dispatcher.keys() == {"A", "B"}
+
+    messages = [msg("B", i=1), msg("A"), msg("C"), msg("B", i=2), [1, 2], {}]
+    assert dispatcher(messages) == [msg("C"), [1, 2], {}]
+    assert calls == [("A", msg("A")), ("B", [msg("B", i=1), msg("B", i=2)])]
+
+
+def test_dispatcher_default_handler():
+    unhandled = []
+    dispatcher = Dispatcher("method", default=unhandled.append)
+    dispatcher.on("ping", lambda message: None)
+
+    messages = [{"method": "ping"}, {"method": "pong"}, {"method": {"x": 1}}]
+    assert dispatcher.dispatch_many(messages) == []
+    assert unhandled == messages[1:]
+
+    assert dispatcher.dispatch({"method": "ping"})
+    assert dispatcher.dispatch({"method": "other"})
+
+
+def test_dispatcher_replaces_and_removes_handlers():
+    calls = []
+    dispatcher = Dispatcher(key=lambda message: message[0])
+    dispatcher.on("a", lambda message: calls.append(1))
+    dispatcher.on("a", lambda messages: calls.append(2), batch=True)
+
+    assert dispatcher(["abc"]) == []
+    assert calls == [2]
+
+    dispatcher.off("a")
+    dispatcher.off("b")
+    assert dispatcher(["abc"]) == ["abc"]
+    assert not dispatcher.dispatch("abc")
+
+    with pytest.raises(ValueError):
+        Dispatcher(key=())
+
+
+@pytest.mark.parametrize("metrics", [False, True])
+@pytest.mark.parametrize("batch", [False, True])
+def test_json_parser_with_dispatcher(batch, metrics):
+    batches = []
+    dispatcher = Dispatcher()
+    dispatcher.on("UAV-INF", batches.append, batch=True)
+
+    parser = create_json_parser(
+        "builtin", batch=batch, metrics=metrics, dispatcher=dispatcher
+    )
+
+    data = (
+        b'{"body":{"type":"UAV-INF","id":1}}\n'
+        b'{"body":{"type":"SYS-PING"}}\n'
+        b'{"body":{"type":"UAV-INF","id":2}}\n'
+    )
+    assert list(parser(data[:20])) == []
+    assert batches == []
+    assert list(parser(data[20:])) == [msg("SYS-PING")]
+    assert batches == [[msg("UAV-INF", id=1), msg("UAV-INF", id=2)]]
+
+
+def test_parser_with_dispatcher_function():
+    parser = create_parser(
+        splitter=split_lines,
+        decoder=bytes.upper,
+        dispatcher=lambda messages: messages[::-1],
+    )
+    assert list(parser(b"a\nb\n")) == [b"B", b"A"]
+
+
+def test_rpc_parser_with_dispatcher():
+    from tinyrpc.protocols.jsonrpc import JSONRPCProtocol
+
+    from flockwave.encoders.wrappers import prefix_with_length
+    from flockwave.parsers.rpc import create_rpc_parser, get_rpc_method
+
+    protocol = JSONRPCProtocol()
+    request = protocol.create_request(method="subtract", args=[42, 23])
+    response = request.respond(19)
+
+    handled = []
+    dispatcher = Dispatcher(get_rpc_method)
+    dispatcher.on("subtract", handled.append)
+
+    parser = create_rpc_parser(protocol=protocol, dispatcher=dispatcher)
+    wrap = prefix_with_length(header_length=2)
+    result = list(parser(wrap(request.serialize()) + wrap(response.serialize())))
+
+    assert [message.method for message in handled] == ["subtract"]
+    assert [message.result for message in result] == [19]
+
+
+@pytest.mark.parametrize("metrics", [False, True])
+def test_parser_survives_handler_exceptions(metrics):
+    handled = []
+    dispatcher = Dispatcher()
+
+    @dispatcher.on("A")
+    def handle(message):
+        if message["body"].get("fail"):
+            raise RuntimeError("handler failed")
+        handled.append(message)
+
+    parser = create_json_parser("builtin", metrics=metrics, dispatcher=dispatcher)
+
+    with pytest.raises(DispatchError, match="handler failed") as info:
+        parser(b'{"body":{"type":"A","fail":true}}\n')
+    assert isinstance(info.value.__cause__, RuntimeError)
+
+    assert list(parser(b'{"body":{"type":"A"}}\n{"body":{"type":"B"}}\n')) == [msg("B")]
+    assert handled == [msg("A")]
+
+
+def test_dispatcher_handles_whole_chunk_when_a_handler_fails():
+    handled = []
+    batches = []
+    dispatcher = Dispatcher(key=lambda message: message[:1])
+
+    @dispatcher.on(b"a")
+    def handle_a(message):
+        if message == b"a2":
+            raise ValueError("bad message")
+        handled.append(message)
+
+    @dispatcher.on(b"b", batch=True)
+    def handle_b(messages):
+        batches.append(messages)
+        raise KeyError("bad batch")
+
+    parser = create_parser(splitter=split_lines, dispatcher=dispatcher)
+
+    with pytest.raises(DispatchError) as info:
+        parser(b"a1\nb1\na2\nc1\na3\nb2\n")
+
+    error = info.value
+    assert handled == [b"a1", b"a3"]
+    assert batches == [[b"b1", b"b2"]]
+    assert error.unhandled == [b"c1"]
+    assert [type(ex) for ex in error.errors] == [ValueError, KeyError]
+    assert "2 message handlers failed" in str(error)
+
+    # The parser keeps working after the error
+    assert list(parser(b"a4\nc2\n")) == [b"c2"]
+    assert handled == [b"a1", b"a3", b"a4"]
@@ -0,0 +1,120 @@
+from flockwave.encoders import (
+    EncoderMetrics,
+    EncodingError,
+    create_encoder,
+    create_length_prefixed_encoder,
+    create_line_encoder,
+)
+
+import pytest
+
+
+def test_encoder_metrics():
+    metrics = EncoderMetrics()
+    encoder = create_line_encoder(encoder=str.encode, metrics=metrics)
+    assert encoder.metrics is metrics
+
+    assert b"foo\n" == encoder("foo")
+    assert b"\n" == encoder("")
+
+    with pytest.raises(TypeError):
+        encoder(42)
+
+    snapshot = metrics.snapshot()
+    assert snapshot["messages_encoded"] == 2
+    assert snapshot["bytes_encoded"] == 5
+    assert snapshot["encode_failures"] == 1
+    assert snapshot["encode_time_ns"] >= 0
+
+
+def test_encoder_without_metrics_has_no_metrics_attribute():
+    encoder = create_encoder()
+    assert not hasattr(encoder, "metrics")
+
+
+@pytest.mark.parametrize(
+    ("kwds", "messages"),
+    [
+        ({}, [b"foo", b"", b"bar"]),
+        ({"wrapper": lambda x: b"<" + x + b">"}, [b"foo", b"", b"bar"]),
+        ({"encoder": str.encode}, ["foo", "", "bar"]),
+        ({"encoder": str.encode, "metrics": True}, ["foo", "", "bar"]),
+    ],
+)
+def test_encode_many(kwds, messages):
+    encoder = create_encoder(**kwds)
+    expected = b"".join(encoder(message) for message in messages)
+    assert expected == encoder.encode_many(messages)
+    assert b"" == encoder.encode_many([])
+
+
+def test_line_encoder_encode_many():
+    encoder = create_line_encoder(encoder=str.encode)
+    assert b"foo\n\nbar\n" == encoder.encode_many(["foo", "", "bar"])
+    assert b"" == encoder.encode_many([])
+
+
+@pytest.mark.parametrize("header_length", [1, 2, 3, 4, 5])
+@pytest.mark.parametrize("endianness", ["big", "little"])
+def test_length_prefixed_encoder_encode_many(header_length, endianness):
+    encoder = create_length_prefixed_encoder(
+        header_length=header_length, endianness=endianness
+    )
+    messages = [b"foo", b"", b"x" * 200]
+    expected = b"".join(encoder(message) for message in messages)
+    assert expected == encoder.encode_many(messages)
+    assert expected == encoder.encode_many(iter(messages))
+
+
+def test_length_prefixed_encoder_encode_many_checks_length():
+    encoder = create_length_prefixed_encoder(max_length=3)
+    with pytest.raises(EncodingError, match="exceeds limit"):
+        encoder.encode_many([b"foo", b"spam"])
+
+
+def test_encode_many_updates_metrics():
+    encoder = create_line_encoder(metrics=True)
+    encoder.encode_many([b"foo", b"bar"])
+    assert encoder.metrics.messages_encoded == 2
+    assert encoder.metrics.bytes_encoded == 8
+
+
+@pytest.mark.parametrize(
+    ("encoder", "expected"),
+    [
+        (create_encoder(), (b"", b"foo", b"")),
+        (create_line_encoder(), (b"", b"foo", b"\n")),
+        (create_length_prefixed_encoder(header_length=2), (b"\x00\x03", b"foo", b"")),
+        (
+            create_length_prefixed_encoder(header_length=3, endianness="little"),
+            (b"\x03\x00\x00", b"foo", b""),
+        ),
+        (create_encoder(wrapper=lambda x: b"<" + x + b">"), (b"", b"<foo>", b"")),
+    ],
+)
+def test_encode_parts(encoder, expected):
+    assert expected == encoder.encode_parts(b"foo")
+    assert b"".join(expected) == encoder(b"foo")
+
+
+def test_encode_parts_does_not_copy_payload():
+    encoder = create_length_prefixed_encoder(header_length=4)
+    payload = memoryview(bytearray(b"spam" * 1000))
+    header, body, trailer = encoder.encode_parts(payload)
+    assert header == b"\x00\x00\x0f\xa0"
+    assert body is payload
+    assert trailer == b""
+
+
+def test_encode_many_parts():
+    encoder = create_line_encoder(encoder=str.encode, metrics=True)
+    parts = encoder.encode_many_parts(["foo", "", "bar"])
+    assert [b"foo", b"\n", b"\n", b"bar", b"\n"] == parts
+    assert encoder.metrics.messages_encoded == 3
+    assert encoder.metrics.bytes_encoded == 9
+
+
+def test_encode_parts_checks_length():
+    encoder = create_length_prefixed_encoder(max_length=3)
+    with pytest.raises(EncodingError, match="exceeds limit"):
+        encoder.encode_parts(b"spam")
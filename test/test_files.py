@@ -0,0 +1,86 @@
+from flockwave.encoders import create_length_prefixed_encoder
+from flockwave.parsers import ParseError, iter_file_frames, parse_file
+from flockwave.parsers.splitters import split_lines, split_using_length_prefix
+from json import loads
+
+import pytest
+
+
+@pytest.fixture
+def line_file(tmp_path):
+    path = tmp_path / "lines.jsonl"
+    path.write_bytes(b"".join(b'{"id": %d}\n' % i for i in range(100)) + b"\n\r\n")
+    return path
+
+
+@pytest.fixture
+def length_prefixed_file(tmp_path):
+    encoder = create_length_prefixed_encoder(header_length=2)
+    path = tmp_path / "frames.bin"
+    path.write_bytes(encoder.encode_many([b"x" * i for i in range(100)]))
+    return path
+
+
+def _flatten(batches):
+    return [item for batch in batches for item in batch]
+
+
+@pytest.mark.parametrize("window_size", [1, 7, 4096, 1 << 20])
+def test_iter_line_file_frames(line_file, window_size):
+    frames = _flatten(iter_file_frames(line_file, window_size=window_size))
+    expected = [b'{"id": %d}' % i for i in range(100)] + [b"", b"", b""]
+    assert expected == frames
+
+
+@pytest.mark.parametrize("window_size", [1, 7, 4096, 1 << 20])
+def test_iter_length_prefixed_file_frames(length_prefixed_file, window_size):
+    frames = _flatten(
+        iter_file_frames(
+            length_prefixed_file,
+            split_using_length_prefix(header_length=2),
+            window_size=window_size,
+        )
+    )
+    assert [b"x" * i for i in range(100)] == frames
+
+
+def test_iter_file_frames_enforces_max_length(length_prefixed_file):
+    with pytest.raises(ParseError, match="exceeds limit"):
+        _flatten(
+            iter_file_frames(
+                length_prefixed_file,
+                split_using_length_prefix(header_length=2, max_length=50),
+            )
+        )
+
+
+def test_iter_file_frames_reports_incomplete_message(tmp_path):
+    path = tmp_path / "truncated.txt"
+    path.write_bytes(b"abc\ndef")
+
+    with pytest.raises(ParseError, match="3 bytes pending"):
+        _flatten(iter_file_frames(path))
+
+    frames = _flatten(iter_file_frames(path, strict=False))
+    assert [b"abc"] == frames
+
+
+def test_iter_empty_file(tmp_path):
+    path = tmp_path / "empty.txt"
+    path.write_bytes(b"")
+    assert [] == list(iter_file_frames(path))
+
+
+def test_parse_file(line_file):
+    batches = list(
+        parse_file(
+            line_file,
+            split_lines,
+            window_size=256,
+            decoder=loads,
+            pre_filter=bool,
+            post_filter=lambda message: message["id"] % 2 == 0,
+        )
+    )
+    assert len(batches) > 1
+    assert [{"id": i} for i in range(0, 100, 2)] == _flatten(batches)
@@ -0,0 +1,148 @@
+from flockwave.encoders import create_length_prefixed_encoder
+from flockwave.parsers import FrameIndex, IndexedRecording, ParseError
+from json import dumps, loads
+
+import pytest
+
+
+@pytest.fixture
+def encoder():
+    return create_length_prefixed_encoder(header_length=2)
+
+
+@pytest.fixture
+def recording(tmp_path, encoder):
+    path = tmp_path / "capture.bin"
+    path.write_bytes(encoder.encode_many(dumps({"id": i}).encode() for i in range(100)))
+    return path
+
+
+def test_build_index(recording):
+    with IndexedRecording(recording, header_length=2) as rec:
+        assert len(rec) == 100
+        assert rec.index.size == recording.stat().st_size
+        assert rec[0] == b'{"id": 0}'
+        assert rec[-1] == b'{"id": 99}'
+        assert rec[10:13] == [b'{"id": 10}', b'{"id": 11}', b'{"id": 12}']
+        assert rec[0:6:2] == [b'{"id": 0}', b'{"id": 2}', b'{"id": 4}']
+        assert rec.frames(98) == [b'{"id": 98}', b'{"id": 99}']
+
+    assert (recording.parent / "capture.bin.idx").exists()
+
+
+def test_parse_range(recording):
+    with IndexedRecording(recording, header_length=2) as rec:
+        messages = rec.parse(
+            20, 25, decoder=loads, post_filter=lambda msg: msg["id"] % 2 == 0
+        )
+    assert messages == [{"id": 20}, {"id": 22}, {"id": 24}]
+
+
+def test_sidecar_is_reused(recording, monkeypatch):
+    with IndexedRecording(recording, header_length=2):
+        pass
+
+    scanned = []
+    update = FrameIndex.update
+
+    def spy(self, data):
+        scanned.append(self.size)
+        return update(self, data)
+
+    monkeypatch.setattr(FrameIndex, "update", spy)
+    with IndexedRecording(recording, header_length=2) as rec:
+        assert len(rec) == 100
+
+    # The second instance started scanning at the end of the recording
+    assert scanned == [recording.stat().st_size]
+
+
+def test_incremental_update(recording, encoder):
+    with IndexedRecording(recording, header_length=2) as rec:
+        size = rec.index.size
+
+        # Append one complete and one incomplete frame
+        extra = encoder(b"appended") + encoder(b"partial")[:-2]
+        with recording.open("ab") as fp:
+            fp.write(extra)
+
+        assert rec.refresh() == 1
+        assert len(rec) == 101
+        assert rec[100] == b"appended"
+        assert rec.index.size == size + 10
+
+        # Complete the last frame
+        with recording.open("ab") as fp:
+            fp.write(b"al")
+
+        assert rec.refresh() == 1
+        assert rec[-1] == b"partial"
+
+    # A new instance picks up the saved index
+    index = FrameIndex.load(str(recording) + ".idx")
+    assert len(index) == 102
+    assert index.header_length == 2
+    assert index.endianness == "big"
+
+
+def test_rebuild_after_rewrite(recording, encoder):
+    with IndexedRecording(recording, header_length=2):
+        pass
+
+    recording.write_bytes(encoder.encode_many([b"a", b"bc"]))
+    with IndexedRecording(recording, header_length=2) as rec:
+        assert rec[:] == [b"a", b"bc"]
+
+
+def test_rebuild_with_different_framing(recording, tmp_path):
+    with IndexedRecording(recording, header_length=2):
+        pass
+
+    encoder = create_length_prefixed_encoder(header_length=1)
+    recording.write_bytes(encoder.encode_many([b"a", b"bc"]))
+    with IndexedRecording(recording, header_length=1) as rec:
+        assert rec[:] == [b"a", b"bc"]
+
+
+def test_custom_index_path(recording, tmp_path):
+    index_path = tmp_path / "sidecar"
+    with IndexedRecording(recording, header_length=2, index_path=index_path):
+        pass
+
+    assert index_path.exists()
+    assert not (tmp_path / "capture.bin.idx").exists()
+
+
+def test_corrupted_sidecar(recording):
+    (recording.parent / "capture.bin.idx").write_bytes(b"garbage")
+    with IndexedRecording(recording, header_length=2) as rec:
+        assert len(rec) == 100
+
+
+def test_empty_recording(tmp_path):
+    path = tmp_path / "empty.bin"
+    path.write_bytes(b"")
+    with IndexedRecording(path, header_length=2) as rec:
+        assert len(rec) == 0
+        assert rec.frames() == []
+
+
+@pytest.mark.parametrize("endianness", ["big", "little"])
+@pytest.mark.parametrize("header_length", [1, 2, 3, 4])
+def test_header_formats(tmp_path, header_length, endianness):
+    encoder = create_length_prefixed_encoder(
+        header_length=header_length, endianness=endianness
+    )
+    frames = [b"x" * i for i in range(50)]
+    path = tmp_path / "frames.bin"
+    path.write_bytes(encoder.encode_many(frames))
+
+    with IndexedRecording(
+        path, header_length=header_length, endianness=endianness
+    ) as rec:
+        assert rec[:] == frames
+
+
+def test_max_length(recording):
+    with pytest.raises(ParseError, match="exceeds limit .* at offset 0"):
+        IndexedRecording(recording, header_length=2, max_length=5)
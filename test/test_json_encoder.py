@@ -1,6 +1,10 @@
 from dataclasses import dataclass
 from json import JSONEncoder
-from flockwave.encoders.json import create_json_encoder, object_to_jsonable
+from flockwave.encoders.json import (
+    create_json_encoder,
+    create_json_template_encoder,
+    object_to_jsonable,
+)
 
 import datetime
 import pytest
@@ -93,3 +97,57 @@ def test_json_encoding_custom_encoder_func(message):
     )
     observed = encoder(message)
     assert b"[" + repr(message).encode("utf-8") + b"]" == observed
+
+
+@pytest.mark.parametrize("encoder", [None, "builtin"])
+def test_json_template_encoder(encoder):
+    template = {
+        "$fw.version": "1.0",
+        "id": None,
+        "body": {"type": "UAV-INF", "status": [{"uav": "01", "time": 0}]},
+    }
+    fields = [("body", "status", 0, "time"), "id", "extra"]
+
+    encode = create_json_template_encoder(template, fields, encoder)
+    full_encoder = create_json_encoder(encoder)
+
+    for values in [
+        (1234, "abc", None),
+        (1.5, 'with "quotes"\nand newline', {"x": [1, 2]}),
+        (datetime.datetime(2024, 1, 2), 7, True),
+    ]:
+        message = {
+            "$fw.version": "1.0",
+            "id": values[1],
+            "body": {"type": "UAV-INF", "status": [{"uav": "01", "time": values[0]}]},
+            "extra": values[2],
+        }
+        assert encode(*values) == full_encoder(message)
+
+    # Template is not modified
+    assert "extra" not in template
+    assert template["id"] is None
+
+    with pytest.raises(TypeError):
+        encode(1, 2)
+
+
+def test_json_template_encoder_errors():
+    with pytest.raises(ValueError, match="no such field"):
+        create_json_template_encoder({"a": 1}, [("b", "c")])
+
+    with pytest.raises(ValueError, match="must not be empty"):
+        create_json_template_encoder({"a": 1}, [()])
+
+    # The field is encoded in a way that does not preserve the placeholder
+    with pytest.raises(ValueError, match="cannot find field"):
+        create_json_template_encoder(
+            {"a": 1}, ["a"], lambda obj: b"<str>" if isinstance(obj, str) else b"{}"
+        )
+
+
+def test_json_template_encoder_with_custom_wrapper():
+    encode = create_json_template_encoder(
+        [0, 1], [(1,)], "builtin", wrapper=lambda data: b"<" + data + b">"
+    )
+    assert encode("x") == b'<[0,"x"]>'
@@ -1,4 +1,8 @@
-from flockwave.parsers.json import create_json_parser
+from flockwave.parsers.json import (
+    create_json_parser,
+    filter_json_types,
+    peek_json_key,
+)
 
 import pytest
 
@@ -62,3 +66,159 @@ def test_json_encoding_custom_decoder_func(data, expected):
         result.extend(parser(part))
 
     assert expected == result
+
+
+@pytest.mark.parametrize("decoder", [None, "builtin"])
+@pytest.mark.parametrize(
+    ("data", "expected"),
+    [
+        ([b""], []),
+        ([b"[123", b', false, "fo', b'obar"]\n'], [[123, False, "foobar"]]),
+        ([b'{"a": 1}\n{"b": 2}\n\n[3]\n'], [{"a": 1}, {"b": 2}, [3]]),
+        ([b"[1\n", b"2]\n"], ValueError),
+        ([b"1, 2\n3\n"], ValueError),
+        ([b"[1\n2]\n3,4\n"], ValueError),
+        ([b'{"a": [1\n2]}\n{"b": 3}\n'], ValueError),
+        ([b"1\n2\n"], [1, 2]),
+        ([b"[1],[2]\n[[3]\n[4]]\n"], ValueError),
+    ],
+)
+def test_json_parser_batch_mode(decoder, data, expected):
+    parser = create_json_parser(decoder, batch=True)
+
+    if isinstance(expected, type):
+        with pytest.raises(expected):
+            for part in data:
+                parser(part)
+    else:
+        result = []
+        for part in data:
+            result.extend(parser(part))
+
+        assert expected == result
+
+
+def test_json_parser_batch_mode_with_custom_decoder():
+    parser = create_json_parser(bytes.upper, batch=True)
+    assert list(parser(b"a\nb\n")) == [b"A", b"B"]
+
+
+def _counting_decoder():
+    from json import loads
+
+    def decode(data):
+        decode.calls += 1
+        return loads(data)
+
+    decode.calls = 0
+    return decode
+
+
+@pytest.mark.parametrize(
+    ("data", "expected", "decoded"),
+    [
+        (b'{"id":"1","body":{"type":"UAV-INF"}}', "UAV-INF", False),
+        (b'{"body": {"type" :  "SYS-PING", "x": 1}}', "SYS-PING", False),
+        (b'{"body":{"status":{}}}', None, False),
+        (b"", None, False),
+        # Key occurs more than once
+        (b'{"body":{"type":"A","x":{"type":"B"}}}', "A", True),
+        # Key is not followed by a colon
+        (b'{"body":{"kind":"type"}}', None, True),
+        # Value is not a string
+        (b'{"body":{"type":5}}', 5, True),
+        # Escape sequences may hide the key or appear in the value
+        (b'{"body":{"\\u0074ype":"A"}}', "A", True),
+        (b'{"body":{"type":"A\\"B"}}', 'A"B', True),
+        (b'{"body":[1,2]}', None, False),
+    ],
+)
+def test_peek_json_key(data, expected, decoded):
+    decoder = _counting_decoder()
+    peek = peek_json_key(decoder=decoder)
+
+    assert peek(data) == expected
+    assert decoder.calls == (1 if decoded else 0)
+
+
+def test_peek_json_key_with_top_level_key():
+    decoder = _counting_decoder()
+    peek = peek_json_key("method", decoder=decoder)
+    assert peek(b'{"method":"ping","params":[]}') == "ping"
+    assert peek(b'{"params":{"x":"}"},"method":"ping"}') == "ping"
+    assert decoder.calls == 0
+
+    assert peek(b'[{"method":"ping"}, {"method":"pong"}]') is None
+    assert peek(b'{"jsonrpc":"2.0","id":1,"result":{"method":"ping"}}') is None
+    assert peek(b'[{"method":"ping"}]') is None
+
+    with pytest.raises(ValueError):
+        peek_json_key(())
+
+
+def test_peek_json_key_with_nested_custom_key():
+    decoder = _counting_decoder()
+    peek = peek_json_key(("result", "method"), decoder=decoder)
+    assert peek(b'{"result":{"method":"ping"}}') == "ping"
+    assert peek(b'{"params":{"method":"ping"}}') is None
+    assert peek(b'{"id":1}') is None
+    assert decoder.calls == 2
+
+    with pytest.raises(ValueError):
+        peek_json_key(())
+
+
+def test_filter_json_types():
+    decoder = _counting_decoder()
+    filter = filter_json_types(["UAV-INF"], decoder=decoder)
+
+    assert filter(b'{"body":{"type":"UAV-INF"}}')
+    assert not filter(b'{"body":{"type":"SYS-PING"}}')
+    assert not filter(b"")
+    assert not filter(b'{"body":{"type":{"a":1},"x":{"type":2}}}')
+    assert decoder.calls == 1
+
+    # Malformed messages are let through to the decoder
+    assert filter(b'{"body":{"type":"A","type":')
+
+    frames = [b'{"body":{"type":"UAV-INF"}}', b'{"body":{"type":"X"}}', b""]
+    assert filter.filter_many(frames) == frames[:1]  # type: ignore[attr-defined]
+
+    filter = filter_json_types(["UAV-INF"], exclude=True)
+    assert filter.filter_many(frames) == frames[1:2]  # type: ignore[attr-defined]
+
+
+@pytest.mark.parametrize("batch", [False, True])
+@pytest.mark.parametrize("decoder", [None, "builtin"])
+def test_json_parser_with_types(decoder, batch):
+    data = (
+        b'{"body":{"type":"SYS-PING"}}\n'
+        b'{"body":{"type":"UAV-INF","id":1}}\n'
+        b"\n"
+        b'{"body":{"type":"X-HEARTBEAT"}}\n'
+    )
+
+    parser = create_json_parser(decoder, batch=batch, types=["UAV-INF", "SYS-PING"])
+    assert list(parser(data)) == [
+        {"body": {"type": "SYS-PING"}},
+        {"body": {"type": "UAV-INF", "id": 1}},
+    ]
+
+    parser = create_json_parser(
+        decoder, batch=batch, exclude_types=["X-HEARTBEAT"], metrics=True
+    )
+    assert list(parser(data)) == [
+        {"body": {"type": "SYS-PING"}},
+        {"body": {"type": "UAV-INF", "id": 1}},
+    ]
+    assert parser.metrics.frames_dropped_by_pre_filter == 2  # type: ignore[attr-defined]
+
+
+def test_json_parser_with_custom_type_key():
+    parser = create_json_parser(types=["ping"], type_key="method")
+    assert list(parser(b'{"method":"ping"}\n{"method":"pong"}\n')) == [
+        {"method": "ping"}
+    ]
+
+    with pytest.raises(ValueError, match="mutually exclusive"):
+        create_json_parser(types=["a"], exclude_types=["b"])
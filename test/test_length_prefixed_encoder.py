@@ -1,4 +1,4 @@
-from flockwave.encoders import create_length_prefixed_encoder
+from flockwave.encoders import EncodingError, create_length_prefixed_encoder
 
 import pytest
 
@@ -31,3 +31,29 @@ def test_length_prefixed_encoder_with_header_length(
         header_length=header_length, endianness=endianness
     )
     assert expected == encoder(data)
+
+
+@pytest.mark.parametrize(
+    ("length", "header"),
+    [
+        (0, b"\x00"),
+        (1, b"\x01"),
+        (127, b"\x7f"),
+        (128, b"\x80\x01"),
+        (300, b"\xac\x02"),
+        (16383, b"\xff\x7f"),
+        (16384, b"\x80\x80\x01"),
+    ],
+)
+def test_length_prefixed_encoder_with_varint_header(length, header):
+    encoder = create_length_prefixed_encoder(header_length="varint")
+    data = b"x" * length
+    assert header + data == encoder(data)
+    assert header + data + b"\x00" == encoder.encode_many([data, b""])
+
+
+def test_length_prefixed_encoder_with_varint_header_checks_length():
+    encoder = create_length_prefixed_encoder(header_length="varint", max_length=200)
+    encoder(b"x" * 200)
+    with pytest.raises(EncodingError):
+        encoder(b"x" * 201)
@@ -89,3 +89,111 @@ def test_parser_resets_after_parse_error():
 def test_fails_if_no_length_and_no_header_size():
     with pytest.raises(ValueError, match="at least one of"):
         create_length_prefixed_parser()
+
+
+@pytest.mark.parametrize(
+    ("header_length", "endianness", "data", "expected"),
+    [
+        (3, "big", [b"\x00\x00\x03foo\x00\x01\x00"], [b"foo"]),
+        (3, "little", [b"\x03\x00\x00foo\x00\x01\x00"], [b"foo"]),
+        (4, "big", [b"\x00\x00", b"\x00\x02x", b"y\x00"], [b"xy"]),
+        (4, "little", [b"\x02\x00", b"\x00\x00x", b"y\x00"], [b"xy"]),
+        (3, "big", [b"\x00\x01\x02" + bytes(258)], [bytes(258)]),
+        (3, "little", [b"\x02\x01\x00" + bytes(258)], [bytes(258)]),
+    ],
+)
+def test_parser_with_long_header(header_length, endianness, data, expected):
+    parser = create_length_prefixed_parser(
+        header_length=header_length, endianness=endianness
+    )
+
+    result = []
+    for part in data:
+        result.extend(parser(part))
+
+    assert expected == result
+
+
+@pytest.mark.parametrize("chunk_size", [1, 2, 3, 5, 7, 64])
+def test_parser_with_misaligned_chunks(chunk_size):
+    messages = [b"abcde", b"", b"f", bytes(range(40)), b"ghij"]
+    data = b"".join(len(message).to_bytes(2, "big") + message for message in messages)
+
+    parser = create_length_prefixed_parser(header_length=2)
+    result = []
+    for start in range(0, len(data), chunk_size):
+        result.extend(parser(data[start : start + chunk_size]))
+
+    assert messages == result
+
+
+def test_parser_checks_max_length_of_header_split_across_chunks():
+    parser = create_length_prefixed_parser(header_length=2, max_length=4)
+    assert [b"ab"] == parser(b"\x00\x02ab\x00")
+    with pytest.raises(ParseError, match="packet length exceeds limit"):
+        parser(b"\x05abcde")
+
+
+def test_parser_accepts_reused_memoryviews():
+    parser = create_length_prefixed_parser(header_length=1)
+    buffer = bytearray(b"\x03abc\x04de")
+
+    with memoryview(buffer) as view:
+        assert [b"abc"] == parser(view)
+
+    buffer[:] = b"fg\x01h"
+    with memoryview(buffer) as view:
+        assert [b"defg", b"h"] == parser(view)
+
+
+@pytest.mark.parametrize(
+    ("data", "expected"),
+    [
+        ([b"\x03foo\x00\x01x"], [b"foo", b"", b"x"]),
+        ([b"\x80\x01" + bytes(128)], [bytes(128)]),
+        ([b"\xac\x02" + bytes(300) + b"\x01y"], [bytes(300), b"y"]),
+        # Varint split across chunks
+        ([b"\xac", b"\x02" + bytes(299), b"\x00\x01", b"y"], [bytes(300), b"y"]),
+        ([b"\x80", b"\x80", b"\x01", bytes(16384)], [bytes(16384)]),
+        # Non-minimal encodings are accepted
+        ([b"\x83\x00abc"], [b"abc"]),
+    ],
+)
+def test_parser_with_varint_header(data, expected):
+    parser = create_length_prefixed_parser(header_length="varint", metrics=True)
+
+    result = []
+    for part in data:
+        result.extend(parser(part))
+
+    assert expected == result
+    assert parser.metrics.buffered_bytes == 0
+
+
+def test_parser_with_varint_header_reports_pending_bytes():
+    parser = create_length_prefixed_parser(header_length="varint", metrics=True)
+    parser(b"\xac")
+    assert parser.metrics.buffered_bytes == 1
+    parser(b"\x02abc")
+    assert parser.metrics.buffered_bytes == 5
+
+
+@pytest.mark.parametrize(
+    "data",
+    [
+        b"\x81\x01",
+        # Rejected as soon as the decoded part of the header exceeds the
+        # limit, without waiting for the rest of the header
+        b"\xff\x81",
+    ],
+)
+def test_parser_with_varint_header_checks_max_length(data):
+    parser = create_length_prefixed_parser(header_length="varint", max_length=128)
+    with pytest.raises(ParseError, match="exceeds limit"):
+        parser(data)
+
+
+def test_parser_with_varint_header_rejects_overlong_header():
+    parser = create_length_prefixed_parser(header_length="varint")
+    with pytest.raises(ParseError, match="too long"):
+        parser(b"\x80" * 10)
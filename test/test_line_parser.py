@@ -24,3 +24,34 @@ def test_line_parser_with_min_length(data, expected):
         result.extend(parser(part))
 
     assert expected == result
+
+
+def _split_lines_reference(chunks):
+    data = b"".join(chunks).replace(b"\r", b"\n")
+    return data.split(b"\n")[:-1]
+
+
+@pytest.mark.parametrize("chunk_size", [1, 2, 3, 7, 64])
+def test_line_parser_matches_reference_for_any_chunking(chunk_size):
+    data = b"abc\n\ndef\r\nghi\rjklmno\n\r\n" * 5 + b"pqr"
+    chunks = [data[i : i + chunk_size] for i in range(0, len(data), chunk_size)]
+
+    parser = create_line_parser()
+
+    result = []
+    for chunk in chunks:
+        result.extend(parser(chunk))
+
+    assert _split_lines_reference(chunks) == result
+
+
+def test_line_parser_accepts_memoryviews():
+    parser = create_line_parser()
+    buffer = bytearray(b"abc\nde")
+
+    with memoryview(buffer) as view:
+        assert [b"abc"] == parser(view)
+
+    buffer[:] = b"f\n"
+    with memoryview(buffer) as view:
+        assert [b"def"] == parser(view)
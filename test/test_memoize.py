@@ -0,0 +1,140 @@
+from concurrent.futures import ThreadPoolExecutor
+from json import loads
+from time import sleep
+
+from flockwave.parsers import create_line_parser
+from flockwave.parsers.memoize import DecoderCache, memoize_decoder
+
+import pytest
+
+
+def counting_decoder():
+    def decode(data):
+        decode.calls += 1
+        return loads(data)
+
+    decode.calls = 0
+    return decode
+
+
+def test_memoize_decoder():
+    decoder = counting_decoder()
+    decode = memoize_decoder(decoder)
+    cache = decode.cache  # type: ignore[attr-defined]
+
+    assert cache.hit_rate is None
+
+    first = decode(b'{"a": [1]}')
+    assert decode(b'{"a": [1]}') is first
+    assert decode(b'{"b": 2}') == {"b": 2}
+    assert decoder.calls == 2
+
+    assert cache.snapshot() == {
+        "entries": 2,
+        "evictions": 0,
+        "hit_rate": 1 / 3,
+        "hits": 1,
+        "misses": 2,
+        "nbytes": 18,
+    }
+
+    cache.reset()
+    assert len(cache) == 0
+    assert cache.hits == 0
+    assert cache.nbytes == 0
+
+
+@pytest.mark.parametrize("copy", ["shallow", "deep", lambda value: dict(value)])
+def test_memoize_decoder_copy_policies(copy):
+    decode = memoize_decoder(loads, copy=copy)
+
+    first = decode(b'{"a": [1]}')
+    second = decode(b'{"a": [1]}')
+    assert first == second
+    assert first is not second
+
+    second["b"] = 2
+    assert decode(b'{"a": [1]}') == {"a": [1]}
+
+    if copy == "deep":
+        second["a"].append(2)
+        assert decode(b'{"a": [1]}') == {"a": [1]}
+
+
+def test_memoize_decoder_evicts_least_recently_used_messages():
+    decoder = counting_decoder()
+    decode = memoize_decoder(decoder, max_entries=2, max_bytes=4)
+    cache = decode.cache  # type: ignore[attr-defined]
+
+    decode(b"1")
+    decode(b"2")
+    decode(b"1")
+    decode(b"3")  # evicts 2
+    assert cache.evictions == 1
+    assert decoder.calls == 3
+
+    decode(b"1")
+    assert decoder.calls == 3
+    decode(b"2")
+    assert decoder.calls == 4
+
+    # Limit on the total number of bytes
+    decode(b"123")
+    assert len(cache) == 2
+    assert cache.nbytes == 4
+
+    # Messages longer than the limit are never cached
+    decode(b"12345")
+    decode(b"12345")
+    assert decoder.calls == 7
+    assert len(cache) == 2
+
+
+def test_memoize_decoder_edge_cases():
+    decode = memoize_decoder(loads)
+
+    assert decode(bytearray(b"[1]")) == [1]
+    assert len(decode.cache) == 0  # type: ignore[attr-defined]
+
+    with pytest.raises(ValueError):
+        decode(b"[1")
+    assert len(decode.cache) == 0  # type: ignore[attr-defined]
+
+    with pytest.raises(ValueError, match="copy policy"):
+        memoize_decoder(loads, copy="foo")  # type: ignore[arg-type]
+
+    with pytest.raises(ValueError):
+        DecoderCache(max_entries=0)
+
+    with pytest.raises(ValueError):
+        DecoderCache(max_bytes=0)
+
+
+def test_parser_with_memoized_decoder():
+    decode = memoize_decoder(loads)
+    parser = create_line_parser(decoder=decode)
+
+    assert list(parser(b"[1]\n[1]\n[2]\n[1]\n")) == [[1], [1], [2], [1]]
+    assert decode.cache.hits == 2  # type: ignore[attr-defined]
+
+
+def test_memoize_decoder_from_multiple_threads():
+    def slow_loads(data):
+        # Give other threads a chance to decode the same message meanwhile
+        sleep(0.0001)
+        return loads(data)
+
+    decode = memoize_decoder(slow_loads, max_entries=4, max_bytes=32)
+    cache = decode.cache  # type: ignore[attr-defined]
+    # Each message is sent four times in a row so the threads miss it together
+    keys = [b" " * (i % 5) + str(i).encode("ascii") for i in range(12)]
+    data = [keys[i // 4 % 12] for i in range(1000)]
+
+    with ThreadPoolExecutor(max_workers=4) as executor:
+        results = list(executor.map(decode, data))
+
+    assert results == [loads(item) for item in data]
+    assert len(cache) <= 4
+    assert cache.nbytes == sum(len(key) for key in cache._entries)
+    assert cache.nbytes <= 32
+    assert cache.hits + cache.misses == len(data)
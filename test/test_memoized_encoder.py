@@ -0,0 +1,82 @@
+from flockwave.encoders import create_length_prefixed_encoder
+from flockwave.encoders.json import create_json_encoder
+from flockwave.encoders.memoize import EncoderCache, memoize_encoder
+
+import pytest
+
+
+def counting_encoder(encoder):
+    def encode(message):
+        encode.calls += 1
+        return encoder(message)
+
+    encode.calls = 0
+    return encode
+
+
+def test_memoize_encoder_by_identity():
+    encoder = counting_encoder(create_json_encoder("builtin"))
+    encode = memoize_encoder(encoder)
+    cache = encode.cache  # type: ignore[attr-defined]
+
+    message = {"a": 1}
+    assert encode(message) == b'{"a":1}\n'
+    assert encode(message) == b'{"a":1}\n'
+    assert encoder.calls == 1
+
+    # Equal but different objects are encoded again
+    assert encode({"a": 1}) == b'{"a":1}\n'
+    assert encoder.calls == 2
+
+    assert cache.snapshot() == {
+        "entries": 2,
+        "evictions": 0,
+        "hit_rate": 1 / 3,
+        "hits": 1,
+        "misses": 2,
+    }
+
+
+def test_memoize_encoder_by_key():
+    encoder = counting_encoder(create_length_prefixed_encoder(header_length=1))
+    encode = memoize_encoder(encoder, key=bytes, max_entries=2)
+    cache = encode.cache  # type: ignore[attr-defined]
+
+    assert encode(b"ab") == b"\x02ab"
+    assert encode(bytearray(b"ab")) == b"\x02ab"
+    assert encode(b"c") == b"\x01c"
+    assert encode(b"ab") == b"\x02ab"
+    assert encode(b"d") == b"\x01d"  # evicts "c"
+    assert encoder.calls == 3
+    assert cache.evictions == 1
+
+    assert encode(b"c") == b"\x01c"
+    assert encoder.calls == 4
+
+    cache.reset()
+    assert len(cache) == 0
+    assert cache.hit_rate is None
+
+
+def test_memoize_encoder_identity_eviction():
+    encode = memoize_encoder(create_json_encoder("builtin"), max_entries=1)
+    first, second = [1], [2]
+
+    encode(first)
+    encode(second)
+    assert encode(first) == b"[1]\n"
+    assert encode.cache.evictions == 2  # type: ignore[attr-defined]
+
+
+def test_memoize_encoder_batch_variants():
+    encode = memoize_encoder(create_length_prefixed_encoder(header_length=1))
+    messages = [b"a", b"bc", b"a"]
+
+    assert encode.encode_many(messages) == b"\x01a\x02bc\x01a"  # type: ignore[attr-defined]
+    assert encode.encode_parts(b"a") == (b"", b"\x01a", b"")  # type: ignore[attr-defined]
+    assert encode.encode_many_parts(messages) == [b"\x01a", b"\x02bc", b"\x01a"]  # type: ignore[attr-defined]
+
+
+def test_encoder_cache_checks_arguments():
+    with pytest.raises(ValueError):
+        EncoderCache(0)
@@ -0,0 +1,43 @@
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
+from flockwave.parsers import create_parallel_parser
+from flockwave.parsers.splitters import split_lines
+
+import pytest
+
+
+@pytest.fixture(params=["thread", "process"])
+def executor(request):
+    if request.param == "thread":
+        executor = ThreadPoolExecutor(max_workers=4)
+    else:
+        executor = ProcessPoolExecutor(max_workers=2)
+
+    with executor:
+        yield executor
+
+
+@pytest.mark.parametrize("batch_size", [1, 3, 100])
+@pytest.mark.parametrize("max_in_flight", [None, 1, 2])
+def test_parallel_parser_preserves_order(executor, batch_size, max_in_flight):
+    parser = create_parallel_parser(
+        decoder=int,
+        executor=executor,
+        batch_size=batch_size,
+        max_in_flight=max_in_flight,
+        splitter=split_lines,
+        pre_filter=lambda frame: frame != b"0",
+        post_filter=lambda message: message % 3 != 0,
+    )
+
+    data = b"\n".join(str(i).encode("ascii") for i in range(50)) + b"\n"
+    expected = [i for i in range(1, 50) if i % 3 != 0]
+
+    assert expected == parser(data)
+
+
+def test_parallel_parser_propagates_decoder_errors(executor):
+    parser = create_parallel_parser(
+        decoder=int, executor=executor, batch_size=1, splitter=split_lines
+    )
+    with pytest.raises(ValueError):
+        parser(b"1\n2\nspam\n4\n")
@@ -0,0 +1,69 @@
+from flockwave.parsers import create_line_parser, create_parser
+from flockwave.parsers.splitters import BufferedSplitter, split_lines
+
+import pytest
+
+
+def test_batch_decoder_receives_all_messages_of_a_chunk():
+    batches = []
+
+    def decode_batch(frames):
+        batches.append(list(frames))
+        return [int(frame) for frame in frames]
+
+    parser = create_line_parser(
+        batch_decoder=decode_batch,
+        pre_filter=lambda frame: frame != b"0",
+        post_filter=lambda message: message % 2 == 0,
+    )
+
+    assert [2, 4] == parser(b"1\n2\n0\n3\n4\n5")
+    assert [] == parser(b"0")
+    assert [50, 6] == parser(b"\n6\n")
+
+    assert [[b"1", b"2", b"3", b"4"], [b"50", b"6"]] == batches
+
+
+def test_decoder_and_batch_decoder_are_mutually_exclusive():
+    with pytest.raises(ValueError, match="mutually exclusive"):
+        create_parser(splitter=split_lines, decoder=int, batch_decoder=list)
+
+
+def test_parser_metrics():
+    parser = create_line_parser(
+        decoder=int,
+        pre_filter=lambda frame: frame != b"0",
+        post_filter=lambda message: message % 2 == 0,
+        metrics=True,
+    )
+    metrics = parser.metrics
+
+    assert [2, 4] == parser(b"1\n2\n0\n3\n4\n5")
+
+    snapshot = metrics.snapshot()
+    assert snapshot["bytes_fed"] == 11
+    assert snapshot["buffered_bytes"] == 1
+    assert snapshot["frames_split"] == 5
+    assert snapshot["frames_dropped_by_pre_filter"] == 1
+    assert snapshot["frames_dropped_by_post_filter"] == 2
+    assert snapshot["decode_failures"] == 0
+    assert snapshot["decode_time_ns"] >= 0
+
+    with pytest.raises(ValueError):
+        parser(b"\nspam\n")
+
+    assert metrics.decode_failures == 1
+    assert metrics.bytes_fed == 17
+
+
+def test_parser_without_metrics_has_no_metrics_attribute():
+    parser = create_line_parser()
+    assert not hasattr(parser, "metrics")
+
+
+def test_buffered_splitter_requires_feed():
+    class IncompleteSplitter(BufferedSplitter):
+        pass
+
+    with pytest.raises(TypeError):
+        IncompleteSplitter()
@@ -0,0 +1,221 @@
+from __future__ import annotations
+
+from dataclasses import dataclass, field
+from datetime import datetime, timezone
+from enum import Enum, IntEnum
+from typing import Any, Optional
+
+from flockwave.encoders import create_encoder
+from flockwave.encoders.json import create_json_encoder, create_schema_encoder
+from flockwave.encoders.schema import compile_schema
+from flockwave.encoders.wrappers import prefix_with_length
+
+import pytest
+
+
+class Mode(Enum):
+    AUTO = 1
+    MANUAL = 2
+
+
+class Priority(IntEnum):
+    LOW = 1
+    HIGH = 2
+
+
+class Kind(str, Enum):
+    STATUS = "status"
+    EVENT = "event"
+
+
+@dataclass
+class Position:
+    lat: float
+    lon: float
+
+
+@dataclass
+class Status:
+    id: str
+    mode: Mode
+    timestamp: datetime
+    position: Position
+    previous_mode: Optional[Mode] = None
+    waypoints: list[Position] = field(default_factory=list)
+    history: dict[str, list[Mode | None]] = field(default_factory=dict)
+    extra: Any = None
+    pair: tuple[Mode, int] = (Mode.AUTO, 0)
+
+
+@dataclass
+class Tree:
+    name: str
+    children: list[Tree] = field(default_factory=list)
+
+
+@dataclass
+class Report:
+    id: str
+    mode: Mode
+    timestamp: datetime
+    position: Position
+    priority: Priority = Priority.HIGH
+    kind: Kind = Kind.EVENT
+    pair: tuple[Mode, int] = (Mode.MANUAL, 1)
+
+    @property
+    def json(self) -> dict[str, Any]:
+        return {
+            "id": self.id,
+            "mode": self.mode,
+            "timestamp": self.timestamp,
+            "position": {"lat": self.position.lat, "lon": self.position.lon},
+            "priority": self.priority,
+            "kind": self.kind,
+            "pair": self.pair,
+        }
+
+
+TIMESTAMP = datetime(2024, 5, 6, 7, 8, 9, tzinfo=timezone.utc)
+
+
+def create_status(**kwds) -> Status:
+    return Status(
+        id="01",
+        mode=Mode.AUTO,
+        timestamp=TIMESTAMP,
+        position=Position(47.5, 19.0),
+        **kwds,
+    )
+
+
+def test_compile_schema_for_dataclass():
+    convert = compile_schema(Status)
+
+    status = create_status(
+        previous_mode=Mode.MANUAL,
+        waypoints=[Position(1, 2)],
+        history={"a": [Mode.AUTO, None]},
+        extra={"x": 1},
+    )
+    assert convert(status) == {
+        "id": "01",
+        "mode": "AUTO",
+        "timestamp": "2024-05-06T07:08:09+00:00",
+        "position": {"lat": 47.5, "lon": 19.0},
+        "previous_mode": "MANUAL",
+        "waypoints": [{"lat": 1, "lon": 2}],
+        "history": {"a": ["AUTO", None]},
+        "extra": {"x": 1},
+        "pair": (Mode.AUTO, 0),
+    }
+
+    converted = convert(create_status())
+    assert converted["previous_mode"] is None
+    assert list(converted) == [
+        "id",
+        "mode",
+        "timestamp",
+        "position",
+        "previous_mode",
+        "waypoints",
+        "history",
+        "extra",
+        "pair",
+    ]
+
+    converted = compile_schema(Status, sort_keys=True)(create_status())
+    assert list(converted) == sorted(converted)
+
+
+def test_compile_schema_for_recursive_dataclass():
+    convert = compile_schema(Tree)
+    tree = Tree("root", [Tree("a"), Tree("b", [Tree("c")])])
+    assert convert(tree) == {
+        "name": "root",
+        "children": [
+            {"name": "a", "children": []},
+            {"name": "b", "children": [{"name": "c", "children": []}]},
+        ],
+    }
+
+
+def test_compile_schema_for_mapping():
+    convert = compile_schema(
+        {"id": str, "body": {"type": str, "mode": Mode, "time": datetime}}
+    )
+    message = {
+        "id": "x",
+        "body": {"type": "UAV-INF", "mode": Mode.MANUAL, "time": TIMESTAMP},
+    }
+    assert convert(message) == {
+        "id": "x",
+        "body": {
+            "type": "UAV-INF",
+            "mode": "MANUAL",
+            "time": "2024-05-06T07:08:09+00:00",
+        },
+    }
+
+    with pytest.raises(KeyError):
+        convert({"id": "x"})
+
+
+def test_compile_schema_with_native_types():
+    convert = compile_schema(Status, native_types=[datetime])
+    converted = convert(create_status())
+    assert converted["timestamp"] is TIMESTAMP
+    assert converted["mode"] == "AUTO"
+
+
+def test_compile_schema_rejects_invalid_schemas():
+    with pytest.raises(TypeError):
+        compile_schema(int)
+
+
+@pytest.mark.parametrize("encoder", [None, "builtin"])
+def test_create_schema_encoder(encoder):
+    encode = create_schema_encoder(Position, encoder)
+    assert encode(Position(1.5, 2)) == b'{"lat":1.5,"lon":2}'
+
+    framed = create_encoder(encode, prefix_with_length(header_length=1))
+    assert framed(Position(1.5, 2)) == b'\x13{"lat":1.5,"lon":2}'
+
+    encode = create_schema_encoder({"b": Mode, "a": int}, encoder, sort_keys=True)
+    generic = create_json_encoder(encoder, wrapper=None)
+    assert encode({"a": 1, "b": Mode.AUTO, "c": 3}) + b"\n" == generic(
+        {"a": 1, "b": Mode.AUTO}
+    )
+
+
+@pytest.mark.parametrize("encoder", [None, "builtin"])
+def test_json_encoder_with_schemas(encoder):
+    encode = create_json_encoder(encoder, schemas=[Status, Position])
+
+    # Top-level message
+    assert encode(Position(1, 2)) == b'{"lat":1,"lon":2}\n'
+
+    # Dataclasses nested in other objects
+    assert encode({"items": [Position(3, 4)]}) == b'{"items":[{"lat":3,"lon":4}]}\n'
+
+    # Other objects are still converted with object_to_jsonable()
+    assert encode({"t": TIMESTAMP}) == b'{"t":"2024-05-06T07:08:09+00:00"}\n'
+    with pytest.raises(TypeError):
+        encode(Tree("x"))
+
+    data = encode(create_status())
+    assert data.startswith(b"{") and data.endswith(b"}\n")
+    assert b'"mode":' + (b"1" if encoder is None else b'"AUTO"') in data
+    assert b'"timestamp":"2024-05-06T07:08:09+00:00"' in data
+    assert b'"position":{"lat":47.5,"lon":19.0}' in data
+
+
+@pytest.mark.parametrize("encoder", [None, "builtin"])
+def test_json_encoder_with_schemas_matches_generic_encoder(encoder):
+    generic = create_json_encoder(encoder)
+    compiled = create_json_encoder(encoder, schemas=[Report])
+
+    report = Report("01", Mode.AUTO, TIMESTAMP, Position(47.5, 19.0))
+    assert compiled(report) == generic(report)
+    assert compiled({"reports": [report]}) == generic({"reports": [report]})
+    assert compiled({"mode": Mode.MANUAL}) == generic({"mode": Mode.MANUAL})
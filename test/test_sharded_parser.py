@@ -0,0 +1,63 @@
+from flockwave.parsers import ShardedParser, create_line_parser
+from threading import Lock
+
+import pytest
+
+
+def test_sharded_parser_keeps_order_within_streams():
+    received = {}
+    lock = Lock()
+
+    def callback(stream_id, messages):
+        with lock:
+            received.setdefault(stream_id, []).extend(messages)
+
+    with ShardedParser(create_line_parser, workers=3, callback=callback) as runtime:
+        for i in range(100):
+            for stream_id in range(10):
+                runtime.feed(stream_id, f"{stream_id}:{i}\n{stream_id}:".encode())
+                runtime.feed(stream_id, f"{i}b\n".encode())
+
+        assert runtime.num_streams == 10
+
+    for stream_id in range(10):
+        expected = []
+        for i in range(100):
+            expected.append(f"{stream_id}:{i}".encode())
+            expected.append(f"{stream_id}:{i}b".encode())
+        assert expected == received[stream_id]
+
+
+def test_sharded_parser_balances_streams_across_workers():
+    with ShardedParser(create_line_parser, workers=4) as runtime:
+        for stream_id in range(8):
+            runtime.feed(stream_id, b"")
+
+        counts = [shard.num_streams for shard in runtime._shards]
+        assert [2, 2, 2, 2] == counts
+
+
+def test_sharded_parser_returns_futures():
+    with ShardedParser(create_line_parser, workers=2) as runtime:
+        assert [] == runtime.feed("a", b"abc").result()
+        assert [b"abcdef"] == runtime.feed("a", b"def\n").result()
+        assert [b"ghi"] == runtime.feed("b", b"ghi\n").result()
+
+
+def test_sharded_parser_replaces_failed_parsers():
+    def factory():
+        return create_line_parser(decoder=int)
+
+    with ShardedParser(factory, workers=2) as runtime:
+        with pytest.raises(ValueError):
+            runtime.feed("a", b"1\nspam\n").result()
+        assert [2] == runtime.feed("a", b"2\n").result()
+
+
+def test_sharded_parser_removes_streams():
+    with ShardedParser(create_line_parser, workers=2) as runtime:
+        runtime.feed("a", b"abc")
+        runtime.remove_stream("a").result()
+        assert runtime.num_streams == 0
+        assert [b"def"] == runtime.feed("a", b"def\n").result()
+        runtime.remove_stream("nonexistent").result()
@@ -0,0 +1,28 @@
+from flockwave.encoders import create_slip_encoder
+
+import pytest
+
+
+@pytest.mark.parametrize(
+    ("data", "expected"),
+    [
+        (b"", b"\xc0"),
+        (b"foo", b"foo\xc0"),
+        (b"\xc0", b"\xdb\xdc\xc0"),
+        (b"\xdb", b"\xdb\xdd\xc0"),
+        (b"\xdb\xdc", b"\xdb\xdd\xdc\xc0"),
+        (b"a\xc0\xdbb\xdb\xc0", b"a\xdb\xdc\xdb\xddb\xdb\xdd\xdb\xdc\xc0"),
+    ],
+)
+def test_slip_encoder(data, expected):
+    encoder = create_slip_encoder()
+    assert expected == encoder(data)
+    assert (b"", expected[:-1], b"\xc0") == encoder.encode_parts(data)
+
+
+def test_slip_encoder_encode_many():
+    encoder = create_slip_encoder()
+    messages = [b"foo", b"", b"\xc0\xdb", b"bar"]
+    expected = b"".join(encoder(message) for message in messages)
+    assert expected == encoder.encode_many(messages)
+    assert b"" == encoder.encode_many([])
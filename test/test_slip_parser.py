@@ -0,0 +1,44 @@
+from flockwave.encoders import create_slip_encoder
+from flockwave.parsers import create_slip_parser
+
+import pytest
+
+
+@pytest.mark.parametrize(
+    ("data", "expected"),
+    [
+        ([b""], []),
+        ([b"foo\xc0bar\xc0"], [b"foo", b"bar"]),
+        ([b"\xc0\xc0foo\xc0\xc0"], [b"foo"]),
+        ([b"\xdb\xdc\xdb\xdd\xc0"], [b"\xc0\xdb"]),
+        ([b"\xdb\xdd\xdc\xc0"], [b"\xdb\xdc"]),
+        # Escape sequences straddling chunk boundaries
+        ([b"a\xdb", b"\xdcb\xdb", b"\xdd", b"\xc0"], [b"a\xc0b\xdb"]),
+        ([b"\xdb", b"\xdd\xdb", b"\xdc\xc0"], [b"\xdb\xc0"]),
+        # Invalid escape sequences are kept as is
+        ([b"\xdbx\xc0"], [b"\xdbx"]),
+    ],
+)
+def test_slip_parser(data, expected):
+    parser = create_slip_parser()
+    result = []
+    for chunk in data:
+        result.extend(parser(chunk))
+    assert expected == result
+
+
+def test_slip_parser_with_min_length():
+    parser = create_slip_parser(min_length=2)
+    assert parser(b"a\xc0\xdb\xdc\xc0\xdb\xdcb\xc0") == [b"\xc0b"]
+
+
+def test_slip_roundtrip():
+    messages = [bytes(range(i, 256)) + bytes(range(i)) for i in range(256)]
+    data = create_slip_encoder().encode_many(messages)
+
+    for chunk_size in (1, 2, 7, 1500):
+        parser = create_slip_parser()
+        result = []
+        for start in range(0, len(data), chunk_size):
+            result.extend(parser(data[start : start + chunk_size]))
+        assert messages == result
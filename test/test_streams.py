@@ -0,0 +1,134 @@
+from asyncio import StreamReader, get_running_loop, run, wait_for
+from flockwave.parsers import (
+    ParseError,
+    ParserProtocol,
+    create_length_prefixed_parser,
+    create_line_parser,
+    parse_stream,
+)
+from socket import SHUT_WR, socketpair
+
+import pytest
+
+
+async def collect(stream, parser, **kwds):
+    return [message async for message in parse_stream(stream, parser, **kwds)]
+
+
+def create_stream_reader(*chunks):
+    reader = StreamReader()
+    for chunk in chunks:
+        reader.feed_data(chunk)
+    reader.feed_eof()
+    return reader
+
+
+class EndOfStream(Exception):
+    pass
+
+
+class ReceiveStream:
+    def __init__(self, *chunks):
+        self._chunks = list(chunks)
+
+    async def receive(self):
+        if not self._chunks:
+            raise EndOfStream()
+        return self._chunks.pop(0)
+
+
+def test_parse_stream_reader():
+    async def main():
+        reader = create_stream_reader(b"abc\nde", b"f\ngh", b"i\n")
+        return await collect(reader, create_line_parser(), read_size=4)
+
+    assert [b"abc", b"def", b"ghi"] == run(main())
+
+
+def test_parse_receive_stream():
+    async def main():
+        stream = ReceiveStream(b"abc\nde", b"f\ngh", b"i\n")
+        return await collect(stream, create_line_parser())
+
+    assert [b"abc", b"def", b"ghi"] == run(main())
+
+
+def test_parse_stream_yields_to_event_loop():
+    checkpoints = []
+
+    async def checkpoint():
+        checkpoints.append(True)
+
+    async def main():
+        reader = create_stream_reader(b"a\n" * 10)
+        return await collect(
+            reader,
+            create_line_parser(),
+            read_size=2,
+            yield_every=3,
+            checkpoint=checkpoint,
+        )
+
+    assert [b"a"] * 10 == run(main())
+    assert len(checkpoints) == 3
+
+
+@pytest.mark.parametrize("metrics", [False, True])
+def test_parse_stream_reports_incomplete_message(metrics):
+    async def main(strict):
+        reader = create_stream_reader(b"abc\nde")
+        parser = create_line_parser(metrics=metrics)
+        return await collect(reader, parser, strict=strict)
+
+    with pytest.raises(ParseError, match="2 bytes pending"):
+        run(main(strict=True))
+
+    assert [b"abc"] == run(main(strict=False))
+
+
+def test_parse_stream_rejects_unknown_streams():
+    with pytest.raises(TypeError):
+        run(collect(object(), create_line_parser()))
+
+
+def test_parser_protocol_parses_in_place():
+    messages = []
+    protocol = ParserProtocol(
+        create_length_prefixed_parser(header_length=1),
+        messages.append,
+        buffer_size=8,
+    )
+
+    for data in (b"\x03abc\x04de", b"fg\x01h", b"\x02ij"):
+        buffer = protocol.get_buffer(-1)
+        assert len(buffer) == 8
+        buffer[: len(data)] = data
+        protocol.buffer_updated(len(data))
+
+    assert [b"abc", b"defg", b"h", b"ij"] == messages
+
+
+def test_parser_protocol_with_transport():
+    async def main():
+        loop = get_running_loop()
+        messages = []
+        closed = loop.create_future()
+
+        local, remote = socketpair()
+        with local, remote:
+            transport, _ = await loop.create_connection(
+                lambda: ParserProtocol(
+                    create_line_parser(),
+                    messages.append,
+                    on_connection_lost=closed.set_result,
+                ),
+                sock=local,
+            )
+            remote.sendall(b"abc\nde")
+            remote.sendall(b"f\nghi\n")
+            remote.shutdown(SHUT_WR)
+            await wait_for(closed, timeout=5)
+
+        return messages
+
+    assert [b"abc", b"def", b"ghi"] == run(main())
@@ -0,0 +1,44 @@
+from flockwave.encoders import EncodingError, create_sync_word_encoder
+from zlib import crc32
+
+import pytest
+
+
+@pytest.mark.parametrize(
+    ("header_length", "endianness", "data", "header"),
+    [
+        (1, "big", b"foobar", b"\x55\xaa\x06"),
+        (2, "big", b"foobar", b"\x55\xaa\x00\x06"),
+        (2, "little", b"foobar", b"\x55\xaa\x06\x00"),
+    ],
+)
+def test_sync_word_encoder(header_length, endianness, data, header):
+    encoder = create_sync_word_encoder(
+        header_length=header_length, endianness=endianness
+    )
+    checksum = crc32(header[2:] + data).to_bytes(4, endianness)
+    assert header + data + checksum == encoder(data)
+    assert (header, data, checksum) == encoder.encode_parts(data)
+
+
+def test_sync_word_encoder_custom_sync_word():
+    encoder = create_sync_word_encoder(max_length=255, sync_word=b"\xfe")
+    assert encoder(b"foo").startswith(b"\xfe\x03foo")
+
+
+def test_sync_word_encoder_encode_many():
+    encoder = create_sync_word_encoder(max_length=255)
+    messages = [b"foo", b"", b"x" * 200]
+    expected = b"".join(encoder(message) for message in messages)
+    assert expected == encoder.encode_many(messages)
+
+
+def test_sync_word_encoder_checks_length():
+    encoder = create_sync_word_encoder(max_length=3)
+    with pytest.raises(EncodingError):
+        encoder(b"spam")
+
+
+def test_sync_word_encoder_rejects_empty_sync_word():
+    with pytest.raises(ValueError):
+        create_sync_word_encoder(max_length=3, sync_word=b"")
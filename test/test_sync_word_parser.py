@@ -0,0 +1,85 @@
+from flockwave.encoders import create_sync_word_encoder
+from flockwave.parsers import create_sync_word_parser
+
+import pytest
+
+
+@pytest.fixture
+def encoder():
+    return create_sync_word_encoder(max_length=255)
+
+
+def test_sync_word_parser_roundtrip(encoder):
+    messages = [b"foo", b"", b"x" * 200, b"\x55\xaa\x55"]
+    data = encoder.encode_many(messages)
+
+    parser = create_sync_word_parser(max_length=255, metrics=True)
+    result = []
+    for i in range(0, len(data), 3):
+        result.extend(parser(data[i : i + 3]))
+
+    assert messages == result
+    assert parser.metrics.bytes_skipped == 0
+    assert parser.metrics.frames_recovered == 0
+    assert parser.metrics.buffered_bytes == 0
+
+
+def test_sync_word_parser_skips_garbage(encoder):
+    parser = create_sync_word_parser(max_length=255, metrics=True)
+    assert parser(b"junk" + encoder(b"foo") + b"\x55" + encoder(b"bar")) == [
+        b"foo",
+        b"bar",
+    ]
+    assert parser.metrics.bytes_skipped == 5
+    assert parser.metrics.frames_recovered == 2
+
+
+def test_sync_word_parser_recovers_from_corrupted_length(encoder):
+    frame = bytearray(encoder(b"foobar"))
+    frame[2] = 0xFF  # length larger than the maximum
+
+    parser = create_sync_word_parser(max_length=16, metrics=True)
+    assert parser(bytes(frame) + encoder(b"spam")) == [b"spam"]
+    assert parser.metrics.bytes_skipped == len(frame)
+    assert parser.metrics.frames_recovered == 1
+
+
+def test_sync_word_parser_recovers_from_corrupted_body(encoder):
+    frame = bytearray(encoder(b"foobar"))
+    frame[4] ^= 0x01
+
+    parser = create_sync_word_parser(max_length=255, metrics=True)
+    assert parser(bytes(frame)) == []
+    assert parser(encoder(b"spam") + encoder(b"ham")) == [b"spam", b"ham"]
+    assert parser.metrics.bytes_skipped == len(frame)
+    assert parser.metrics.frames_recovered == 1
+
+
+def test_sync_word_parser_recovers_from_short_length(encoder):
+    # A corrupted length that is shorter than the real one must not swallow
+    # the next frame
+    frame = bytearray(encoder(b"foobar"))
+    frame[2] = 1
+
+    parser = create_sync_word_parser(max_length=255)
+    assert parser(bytes(frame) + encoder(b"spam")) == [b"spam"]
+
+
+def test_sync_word_parser_keeps_partial_sync_word(encoder):
+    data = b"junk" + encoder(b"foo")
+    parser = create_sync_word_parser(max_length=255, metrics=True)
+    assert parser(data[:5]) == []
+    assert parser.metrics.buffered_bytes == 1
+    assert parser(data[5:]) == [b"foo"]
+    assert parser.metrics.bytes_skipped == 4
+
+
+@pytest.mark.parametrize("endianness", ["big", "little"])
+def test_sync_word_parser_options(endianness):
+    encoder = create_sync_word_encoder(
+        header_length=3, endianness=endianness, sync_word=b"SYNC"
+    )
+    parser = create_sync_word_parser(
+        header_length=3, endianness=endianness, sync_word=b"SYNC", min_length=2
+    )
+    assert parser(encoder.encode_many([b"SYNC", b"x", b"yz"])) == [b"SYNC", b"yz"]